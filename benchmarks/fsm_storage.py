@@ -0,0 +1,94 @@
+# Файл, содержащий бенчмарк хранилищ состояний пользователей в памяти и в файле базы данных SQLite
+
+
+# Подключение модулей Python
+from asyncio import run
+from os import environ, path
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+
+# Настройка переменных среды, необходимых для подключения пользовательских модулей
+environ.setdefault("BOT_TOKEN", "0:benchmark")
+environ.setdefault("OWNER_TG_ID", "0")
+environ.setdefault("DB_URL", "sqlite+aiosqlite://")
+
+
+# Подключение пользовательских модулей
+from database.storage import Sqlite_Storage
+
+
+# Настройка работы файла
+MEMBERS = [f"Участник {i}" for i in range(1, 26)]
+
+
+# Функция для измерения среднего времени чтения и записи состояний пользователей в хранилище в микросекундах
+# по хранилищу и количеству пользователей
+async def measure(storage: BaseStorage, users_cnt: int) -> tuple[float, float]:
+    keys: list[StorageKey] = [
+        StorageKey(bot_id=0, chat_id=user, user_id=user) for user in range(users_cnt)
+    ]
+
+    start: float = perf_counter()
+
+    for key in keys:
+        await storage.set_state(key, "Create_Report:group_members")
+        await storage.set_data(key, {"group_name": "Группа", "group_members": MEMBERS})
+
+    write_time: float = (perf_counter() - start) / users_cnt / 2 * 10**6
+
+    start: float = perf_counter()
+
+    for key in keys:
+        await storage.get_state(key)
+        await storage.get_data(key)
+
+    read_time: float = (perf_counter() - start) / users_cnt / 2 * 10**6
+
+    return write_time, read_time
+
+
+# Основная функция для запуска бенчмарка
+async def main() -> None:
+    sizes: list[int] = [int(size) for size in argv[1:]] or [1000, 10000, 100000]
+
+    print(
+        f"{'Пользователей':<16}{'Хранилище':<12}{'Запись, мкс':>14}{'Чтение, мкс':>14}"
+    )
+
+    for users_cnt in sizes:
+        write_time, read_time = await measure(MemoryStorage(), users_cnt)
+
+        print(f"{users_cnt:<16}{'Memory':<12}{write_time:>14.2f}{read_time:>14.2f}")
+
+        with TemporaryDirectory() as directory:
+            storage = Sqlite_Storage(path.join(directory, "fsm.db"))
+
+            await storage.open()
+
+            write_time, read_time = await measure(storage, users_cnt)
+
+            start: float = perf_counter()
+            await storage.close()
+            flush_time: float = (perf_counter() - start) * 1000
+
+            storage = Sqlite_Storage(path.join(directory, "fsm.db"))
+
+            start: float = perf_counter()
+            await storage.open()
+            load_time: float = (perf_counter() - start) * 1000
+
+            await storage.close()
+
+        print(f"{users_cnt:<16}{'Sqlite':<12}{write_time:>14.2f}{read_time:>14.2f}")
+        print(
+            f"{'':<16}Запись остатка при закрытии - {flush_time:.1f} мс, загрузка при открытии - {load_time:.1f} мс"
+        )
+
+
+# Запуск основной функции
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,183 @@
+# Файл, содержащий бенчмарк поиска пользователей, групп и отчётов в базе данных с индексами и без них
+
+
+# Подключение модулей Python
+from os import environ, path
+from sys import argv
+from random import Random
+from datetime import date as Date, timedelta
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from sqlalchemy import create_engine, insert, select, func
+
+
+# Настройка переменных среды, необходимых для подключения пользовательских модулей
+environ.setdefault("BOT_TOKEN", "0:benchmark")
+environ.setdefault("OWNER_TG_ID", "0")
+environ.setdefault("DB_URL", "sqlite+aiosqlite://")
+
+
+# Подключение пользовательских модулей
+from database.models import Base, User, Group, Report
+
+
+# Настройка работы файла
+REPORTS_PER_GROUP = 365
+GROUPS_PER_USER = 2
+LOOKUPS_CNT = 2000
+START_DATE = Date(2020, 1, 1)
+
+
+# Функция для заполнения базы данных пользователями, группами и их ежедневными отчётами по количеству отчётов,
+# у каждой группы не больше одного отчёта в день
+def fill_database(conn, reports_cnt: int) -> tuple[int, int]:
+    groups_cnt: int = max(-(-reports_cnt // REPORTS_PER_GROUP), 1)
+    users_cnt: int = max(groups_cnt // GROUPS_PER_USER, 1)
+
+    conn.execute(
+        insert(User),
+        [
+            {"id": i, "tg_id": 10**9 + i, "utc_offset": 10800, "feedbacks_cnt": 0}
+            for i in range(1, users_cnt + 1)
+        ],
+    )
+    conn.execute(
+        insert(Group),
+        [
+            {
+                "id": i,
+                "creator": i % users_cnt + 1,
+                "name": f"Группа {i}",
+                "reports_recipient": (i * 7) % users_cnt + 1,
+            }
+            for i in range(1, groups_cnt + 1)
+        ],
+    )
+
+    batch: list[dict] = []
+
+    for i in range(reports_cnt):
+        batch.append(
+            {
+                "group": i // REPORTS_PER_GROUP + 1,
+                "date": START_DATE + timedelta(days=i % REPORTS_PER_GROUP),
+            }
+        )
+
+        if len(batch) == 100000:
+            conn.execute(insert(Report), batch)
+            batch = []
+
+    if batch != []:
+        conn.execute(insert(Report), batch)
+
+    return users_cnt, groups_cnt
+
+
+# Функция для измерения среднего времени выполнения запросов в микросекундах
+def measure(conn, queries: list) -> float:
+    start: float = perf_counter()
+
+    for query in queries:
+        conn.execute(query).all()
+
+    return (perf_counter() - start) / len(queries) * 10**6
+
+
+# Функция для измерения времени поиска в базе данных указанного размера с индексами или без них
+def run(reports_cnt: int, with_indexes: bool) -> dict[str, float]:
+    with TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{path.join(directory, 'benchmark.db')}")
+
+        with engine.begin() as conn:
+            Base.metadata.create_all(conn)
+
+            if not with_indexes:
+                for model_table in Base.metadata.sorted_tables:
+                    for index in model_table.indexes:
+                        index.drop(conn)
+
+            users_cnt, groups_cnt = fill_database(conn, reports_cnt)
+
+        random = Random(reports_cnt)
+        users: list[int] = [random.randint(1, users_cnt) for _ in range(LOOKUPS_CNT)]
+        groups: list[int] = [random.randint(1, groups_cnt) for _ in range(LOOKUPS_CNT)]
+        days: list[int] = [
+            random.randint(0, REPORTS_PER_GROUP - 1) for _ in range(LOOKUPS_CNT)
+        ]
+
+        with engine.connect() as conn:
+            results: dict[str, float] = {
+                "User.tg_id": measure(
+                    conn,
+                    [
+                        select(User).where(User.tg_id == 10**9 + user)
+                        for user in users
+                    ],
+                ),
+                "Group.creator, name": measure(
+                    conn,
+                    [
+                        select(Group)
+                        .where(Group.creator == group % users_cnt + 1)
+                        .where(Group.name == f"Группа {group}")
+                        for group in groups
+                    ],
+                ),
+                "Group.reports_recipient, name": measure(
+                    conn,
+                    [
+                        select(Group)
+                        .where(Group.reports_recipient == (group * 7) % users_cnt + 1)
+                        .where(Group.name == f"Группа {group}")
+                        for group in groups
+                    ],
+                ),
+                "Report.group, date": measure(
+                    conn,
+                    [
+                        select(Report)
+                        .where(Report.group == group)
+                        .where(Report.date == START_DATE + timedelta(days=day))
+                        for group, day in zip(groups, days)
+                    ],
+                ),
+                "Report.group, date range": measure(
+                    conn,
+                    [
+                        select(func.count(Report.id))
+                        .where(Report.group == group)
+                        .where(Report.date >= START_DATE)
+                        .where(Report.date <= START_DATE + timedelta(days=day))
+                        for group, day in zip(groups, days)
+                    ],
+                ),
+            }
+
+        engine.dispose()
+
+        return results
+
+
+# Основная функция для запуска бенчмарка
+def main() -> None:
+    sizes: list[int] = [int(size) for size in argv[1:]] or [10000, 100000, 1000000]
+
+    for reports_cnt in sizes:
+        without_indexes: dict[str, float] = run(reports_cnt, False)
+        with_indexes: dict[str, float] = run(reports_cnt, True)
+
+        print(f"Отчётов: {reports_cnt}")
+        print(f"{'Запрос':<32}{'Без индексов, мкс':>20}{'С индексами, мкс':>20}")
+
+        for query in with_indexes:
+            print(
+                f"{query:<32}{without_indexes[query]:>20.1f}{with_indexes[query]:>20.1f}"
+            )
+
+        print()
+
+
+# Запуск основной функции
+if __name__ == "__main__":
+    main()
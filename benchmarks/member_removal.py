@@ -0,0 +1,234 @@
+# Файл, содержащий бенчмарк удаления участника из группы с многолетней историей ежедневных отчётов
+# в прежнем виде с поиском по строковому столбцу "members" и в текущем виде наборными запросами
+
+
+# Подключение модулей Python
+from asyncio import run
+from os import environ, path
+from sys import argv
+from random import Random
+from datetime import date as Date, timedelta
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    create_engine,
+    event,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+# Настройка переменных среды, необходимых для подключения пользовательских модулей
+environ.setdefault("BOT_TOKEN", "0:benchmark")
+environ.setdefault("OWNER_TG_ID", "0")
+environ.setdefault("DB_URL", "sqlite+aiosqlite://")
+
+
+# Подключение пользовательских модулей
+from database.models import (
+    Base,
+    User,
+    Group,
+    Member,
+    Report,
+    Absence,
+    build_rollups,
+)
+from database.requests import Group_Requests
+
+
+# Настройка работы файла
+MEMBERS = ["Иван", "Иванов", "Ивановский"] + [f"Участник {i}" for i in range(1, 23)]
+REMOVED_MEMBERS = ["Иван", "Участник 1", "Участник 2", "Участник 3", "Участник 4"]
+CREATOR_TG_ID = 10**9
+GROUP_NAME = "Группа"
+START_DATE = Date(2015, 1, 1)
+
+legacy_metadata = MetaData()
+legacy_reports = Table(
+    "legacy_reports",
+    legacy_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("group", Integer, index=True),
+    Column("members", Text),
+)
+
+
+# Функция для заполнения базы данных группой с ежедневными отчётами за количество лет
+# одновременно в текущих таблицах и в таблице с прежним строковым столбцом "members"
+def fill_database(conn, years: int) -> None:
+    random = Random(years)
+
+    conn.execute(
+        insert(User),
+        [{"id": 1, "tg_id": CREATOR_TG_ID, "utc_offset": 10800, "feedbacks_cnt": 0}],
+    )
+    conn.execute(
+        insert(Group),
+        [{"id": 1, "creator": 1, "name": GROUP_NAME, "reports_recipient": 1}],
+    )
+    conn.execute(
+        insert(Member),
+        [
+            {"id": i, "group": 1, "name": name}
+            for i, name in enumerate(MEMBERS, start=1)
+        ],
+    )
+
+    reports: list[dict] = []
+    absences: list[dict] = []
+    legacy: list[dict] = []
+
+    for i in range(
+        (START_DATE.replace(year=START_DATE.year + years) - START_DATE).days
+    ):
+        report_members: list[int] = random.sample(
+            range(1, len(MEMBERS) + 1), random.randint(0, 5)
+        )
+
+        reports.append(
+            {"id": i + 1, "group": 1, "date": START_DATE + timedelta(days=i)}
+        )
+        absences.extend(
+            {"report": i + 1, "member": member} for member in report_members
+        )
+        legacy.append(
+            {
+                "id": i + 1,
+                "group": 1,
+                "members": ";\n".join(MEMBERS[member - 1] for member in report_members),
+            }
+        )
+
+    conn.execute(insert(Report), reports)
+    conn.execute(insert(Absence), absences)
+    conn.execute(insert(legacy_reports), legacy)
+
+    build_rollups(conn)
+
+
+# Функция для удаления участника из отчётов в прежнем виде по соединению с базой данных и имени участника,
+# возвращает количество отчётов, найденных по подстроке, и количество изменённых отчётов
+def remove_member_legacy(conn, member: str) -> tuple[int, int]:
+    reports = conn.execute(
+        select(legacy_reports.c.id, legacy_reports.c.members)
+        .where(legacy_reports.c.group == 1)
+        .where(legacy_reports.c.members.like(f"%{member}%"))
+    ).all()
+    changed_cnt: int = 0
+
+    for report, report_members in reports:
+        members: list[str] = report_members.split(";\n")
+
+        if member in members:
+            members.remove(member)
+
+            changed_cnt += 1
+
+        conn.execute(
+            update(legacy_reports)
+            .where(legacy_reports.c.id == report)
+            .values(members=";\n".join(members))
+        )
+
+    conn.commit()
+
+    return len(reports), changed_cnt
+
+
+# Функция для измерения времени удаления участников в прежнем виде по пути к файлу базы данных,
+# возвращает среднее время в миллисекундах, среднее количество запросов и количество ложных совпадений по подстроке
+def measure_legacy(db_path: str) -> tuple[float, float, int]:
+    engine = create_engine(f"sqlite:///{db_path}")
+    statements: list[str] = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    false_matches: int = 0
+
+    with engine.connect() as conn:
+        start: float = perf_counter()
+
+        for member in REMOVED_MEMBERS:
+            found_cnt, changed_cnt = remove_member_legacy(conn, member)
+            false_matches += found_cnt - changed_cnt
+
+        duration: float = (perf_counter() - start) / len(REMOVED_MEMBERS) * 1000
+
+    engine.dispose()
+
+    return duration, len(statements) / len(REMOVED_MEMBERS), false_matches
+
+
+# Функция для измерения времени удаления участников наборными запросами по пути к файлу базы данных,
+# возвращает среднее время в миллисекундах и среднее количество запросов
+async def measure_set_based(db_path: str) -> tuple[float, float]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session = async_sessionmaker(engine, expire_on_commit=False)
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    async with session() as sess:
+        start: float = perf_counter()
+
+        for member in REMOVED_MEMBERS:
+            await Group_Requests.remove_member(sess, CREATOR_TG_ID, GROUP_NAME, member)
+
+        duration: float = (perf_counter() - start) / len(REMOVED_MEMBERS) * 1000
+
+    await engine.dispose()
+
+    return duration, len(statements) / len(REMOVED_MEMBERS)
+
+
+# Основная функция для запуска бенчмарка
+async def main() -> None:
+    sizes: list[int] = [int(size) for size in argv[1:]] or [1, 5, 10]
+
+    print(
+        f"{'Лет':<6}{'Отчётов':>10}{'Прежний, мс':>14}{'Запросов':>10}{'Ложных':>8}"
+        f"{'Наборный, мс':>15}{'Запросов':>10}"
+    )
+
+    for years in sizes:
+        with TemporaryDirectory() as directory:
+            db_path: str = path.join(directory, "benchmark.db")
+            engine = create_engine(f"sqlite:///{db_path}")
+
+            with engine.begin() as conn:
+                Base.metadata.create_all(conn)
+                legacy_metadata.create_all(conn)
+
+                fill_database(conn, years)
+
+                reports_cnt: int = conn.scalar(
+                    select(Report.id).order_by(Report.id.desc())
+                )
+
+            engine.dispose()
+
+            legacy_time, legacy_statements, false_matches = measure_legacy(db_path)
+            set_based_time, set_based_statements = await measure_set_based(db_path)
+
+        print(
+            f"{years:<6}{reports_cnt:>10}{legacy_time:>14.1f}{legacy_statements:>10.0f}{false_matches:>8}"
+            f"{set_based_time:>15.1f}{set_based_statements:>10.0f}"
+        )
+
+
+# Запуск основной функции
+if __name__ == "__main__":
+    run(main())
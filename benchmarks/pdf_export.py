@@ -0,0 +1,68 @@
+# Файл, содержащий бенчмарк создания файлов отчётов в формате *.pdf
+
+
+# Подключение модулей Python
+from sys import argv
+from random import Random
+from datetime import date as Date, timedelta
+from time import perf_counter
+
+
+# Подключение пользовательских модулей
+from database.writers import Pdf_Writer
+
+
+# Настройка работы файла
+MEMBERS = [f"Участник {i}" for i in range(1, 26)]
+START_DATE = Date(2020, 1, 1)
+
+
+# Функция для создания данных рядов файла отчётов и их высот по количеству отчётов
+def create_rows(reports_cnt: int) -> tuple[list[list[str]], list[int]]:
+    random = Random(reports_cnt)
+    rows_data: list[list[str]] = [
+        ["Имя создателя группы", "Название группы"],
+        ["creator", "Группа"],
+        ["Дата создания отчёта", "Участники отчёта"],
+    ]
+    rows_heights: list[int] = [25, 25, 25]
+
+    for i in range(reports_cnt):
+        report_members: list[str] = sorted(random.sample(MEMBERS, random.randint(0, 5)))
+
+        rows_data.append(
+            [
+                (START_DATE + timedelta(days=i)).strftime("%d.%m.%Y"),
+                "\n".join(report_members),
+            ]
+        )
+        rows_heights.append(max(len(report_members), 1) * 25)
+
+    return rows_data, rows_heights
+
+
+# Основная функция для запуска бенчмарка
+def main() -> None:
+    sizes: list[int] = [int(size) for size in argv[1:]] or [100, 1000, 5000]
+
+    start: float = perf_counter()
+    Pdf_Writer.register_fonts()
+    print(f"Регистрация шрифтов: {(perf_counter() - start) * 1000:.1f} мс")
+
+    print(f"{'Отчётов':<12}{'Время, мс':>12}{'Размер, КБ':>14}")
+
+    for reports_cnt in sizes:
+        rows_data, rows_heights = create_rows(reports_cnt)
+
+        start: float = perf_counter()
+        reports_file: bytes = Pdf_Writer.create_reports_file(
+            reports_cnt + 3, rows_data, rows_heights
+        )
+        duration: float = (perf_counter() - start) * 1000
+
+        print(f"{reports_cnt:<12}{duration:>12.1f}{len(reports_file) / 1024:>14.1f}")
+
+
+# Запуск основной функции
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+# Файл, содержащий бенчмарк задержки и пропускной способности получения обновлений через long polling и вебхук
+# с локальным сервером, имитирующим Телеграм
+
+
+# Подключение модулей Python
+from asyncio import Event, TimeoutError, create_task, gather, run, sleep, wait_for
+from os import environ
+from statistics import median, quantiles
+from sys import argv
+from time import perf_counter
+from aiohttp import ClientSession, web
+from aiogram import Bot, Dispatcher, Router
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.types import Message
+
+
+# Настройка переменных среды, необходимых для подключения пользовательских модулей
+environ.setdefault("BOT_TOKEN", "0:benchmark")
+environ.setdefault("OWNER_TG_ID", "0")
+environ.setdefault("DB_URL", "sqlite+aiosqlite://")
+
+
+# Подключение пользовательских модулей
+from handlers.webhook import Webhook_Handler
+
+
+# Настройка работы файла
+TOKEN = "123456:benchmark"
+TELEGRAM_PORT = 8181
+WEBHOOK_PORT = 8182
+SECRET = "benchmark"
+
+
+# Класс для описания локального сервера, имитирующего Bot API Телеграм
+class Fake_Telegram:
+    """Класс для описания локального сервера, имитирующего Bot API Телеграм"""
+
+    # Магический метод __init__, срабатывающий при создании объекта класса
+    def __init__(self, rtt: float) -> None:
+        self.rtt: float = rtt
+        self.updates: list[dict] = []
+        self.new_updates = Event()
+        self.sent_at: dict[int, float] = {}
+        self.all_sent = Event()
+        self.expected_cnt: int = 0
+
+    # Метод для обработки запроса к методу Bot API
+    async def handle(self, request: web.Request) -> web.Response:
+        method: str = request.match_info["method"].lower()
+        params = await request.post()
+
+        await sleep(self.rtt / 2)
+
+        if method == "getme":
+            result = {"id": 1, "is_bot": True, "first_name": "Bot", "username": "bot"}
+        elif method == "getupdates":
+            offset = int(params.get("offset", 0))
+
+            if not any(update["update_id"] >= offset for update in self.updates):
+                self.new_updates.clear()
+
+                try:
+                    await wait_for(self.new_updates.wait(), 1)
+                except TimeoutError:
+                    pass
+
+            result = [
+                update for update in self.updates if update["update_id"] >= offset
+            ][:100]
+            self.updates = [
+                update for update in self.updates if update["update_id"] >= offset
+            ]
+        elif method == "sendmessage":
+            update_id = int(params["text"])
+            self.sent_at[update_id] = perf_counter()
+
+            if len(self.sent_at) >= self.expected_cnt:
+                self.all_sent.set()
+
+            result = {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": int(params["chat_id"]), "type": "private"},
+                "text": params["text"],
+            }
+        else:
+            result = True
+
+        await sleep(self.rtt / 2)
+
+        return web.json_response({"ok": True, "result": result})
+
+    # Метод для добавления обновлений в очередь long polling
+    def push(self, updates: list[dict]) -> None:
+        self.updates.extend(updates)
+        self.new_updates.set()
+
+
+# Функция для создания обновления с сообщением по его id
+def create_update(update_id: int) -> dict:
+    update: dict = {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": update_id % 1000, "type": "private"},
+            "from": {"id": update_id % 1000, "is_bot": False, "first_name": "U"},
+            "text": str(update_id),
+        },
+    }
+
+    return update
+
+
+# Функция для создания диспетчера с обработчиком, отвечающим на сообщение после имитации работы
+def create_dispatcher(handler_delay: float) -> Dispatcher:
+    router = Router()
+
+    @router.message()
+    async def echo(message: Message) -> None:
+        await sleep(handler_delay)
+        await message.answer(message.text)
+
+    dp = Dispatcher()
+    dp.include_router(router)
+
+    return dp
+
+
+# Функция для вывода результатов замера по названию режима, времени отправки обновлений и времени ответов на них
+def print_results(
+    mode: str, received_at: dict[int, float], sent_at: dict[int, float]
+) -> None:
+    latencies: list[float] = [
+        (sent_at[update_id] - received_at[update_id]) * 1000 for update_id in sent_at
+    ]
+    duration: float = max(sent_at.values()) - min(received_at.values())
+
+    print(
+        f"{mode:<10}{len(latencies) / duration:>14.0f}{median(latencies):>14.1f}{quantiles(latencies, n=20)[-1]:>14.1f}"
+    )
+
+
+# Функция для замера получения обновлений через long polling по количеству обновлений, их частоте и времени их обработки
+async def measure_polling(
+    telegram: Fake_Telegram, updates_cnt: int, rate: float, handler_delay: float
+) -> None:
+    bot = Bot(
+        TOKEN,
+        session=AiohttpSession(
+            api=TelegramAPIServer.from_base(f"http://127.0.0.1:{TELEGRAM_PORT}")
+        ),
+    )
+    dp = create_dispatcher(handler_delay)
+    telegram.sent_at, telegram.expected_cnt = {}, updates_cnt
+    telegram.all_sent.clear()
+
+    polling = create_task(
+        dp.start_polling(bot, handle_signals=False, close_bot_session=False)
+    )
+
+    await sleep(0.5)
+
+    received_at: dict[int, float] = {}
+
+    for update_id in range(1, updates_cnt + 1):
+        received_at[update_id] = perf_counter()
+
+        telegram.push([create_update(update_id)])
+
+        await sleep(1 / rate)
+
+    await telegram.all_sent.wait()
+    await sleep(telegram.rtt)
+    await dp.stop_polling()
+    await polling
+    await bot.session.close()
+
+    print_results("Polling", received_at, telegram.sent_at)
+
+
+# Функция для замера получения обновлений через вебхук по количеству обновлений, их частоте и времени их обработки
+async def measure_webhook(
+    telegram: Fake_Telegram, updates_cnt: int, rate: float, handler_delay: float
+) -> None:
+    bot = Bot(
+        TOKEN,
+        session=AiohttpSession(
+            api=TelegramAPIServer.from_base(f"http://127.0.0.1:{TELEGRAM_PORT}")
+        ),
+    )
+    dp = create_dispatcher(handler_delay)
+    telegram.sent_at, telegram.expected_cnt = {}, updates_cnt
+    telegram.all_sent.clear()
+
+    app = web.Application()
+    Webhook_Handler(dp, bot, secret_token=SECRET).register(app, path="/webhook")
+    runner = web.AppRunner(app)
+
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", WEBHOOK_PORT).start()
+
+    received_at: dict[int, float] = {}
+
+    async with ClientSession() as client:
+
+        async def post(update_id: int) -> None:
+            received_at[update_id] = perf_counter()
+
+            await sleep(telegram.rtt / 2)
+
+            async with client.post(
+                f"http://127.0.0.1:{WEBHOOK_PORT}/webhook",
+                json=create_update(update_id),
+                headers={"X-Telegram-Bot-Api-Secret-Token": SECRET},
+            ) as response:
+                assert response.status == 200
+
+        posts: list = []
+
+        for update_id in range(1, updates_cnt + 1):
+            posts.append(create_task(post(update_id)))
+
+            await sleep(1 / rate)
+
+        await gather(*posts)
+        await telegram.all_sent.wait()
+
+    await runner.cleanup()
+
+    print_results("Webhook", received_at, telegram.sent_at)
+
+
+# Основная функция для запуска бенчмарка
+async def main() -> None:
+    updates_cnt: int = int(argv[1]) if len(argv) > 1 else 1000
+    rate: float = float(argv[2]) if len(argv) > 2 else 200
+    rtt: float = float(argv[3]) / 1000 if len(argv) > 3 else 0.1
+    handler_delay: float = float(argv[4]) / 1000 if len(argv) > 4 else 0.01
+
+    telegram = Fake_Telegram(rtt)
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", telegram.handle)
+    runner = web.AppRunner(app)
+
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", TELEGRAM_PORT).start()
+
+    print(
+        f"Обновлений - {updates_cnt}, частота - {rate:.0f}/с, задержка сети - {rtt * 1000:.0f} мс, "
+        f"время обработки - {handler_delay * 1000:.0f} мс"
+    )
+    print(f"{'Режим':<10}{'Обновлений/с':>14}{'p50, мс':>14}{'p95, мс':>14}")
+
+    await measure_polling(telegram, updates_cnt, rate, handler_delay)
+    await measure_webhook(telegram, updates_cnt, rate, handler_delay)
+
+    await runner.cleanup()
+
+
+# Запуск основной функции
+if __name__ == "__main__":
+    run(main())
@@ -3,6 +3,7 @@
 
 # Подключение модулей Python
 from os import getenv
+from secrets import token_urlsafe
 from dotenv import load_dotenv
 
 
@@ -21,3 +22,95 @@ OWNER_TG_ID: int = int(getenv("OWNER_TG_ID"))
 
 # Переменная, содержащая URL-адрес базы данных в SQLAlchemy
 DB_URL: str = getenv("DB_URL")
+
+# Переменная, содержащая максимальное количество записей в каждом кэше базы данных
+CACHE_SIZE: int = int(getenv("CACHE_SIZE", 1024))
+
+# Переменная, содержащая время жизни записей в кэше базы данных в секундах
+CACHE_TTL: int = int(getenv("CACHE_TTL", 300))
+
+# Переменная, содержащая количество процессов для создания файлов отчётов
+EXPORT_WORKERS: int = int(getenv("EXPORT_WORKERS", 2))
+
+# Переменная, содержащая максимальное время создания одного файла отчётов в секундах
+EXPORT_TIMEOUT: int = int(getenv("EXPORT_TIMEOUT", 60))
+
+# Переменная, содержащая максимальный размер файла с именами участников группы в байтах
+IMPORT_MAX_SIZE: int = int(getenv("IMPORT_MAX_SIZE", 1024 * 1024))
+
+# Переменная, содержащая количество участников группы на одной странице клавиатуры
+KEYBOARD_PAGE_SIZE: int = int(getenv("KEYBOARD_PAGE_SIZE", 20))
+
+# Переменная, содержащая максимальное количество групп, индексы отчётов которых хранятся в памяти
+PREFIX_INDEX_SIZE: int = int(getenv("PREFIX_INDEX_SIZE", 256))
+
+# Переменная, содержащая время хранения Телеграм id отправленных файлов отчётов в секундах
+EXPORTS_CACHE_TTL: int = int(getenv("EXPORTS_CACHE_TTL", 86400))
+
+# Переменная, содержащая время, через которое имя пользователя в базе данных обновляется повторно, в секундах
+USER_INFO_TTL: int = int(getenv("USER_INFO_TTL", 86400))
+
+# Переменная, содержащая путь к файлу базы данных SQLite для хранения состояний пользователей
+FSM_DB_PATH: str = getenv("FSM_DB_PATH", "fsm.db")
+
+# Переменная, содержащая интервал записи изменённых состояний пользователей в файл в секундах
+FSM_FLUSH_INTERVAL: float = float(getenv("FSM_FLUSH_INTERVAL", 1))
+
+# Переменная, содержащая количество изменённых состояний пользователей, при котором они записываются в файл сразу
+FSM_FLUSH_BATCH: int = int(getenv("FSM_FLUSH_BATCH", 100))
+
+# Переменная, содержащая время, после которого неиспользуемое состояние пользователя удаляется, в секундах
+FSM_TTL: int = int(getenv("FSM_TTL", 86400))
+
+# Переменная, содержащая интервал удаления неиспользуемых состояний пользователей в секундах
+FSM_SWEEP_INTERVAL: int = int(getenv("FSM_SWEEP_INTERVAL", 60))
+
+# Переменная, содержащая максимальный общий размер состояний пользователей в памяти в байтах
+FSM_MAX_BYTES: int = int(getenv("FSM_MAX_BYTES", 64 * 1024 * 1024))
+
+# Переменная, содержащая публичный URL-адрес сервера бота для работы через вебхук, при её отсутствии используется long polling
+WEBHOOK_URL: str | None = getenv("WEBHOOK_URL")
+
+# Переменная, содержащая путь, по которому сервер бота принимает обновления от Телеграм
+WEBHOOK_PATH: str = getenv("WEBHOOK_PATH", "/webhook")
+
+# Переменная, содержащая секретный токен, которым Телеграм подписывает запросы к вебхуку,
+# при её отсутствии токен создаётся при каждом запуске бота, так как без него вебхук принимает запросы от кого угодно
+WEBHOOK_SECRET: str = getenv("WEBHOOK_SECRET") or token_urlsafe(32)
+
+# Переменная, содержащая адрес, на котором сервер бота принимает запросы
+WEBHOOK_HOST: str = getenv("WEBHOOK_HOST", "0.0.0.0")
+
+# Переменная, содержащая порт, на котором сервер бота принимает запросы
+WEBHOOK_PORT: int = int(getenv("WEBHOOK_PORT", 8080))
+
+# Переменная, содержащая максимальное количество одновременно обрабатываемых обновлений
+WEBHOOK_WORKERS: int = int(getenv("WEBHOOK_WORKERS", 32))
+
+# Переменная, содержащая максимальное время ожидания обработки принятых обновлений при остановке сервера в секундах
+WEBHOOK_SHUTDOWN_TIMEOUT: int = int(getenv("WEBHOOK_SHUTDOWN_TIMEOUT", 30))
+
+# Переменная, содержащая максимальное количество запросов к Телеграм в секунду
+SENDER_GLOBAL_RATE: float = float(getenv("SENDER_GLOBAL_RATE", 25))
+
+# Переменная, содержащая максимальное количество уведомлений в секунду в один чат
+SENDER_CHAT_RATE: float = float(getenv("SENDER_CHAT_RATE", 1))
+
+# Переменная, содержащая количество уведомлений, которые можно отправить в один чат подряд без ожидания
+SENDER_CHAT_BURST: int = int(getenv("SENDER_CHAT_BURST", 3))
+
+# Переменная, содержащая количество задач, отправляющих уведомления
+SENDER_WORKERS: int = int(getenv("SENDER_WORKERS", 4))
+
+# Переменная, содержащая максимальное количество повторов запроса к Телеграм после ошибки 429
+SENDER_MAX_RETRIES: int = int(getenv("SENDER_MAX_RETRIES", 3))
+
+# Переменная, содержащая максимальное время ожидания отправки оставшихся уведомлений при остановке бота в секундах
+SENDER_SHUTDOWN_TIMEOUT: int = int(getenv("SENDER_SHUTDOWN_TIMEOUT", 10))
+
+# Переменная, содержащая время накопления уведомлений для сводки получателя отчётов в секундах
+DIGEST_WINDOW: int = int(getenv("DIGEST_WINDOW", 600))
+
+# Переменная, содержащая местное время создателя группы в формате ЧЧ:ММ, в которое ему напоминается о несозданном отчёте,
+# по умолчанию и при пустом значении напоминания не отправляются
+REMINDER_TIME: str = getenv("REMINDER_TIME", "")
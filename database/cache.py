@@ -0,0 +1,101 @@
+# Файл, содержащий кэш для результатов запросов в базу данных
+
+
+# Подключение модулей Python
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Hashable
+
+
+# Подключение пользовательских модулей
+from config import CACHE_SIZE, CACHE_TTL, EXPORTS_CACHE_TTL
+
+
+# Объект, возвращаемый кэшем при отсутствии записи
+MISSING = object()
+
+
+# Класс для описания кэша, ограниченного по количеству записей и времени их жизни
+class Cache:
+    """Класс для описания кэша, ограниченного по количеству записей и времени их жизни"""
+
+    # Магический метод __init__, срабатывающий при создании объекта класса
+    def __init__(self, name: str, max_size: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.name: str = name
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._records: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    # Метод для получения значения из кэша по ключу, возвращающий MISSING при отсутствии записи или истечении её времени жизни
+    def get(self, key: Hashable) -> Any:
+        record: tuple[float, Any] | None = self._records.get(key)
+
+        if record is None or record[0] < monotonic():
+            if not record is None:
+                del self._records[key]
+
+            self.misses += 1
+
+            return MISSING
+
+        self._records.move_to_end(key)
+        self.hits += 1
+
+        return record[1]
+
+    # Метод для записи значения в кэш по ключу с вытеснением давно использованных записей
+    def set(self, key: Hashable, value: Any) -> None:
+        self._records[key] = (monotonic() + self.ttl, value)
+        self._records.move_to_end(key)
+
+        while len(self._records) > self.max_size:
+            self._records.popitem(last=False)
+
+    # Метод для удаления записи из кэша по ключу
+    def invalidate(self, key: Hashable) -> None:
+        self._records.pop(key, None)
+
+    # Метод для удаления из кэша записей, ключ и значение которых удовлетворяют условию
+    def invalidate_if(self, condition: Callable[[Hashable, Any], bool]) -> None:
+        for key in [
+            key for key, (_, value) in self._records.items() if condition(key, value)
+        ]:
+            del self._records[key]
+
+    # Метод для очистки кэша
+    def clear(self) -> None:
+        self._records.clear()
+
+    # Метод для получения статистики использования кэша
+    def get_stats(self) -> dict[str, int | float]:
+        requests_cnt: int = self.hits + self.misses
+
+        stats: dict[str, int | float] = {
+            "size": len(self._records),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests_cnt if requests_cnt else 0.0,
+        }
+
+        return stats
+
+
+# Кэш объектов пользователей по их Телеграм id
+users_cache = Cache("users")
+
+# Кэш объектов групп по Телеграм id создателя или получателя отчётов и названию группы
+groups_cache = Cache("groups")
+
+# Кэш списков названий групп, которые создал пользователь или в которых он назначен получателем отчётов
+groups_lists_cache = Cache("groups_lists")
+
+# Кэш текстов статистики по id группы, датам начала и конца периода времени и версии данных группы
+statistics_cache = Cache("statistics")
+
+# Кэш Телеграм id отправленных файлов отчётов по id группы, датам начала и конца периода времени, формату файла и версии данных группы
+exports_cache = Cache("exports", ttl=EXPORTS_CACHE_TTL)
+
+# Кэш страниц имён участников группы по id группы, версии данных группы и номеру страницы
+members_pages_cache = Cache("members_pages")
@@ -0,0 +1,117 @@
+# Файл, содержащий пул процессов для создания файлов отчётов вне цикла событий бота
+
+
+# Подключение модулей Python
+from asyncio import Semaphore, TimeoutError, get_running_loop, wait_for
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from multiprocessing import get_context
+from typing import Any, Callable
+
+
+# Подключение пользовательских модулей
+from config import EXPORT_WORKERS, EXPORT_TIMEOUT
+from database.writers import Pdf_Writer
+
+
+# Класс для описания пула процессов с ограничением количества одновременных задач и времени их выполнения
+class Export_Pool:
+    """Класс для описания пула процессов с ограничением количества одновременных задач и времени их выполнения"""
+
+    # Магический метод __init__, срабатывающий при создании объекта класса
+    def __init__(
+        self,
+        max_workers: int = EXPORT_WORKERS,
+        timeout: float = EXPORT_TIMEOUT,
+        initializer: Callable[[], None] | None = None,
+    ):
+        self.max_workers: int = max_workers
+        self.timeout: float = timeout
+        self.initializer: Callable[[], None] | None = initializer
+        self.queued: int = 0
+        self.running: int = 0
+        self.completed: int = 0
+        self.timed_out: int = 0
+        self._semaphore = Semaphore(max_workers)
+        self._executor: ProcessPoolExecutor | None = None
+
+    # Метод для выполнения функции с аргументами в процессе пула с ограничением времени выполнения,
+    # при превышении времени или поломке пула его процессы завершаются, так как иначе задача продолжила бы занимать процесс,
+    # а новый пул создаётся при следующем вызове
+    async def _execute(self, function: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self.max_workers,
+                mp_context=get_context("spawn"),
+                initializer=self.initializer,
+            )
+
+        executor: ProcessPoolExecutor = self._executor
+
+        try:
+            return await wait_for(
+                get_running_loop().run_in_executor(executor, partial(function, *args)),
+                self.timeout,
+            )
+        except (TimeoutError, BrokenProcessPool):
+            if self._executor is executor:
+                self._executor = None
+
+                for process in list(executor._processes.values()):
+                    process.terminate()
+
+                executor.shutdown(wait=False, cancel_futures=True)
+
+            raise
+
+    # Метод для выполнения функции с аргументами в отдельном процессе, ожидающий своей очереди при занятости всех процессов,
+    # задача, прерванная завершением процессов пула из-за превышения времени другой задачей, выполняется повторно
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        self.queued += 1
+
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+
+        try:
+            try:
+                result: Any = await self._execute(function, *args)
+            except BrokenProcessPool:
+                result: Any = await self._execute(function, *args)
+
+            self.completed += 1
+
+            return result
+        except TimeoutError:
+            self.timed_out += 1
+
+            raise
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    # Метод для получения статистики использования пула
+    def get_stats(self) -> dict[str, int]:
+        stats: dict[str, int] = {
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "timed_out": self.timed_out,
+        }
+
+        return stats
+
+    # Метод для остановки процессов пула
+    def shutdown(self) -> None:
+        if not self._executor is None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+            self._executor = None
+
+
+# Пул процессов для создания файлов отчётов, в каждом из которых шрифты регистрируются один раз при запуске
+export_pool = Export_Pool(initializer=Pdf_Writer.register_fonts)
@@ -2,9 +2,26 @@
 
 
 # Подключение модулей Python
-from datetime import date as Date
+from datetime import date as Date, datetime
 from typing import List
-from sqlalchemy import BigInteger, ForeignKey, String
+from sqlalchemy import (
+    BigInteger,
+    Connection,
+    ForeignKey,
+    Index,
+    String,
+    column,
+    delete,
+    false,
+    func,
+    inspect,
+    insert,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.ext.asyncio import AsyncAttrs, create_async_engine, async_sessionmaker
 
@@ -15,7 +32,7 @@ from config import DB_URL
 
 # Настройка работы файла
 engine = create_async_engine(DB_URL)
-session = async_sessionmaker(engine)
+session = async_sessionmaker(engine, expire_on_commit=False)
 
 
 # Базовый класс для моделей
@@ -30,11 +47,20 @@ class User(Base):
     """Класс для описания модели таблицы "users" в базе данных"""
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_tg_id", "tg_id", unique=True),
+        Index("ix_users_utc_offset", "utc_offset"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     tg_id = mapped_column(BigInteger)
     utc_offset: Mapped[int] = mapped_column()
     feedbacks_cnt: Mapped[int] = mapped_column()
+    feedbacks_date: Mapped[Date | None] = mapped_column()
+    username: Mapped[str | None] = mapped_column(String(32))
+    full_name: Mapped[str | None] = mapped_column(String(129))
+    info_updated_at: Mapped[datetime | None] = mapped_column()
+    digest: Mapped[bool] = mapped_column(default=False, server_default=false())
 
     groups_where_creator: Mapped[List["Group"]] = relationship(
         "Group", back_populates="creator_info", foreign_keys="Group.creator"
@@ -51,38 +77,432 @@ class Group(Base):
     """Класс для описания модели таблицы "groups" в базе данных"""
 
     __tablename__ = "groups"
+    __table_args__ = (
+        Index("ix_groups_creator_name", "creator", "name", unique=True),
+        Index("ix_groups_reports_recipient_name", "reports_recipient", "name"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     creator: Mapped[int] = mapped_column(ForeignKey("users.id"))
     name: Mapped[str] = mapped_column(String(25))
     reports_recipient: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    members: Mapped[str] = mapped_column(String(625))
+    data_version: Mapped[int] = mapped_column(default=0, server_default="0")
 
     creator_info: Mapped["User"] = relationship("User", foreign_keys=[creator])
     reports_recipient_info: Mapped["User"] = relationship(
         "User", foreign_keys=[reports_recipient]
     )
 
+    members: Mapped[List["Member"]] = relationship(
+        "Member", cascade="all, delete-orphan", back_populates="group_info"
+    )
     reports: Mapped[List["Report"]] = relationship(
         "Report", cascade="all, delete-orphan", back_populates="group_info"
     )
 
 
+# Класс для описания модели таблицы "members" в базе данных
+class Member(Base):
+    """Класс для описания модели таблицы "members" в базе данных"""
+
+    __tablename__ = "members"
+    __table_args__ = (Index("ix_members_group_name", "group", "name", unique=True),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    group: Mapped[int] = mapped_column(ForeignKey("groups.id"))
+    name: Mapped[str] = mapped_column(String(25))
+
+    group_info: Mapped["Group"] = relationship("Group", back_populates="members")
+
+    absences: Mapped[List["Absence"]] = relationship(
+        "Absence", cascade="all, delete-orphan", back_populates="member_info"
+    )
+
+
 # Класс для описания модели таблицы "reports" в базе данных
 class Report(Base):
     """Класс для описания модели таблицы "reports" в базе данных"""
 
     __tablename__ = "reports"
+    __table_args__ = (Index("ix_reports_group_date", "group", "date", unique=True),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     group: Mapped[int] = mapped_column(ForeignKey("groups.id"))
     date: Mapped[Date] = mapped_column()
-    members: Mapped[str] = mapped_column(String(625))
+    message_chat = mapped_column(BigInteger, nullable=True)
+    message_id: Mapped[int | None] = mapped_column()
+    edits: Mapped[int] = mapped_column(default=0, server_default="0")
 
     group_info: Mapped["Group"] = relationship("Group", back_populates="reports")
 
+    absences: Mapped[List["Absence"]] = relationship(
+        "Absence", cascade="all, delete-orphan", back_populates="report_info"
+    )
+
+
+# Класс для описания модели таблицы "report_absences" в базе данных
+class Absence(Base):
+    """Класс для описания модели таблицы "report_absences" в базе данных"""
+
+    __tablename__ = "report_absences"
+    __table_args__ = (
+        Index("ix_report_absences_report_member", "report", "member", unique=True),
+        Index("ix_report_absences_member", "member"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    report: Mapped[int] = mapped_column(ForeignKey("reports.id"))
+    member: Mapped[int] = mapped_column(ForeignKey("members.id"))
+
+    report_info: Mapped["Report"] = relationship("Report", back_populates="absences")
+    member_info: Mapped["Member"] = relationship("Member", back_populates="absences")
+
+
+# Класс для описания модели таблицы "report_rollups" в базе данных
+class Report_Rollup(Base):
+    """Класс для описания модели таблицы "report_rollups" в базе данных"""
+
+    __tablename__ = "report_rollups"
+    __table_args__ = (
+        Index(
+            "ix_report_rollups_group_period_date",
+            "group",
+            "period",
+            "date",
+            unique=True,
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    group: Mapped[int] = mapped_column(ForeignKey("groups.id"))
+    period: Mapped[str] = mapped_column(String(5))
+    date: Mapped[Date] = mapped_column()
+    reports: Mapped[int] = mapped_column()
+
+
+# Класс для описания модели таблицы "absence_rollups" в базе данных
+class Absence_Rollup(Base):
+    """Класс для описания модели таблицы "absence_rollups" в базе данных"""
+
+    __tablename__ = "absence_rollups"
+    __table_args__ = (
+        Index(
+            "ix_absence_rollups_group_period_date_member",
+            "group",
+            "period",
+            "date",
+            "member",
+            unique=True,
+        ),
+        Index("ix_absence_rollups_member", "member"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    group: Mapped[int] = mapped_column(ForeignKey("groups.id"))
+    member: Mapped[int] = mapped_column(ForeignKey("members.id"))
+    period: Mapped[str] = mapped_column(String(5))
+    date: Mapped[Date] = mapped_column()
+    absences: Mapped[int] = mapped_column()
+
+
+# Функция для получения дат начала дня, месяца и года, в которые входит дата
+def get_periods_starts(date: Date) -> dict[str, Date]:
+    periods_starts: dict[str, Date] = {
+        "day": date,
+        "month": date.replace(day=1),
+        "year": date.replace(month=1, day=1),
+    }
+
+    return periods_starts
+
+
+# Функция для добавления столбцов, которых нет в уже существующих таблицах базы данных
+def add_columns(conn: Connection) -> None:
+    for model_table in Base.metadata.sorted_tables:
+        table_columns: list[str] = [
+            table_column["name"]
+            for table_column in inspect(conn).get_columns(model_table.name)
+        ]
+
+        for model_column in model_table.columns:
+            if model_column.name in table_columns:
+                continue
+
+            column_definition: str = str(
+                CreateColumn(model_column).compile(dialect=conn.dialect)
+            )
+
+            conn.execute(
+                text(f'ALTER TABLE "{model_table.name}" ADD COLUMN {column_definition}')
+            )
+
+
+# Функция для переноса участников групп и отчётов из строковых столбцов "members" в таблицы "members" и "report_absences"
+def migrate_members(conn: Connection) -> None:
+    groups_columns: list[str] = [
+        table_column["name"] for table_column in inspect(conn).get_columns("groups")
+    ]
+
+    if not "members" in groups_columns:
+        return
+
+    legacy_groups = table("groups", column("id"), column("members"))
+    legacy_reports = table("reports", column("id"), column("group"), column("members"))
+
+    members: list[dict] = []
+
+    for group_id, group_members in conn.execute(
+        select(legacy_groups.c.id, legacy_groups.c.members)
+    ):
+        for name in set(group_members.split(";\n")) if group_members else []:
+            members.append({"group": group_id, "name": name})
+
+    if members != []:
+        conn.execute(insert(Member), members)
+
+    members_ids: dict[tuple[int, str], int] = {
+        (group_id, name): id
+        for id, group_id, name in conn.execute(
+            select(Member.id, Member.group, Member.name)
+        )
+    }
+    absences: list[dict] = []
+
+    for report_id, group_id, report_members in conn.execute(
+        select(legacy_reports.c.id, legacy_reports.c.group, legacy_reports.c.members)
+    ):
+        for name in set(report_members.split(";\n")) if report_members else []:
+            if (group_id, name) in members_ids:
+                absences.append(
+                    {"report": report_id, "member": members_ids[(group_id, name)]}
+                )
+
+    if absences != []:
+        conn.execute(insert(Absence), absences)
+
+    conn.execute(text("ALTER TABLE reports DROP COLUMN members"))
+    conn.execute(text("ALTER TABLE groups DROP COLUMN members"))
+
+
+# Функция для удаления повторяющихся отчётов группы за один день, созданных до появления уникального индекса "ix_reports_group_date",
+# из повторяющихся отчётов остаётся последний созданный, а таблицы "report_rollups" и "absence_rollups" заполняются заново
+def deduplicate_reports(conn: Connection) -> None:
+    indexes: dict[str, dict] = {
+        index["name"]: index for index in inspect(conn).get_indexes("reports")
+    }
+
+    if indexes.get("ix_reports_group_date", {}).get("unique"):
+        return
+
+    duplicates = select(Report.id).where(
+        Report.id.not_in(
+            select(func.max(Report.id)).group_by(Report.group, Report.date)
+        )
+    )
+
+    if not conn.scalar(duplicates.limit(1)) is None:
+        conn.execute(delete(Absence).where(Absence.report.in_(duplicates)))
+        conn.execute(delete(Report).where(Report.id.in_(duplicates)))
+        conn.execute(delete(Absence_Rollup))
+        conn.execute(delete(Report_Rollup))
+
+    if "ix_reports_group_date" in indexes:
+        conn.execute(text("DROP INDEX ix_reports_group_date"))
+
+
+# Функция для объединения пользователей с одинаковым Телеграм id, которые могли появиться до создания уникального индекса,
+# группы удаляемых пользователей переходят к пользователю с наименьшим id
+def deduplicate_users(conn: Connection) -> None:
+    indexes: dict[str, dict] = {
+        index["name"]: index for index in inspect(conn).get_indexes("users")
+    }
+
+    if indexes.get("ix_users_tg_id", {}).get("unique"):
+        return
+
+    kept_users: dict[int, int] = {}
+
+    for user, tg_id in conn.execute(
+        select(User.id, User.tg_id).order_by(User.id)
+    ).all():
+        kept_user: int = kept_users.setdefault(tg_id, user)
+
+        if kept_user != user:
+            conn.execute(
+                update(Group).where(Group.creator == user).values(creator=kept_user)
+            )
+            conn.execute(
+                update(Group)
+                .where(Group.reports_recipient == user)
+                .values(reports_recipient=kept_user)
+            )
+            conn.execute(delete(User).where(User.id == user))
+
+    if "ix_users_tg_id" in indexes:
+        conn.execute(text("DROP INDEX ix_users_tg_id"))
+
+
+# Функция для переноса участников и отчётов группы в другую группу с тем же создателем и названием по их id,
+# участники с одинаковыми именами и отчёты за одну дату объединяются, после чего группа удаляется
+def merge_groups(conn: Connection, group: int, kept_group: int) -> None:
+    kept_members: dict[str, int] = {
+        name: member
+        for name, member in conn.execute(
+            select(Member.name, Member.id).where(Member.group == kept_group)
+        )
+    }
+    merged_members: dict[int, int] = {}
+
+    for member, name in conn.execute(
+        select(Member.id, Member.name).where(Member.group == group)
+    ).all():
+        if name in kept_members:
+            merged_members[member] = kept_members[name]
+        else:
+            conn.execute(
+                update(Member).where(Member.id == member).values(group=kept_group)
+            )
+
+    kept_reports: dict[Date, int] = {
+        date: report
+        for date, report in conn.execute(
+            select(Report.date, Report.id).where(Report.group == kept_group)
+        )
+    }
+
+    for report, date in conn.execute(
+        select(Report.id, Report.date).where(Report.group == group)
+    ).all():
+        absences: set[int] = {
+            merged_members.get(member, member)
+            for member in conn.scalars(
+                select(Absence.member).where(Absence.report == report)
+            )
+        }
+        kept_report: int | None = kept_reports.get(date)
+
+        conn.execute(delete(Absence).where(Absence.report == report))
+
+        if kept_report is None:
+            conn.execute(
+                update(Report).where(Report.id == report).values(group=kept_group)
+            )
+
+            kept_report = report
+        else:
+            absences -= set(
+                conn.scalars(
+                    select(Absence.member).where(Absence.report == kept_report)
+                )
+            )
+
+            conn.execute(delete(Report).where(Report.id == report))
+
+        if absences != set():
+            conn.execute(
+                insert(Absence),
+                [{"report": kept_report, "member": member} for member in absences],
+            )
+
+    conn.execute(delete(Absence_Rollup).where(Absence_Rollup.group == group))
+    conn.execute(delete(Report_Rollup).where(Report_Rollup.group == group))
+    conn.execute(delete(Member).where(Member.group == group))
+    conn.execute(delete(Group).where(Group.id == group))
+
+
+# Функция для объединения групп с одинаковыми создателем и названием, которые могли появиться до создания уникального индекса,
+# данные групп переносятся в группу с наименьшим id, а таблицы сводных данных очищаются для повторного заполнения
+def deduplicate_groups(conn: Connection) -> None:
+    indexes: dict[str, dict] = {
+        index["name"]: index for index in inspect(conn).get_indexes("groups")
+    }
+
+    if indexes.get("ix_groups_creator_name", {}).get("unique"):
+        return
+
+    kept_groups: dict[tuple[int, str], int] = {}
+    is_merged = False
+
+    for group, creator, name in conn.execute(
+        select(Group.id, Group.creator, Group.name).order_by(Group.id)
+    ).all():
+        kept_group: int = kept_groups.setdefault((creator, name), group)
+
+        if kept_group != group:
+            merge_groups(conn, group, kept_group)
+
+            is_merged = True
+
+    if is_merged:
+        conn.execute(delete(Absence_Rollup))
+        conn.execute(delete(Report_Rollup))
+
+    if "ix_groups_creator_name" in indexes:
+        conn.execute(text("DROP INDEX ix_groups_creator_name"))
+
+
+# Функция для заполнения таблиц "report_rollups" и "absence_rollups" по уже существующим отчётам
+def build_rollups(conn: Connection) -> None:
+    if not conn.scalar(select(Report_Rollup.id).limit(1)) is None:
+        return
+
+    reports: dict[tuple[int, str, Date], int] = {}
+    absences: dict[tuple[int, int, str, Date], int] = {}
+
+    for group, date in conn.execute(select(Report.group, Report.date)):
+        for period, period_start in get_periods_starts(date).items():
+            key = (group, period, period_start)
+            reports[key] = reports.get(key, 0) + 1
+
+    for group, member, date in conn.execute(
+        select(Report.group, Absence.member, Report.date).join(
+            Report, Report.id == Absence.report
+        )
+    ):
+        for period, period_start in get_periods_starts(date).items():
+            key = (group, member, period, period_start)
+            absences[key] = absences.get(key, 0) + 1
+
+    if reports != {}:
+        conn.execute(
+            insert(Report_Rollup),
+            [
+                {"group": group, "period": period, "date": date, "reports": cnt}
+                for (group, period, date), cnt in reports.items()
+            ],
+        )
+
+    if absences != {}:
+        conn.execute(
+            insert(Absence_Rollup),
+            [
+                {
+                    "group": group,
+                    "member": member,
+                    "period": period,
+                    "date": date,
+                    "absences": cnt,
+                }
+                for (group, member, period, date), cnt in absences.items()
+            ],
+        )
+
+
+# Функция для создания индексов, которых нет в уже существующих таблицах базы данных
+def create_indexes(conn: Connection) -> None:
+    for model_table in Base.metadata.sorted_tables:
+        for index in model_table.indexes:
+            index.create(conn, checkfirst=True)
+
 
 # Функция для создания моделей таблиц в базе данных
 async def create_models() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(add_columns)
+        await conn.run_sync(migrate_members)
+        await conn.run_sync(deduplicate_reports)
+        await conn.run_sync(deduplicate_users)
+        await conn.run_sync(deduplicate_groups)
+        await conn.run_sync(create_indexes)
+        await conn.run_sync(build_rollups)
@@ -0,0 +1,202 @@
+# Файл, содержащий индекс накопленных количеств отчётов и отсутствий участников групп по датам
+
+
+# Подключение модулей Python
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import date as Date
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Подключение пользовательских модулей
+from config import PREFIX_INDEX_SIZE
+from database.models import Report, Absence
+
+
+# Класс для описания индекса накопленных количеств отчётов и отсутствий участников группы по датам
+class Group_Prefix_Index:
+    """Класс для описания индекса накопленных количеств отчётов и отсутствий участников группы по датам.
+    Даты хранятся в отсортированных массивах порядковых номеров дней, поэтому позиция даты в массиве
+    равна накопленному количеству отчётов или отсутствий участника до неё"""
+
+    # Магический метод __init__, срабатывающий при создании объекта класса
+    def __init__(self) -> None:
+        self.reports: array = array("l")
+        self.absences: dict[int, array] = {}
+
+    # Статический метод для получения накопленного количества записей в массиве дат до даты включительно
+    @staticmethod
+    def get_total(dates: array, date: int) -> int:
+        return bisect_right(dates, date)
+
+    # Метод для получения количества отчётов и отсутствий участников по их id за период времени
+    # по датам его начала и конца
+    def count(self, date_from: Date, date_to: Date) -> tuple[int, dict[int, int]]:
+        ordinal_from: int = date_from.toordinal() - 1
+        ordinal_to: int = date_to.toordinal()
+
+        reports_cnt: int = self.get_total(self.reports, ordinal_to) - self.get_total(
+            self.reports, ordinal_from
+        )
+        absences_cnts: dict[int, int] = {}
+
+        for member, dates in self.absences.items():
+            absences_cnt: int = self.get_total(dates, ordinal_to) - self.get_total(
+                dates, ordinal_from
+            )
+
+            if absences_cnt > 0:
+                absences_cnts[member] = absences_cnt
+
+        return reports_cnt, absences_cnts
+
+    # Метод для добавления отчёта в индекс по дате его создания
+    def add_report(self, date: Date) -> None:
+        insort(self.reports, date.toordinal())
+
+    # Метод для изменения отсутствий участников в индексе по дате создания отчёта и изменениям количества отсутствий участников
+    def update_absences(self, date: Date, absences_deltas: dict[int, int]) -> None:
+        ordinal: int = date.toordinal()
+
+        for member, delta in absences_deltas.items():
+            dates: array = self.absences.setdefault(member, array("l"))
+
+            if delta > 0:
+                insort(dates, ordinal)
+            else:
+                position: int = bisect_left(dates, ordinal)
+
+                if position < len(dates) and dates[position] == ordinal:
+                    del dates[position]
+
+    # Метод для удаления участника из индекса по его id
+    def remove_member(self, member: int) -> None:
+        self.absences.pop(member, None)
+
+
+# Класс для описания индексов групп, загружаемых из базы данных по мере необходимости
+class Prefix_Indexes:
+    """Класс для описания индексов групп, загружаемых из базы данных по мере необходимости
+    и ограниченных по количеству загруженных групп"""
+
+    # Магический метод __init__, срабатывающий при создании объекта класса
+    def __init__(self, max_size: int = PREFIX_INDEX_SIZE) -> None:
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._indexes: OrderedDict[int, Group_Prefix_Index] = OrderedDict()
+        self._versions: dict[int, int] = {}
+
+    # Статический метод для построения индекса группы по данным из базы данных по id группы
+    @staticmethod
+    async def build(sess: AsyncSession, group: int) -> Group_Prefix_Index:
+        index = Group_Prefix_Index()
+
+        index.reports = array(
+            "l",
+            sorted(
+                date.toordinal()
+                for date in await sess.scalars(
+                    select(Report.date).where(Report.group == group)
+                )
+            ),
+        )
+
+        for member, date in sorted(
+            (member, date.toordinal())
+            for member, date in await sess.execute(
+                select(Absence.member, Report.date)
+                .join(Report, Report.id == Absence.report)
+                .where(Report.group == group)
+            )
+        ):
+            index.absences.setdefault(member, array("l")).append(date)
+
+        return index
+
+    # Метод для получения индекса группы по её id с загрузкой из базы данных при его отсутствии
+    async def get(self, sess: AsyncSession, group: int) -> Group_Prefix_Index:
+        index: Group_Prefix_Index | None = self._indexes.get(group)
+
+        if not index is None:
+            self._indexes.move_to_end(group)
+            self.hits += 1
+
+            return index
+
+        self.misses += 1
+        version: int = self._versions.get(group, 0)
+        index = await self.build(sess, group)
+
+        # Индекс не сохраняется, если группа изменилась во время его построения
+        if self._versions.get(group, 0) == version:
+            self._indexes[group] = index
+
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+
+        return index
+
+    # Метод для получения уже загруженного индекса группы по её id с отметкой об её изменении
+    def get_loaded(self, group: int) -> Group_Prefix_Index | None:
+        self._versions[group] = self._versions.get(group, 0) + 1
+
+        return self._indexes.get(group)
+
+    # Метод для изменения индекса группы после создания или редактирования отчёта по id группы, дате создания отчёта,
+    # изменению количества отчётов и изменениям количества отсутствий участников
+    def update(
+        self,
+        group: int,
+        date: Date,
+        reports_delta: int,
+        absences_deltas: dict[int, int],
+    ) -> None:
+        index: Group_Prefix_Index | None = self.get_loaded(group)
+
+        if index is None:
+            return
+
+        if reports_delta > 0:
+            index.add_report(date)
+
+        index.update_absences(date, absences_deltas)
+
+    # Метод для удаления участника из индекса группы по id группы и id участника
+    def remove_member(self, group: int, member: int) -> None:
+        index: Group_Prefix_Index | None = self.get_loaded(group)
+
+        if not index is None:
+            index.remove_member(member)
+
+    # Метод для удаления индекса группы по её id, после которого он будет построен заново при следующем обращении
+    def invalidate(self, group: int) -> None:
+        self.get_loaded(group)
+        self._indexes.pop(group, None)
+
+    # Метод для перестроения индекса группы по данным из базы данных по её id
+    async def rebuild(self, sess: AsyncSession, group: int) -> Group_Prefix_Index:
+        self.invalidate(group)
+
+        index: Group_Prefix_Index = await self.get(sess, group)
+
+        return index
+
+    # Метод для получения статистики использования индексов
+    def get_stats(self) -> dict[str, int | float]:
+        requests_cnt: int = self.hits + self.misses
+
+        stats: dict[str, int | float] = {
+            "size": len(self._indexes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests_cnt if requests_cnt else 0.0,
+        }
+
+        return stats
+
+
+# Индексы накопленных количеств отчётов и отсутствий участников групп
+prefix_indexes = Prefix_Indexes()
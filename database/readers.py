@@ -0,0 +1,68 @@
+# Файл, содержащий классы для чтения имён участников групп из файлов
+
+
+# Подключение модулей Python
+from csv import Error, Sniffer, excel, reader
+from io import BytesIO, StringIO
+from xml.etree.ElementTree import ParseError
+from zipfile import BadZipFile
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+
+# Класс для чтения имён участников группы из первого столбца файла *.csv или *.xlsx
+class Members_Reader:
+    """Класс для чтения имён участников группы из первого столбца файла *.csv или *.xlsx.
+    Пустые ячейки пропускаются, а при ошибке чтения файла вызывается исключение ValueError
+    """
+
+    # Статический метод для чтения имён участников из файла *.csv по его содержимому
+    @staticmethod
+    def read_csv(data: bytes) -> list[str]:
+        try:
+            text: str = data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            text: str = data.decode("cp1251")
+
+        try:
+            dialect = Sniffer().sniff(text[:4096], delimiters=",;\t")
+        except Error:
+            dialect = excel
+
+        try:
+            members: list[str] = [
+                row[0].strip() for row in reader(StringIO(text), dialect) if row != []
+            ]
+        except Error as error:
+            raise ValueError("Файл *.csv повреждён") from error
+
+        return [member for member in members if member != ""]
+
+    # Статический метод для чтения имён участников с первого листа файла *.xlsx по его содержимому
+    @staticmethod
+    def read_xlsx(data: bytes) -> list[str]:
+        try:
+            work_book = load_workbook(BytesIO(data), read_only=True, data_only=True)
+        except (BadZipFile, InvalidFileException, KeyError) as error:
+            raise ValueError("Файл *.xlsx повреждён") from error
+
+        members: list[str] = []
+
+        try:
+            for row in work_book.worksheets[0].iter_rows(max_col=1, values_only=True):
+                if row != () and not row[0] is None and str(row[0]).strip() != "":
+                    members.append(str(row[0]).strip())
+        except (ParseError, KeyError, ValueError) as error:
+            raise ValueError("Файл *.xlsx повреждён") from error
+        finally:
+            work_book.close()
+
+        return members
+
+    # Метод класса для чтения имён участников из файла по его имени и содержимому
+    @classmethod
+    def read(cls, file_name: str, data: bytes) -> list[str]:
+        if file_name.lower().endswith(".csv"):
+            return cls.read_csv(data)
+
+        return cls.read_xlsx(data)
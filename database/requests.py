@@ -2,22 +2,44 @@
 
 
 # Подключение модулей Python
+from asyncio import TimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, date as Date, timezone, timedelta
+from itertools import groupby
+from typing import Callable
 from dateutil.relativedelta import relativedelta
-from aiogram.types import FSInputFile
-from sqlalchemy import select, update
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, Side, Border, PatternFill
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase import pdfmetrics
-from reportlab.lib import colors
+from aiogram.types import BufferedInputFile
+from reportlab.platypus.doctemplate import LayoutError
+from sqlalchemy import select, update, delete, insert, func, literal, case, and_, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 # Подключение пользовательских модулей
-from bot import bot
-from database.models import session, User, Group, Report
+from config import USER_INFO_TTL, KEYBOARD_PAGE_SIZE
+from database.models import (
+    User,
+    Group,
+    Member,
+    Report,
+    Absence,
+    Report_Rollup,
+    Absence_Rollup,
+    get_periods_starts,
+)
+from database.cache import (
+    MISSING,
+    users_cache,
+    groups_cache,
+    groups_lists_cache,
+    statistics_cache,
+    exports_cache,
+    members_pages_cache,
+)
+from database.writers import Xlsx_Writer, Pdf_Writer
+from database.export_pool import export_pool
+from database.prefix_index import Group_Prefix_Index, prefix_indexes
 
 
 # Класс для работы с датой и временем
@@ -96,6 +118,76 @@ class Datetime_Handler:
         except ValueError:
             return False
 
+    # Метод класса для получения дат начала и конца периода времени в часовом поясе по смещению UTC,
+    # названию периода или датам его начала и конца
+    @classmethod
+    async def get_period(
+        cls, utc_offset: int, date_from: str, date_to: str | None = None
+    ) -> tuple[Date, Date]:
+        if date_from == "Неделя":
+            date_from: Date = await cls.get_start_of_week(utc_offset)
+            date_to: Date = await cls.get_local_date(utc_offset)
+        elif date_from == "Месяц":
+            date_from: Date = await cls.get_start_of_month(utc_offset)
+            date_to: Date = await cls.get_local_date(utc_offset)
+        elif date_from == "Год":
+            date_from: Date = await cls.get_start_of_year(utc_offset)
+            date_to: Date = await cls.get_local_date(utc_offset)
+        else:
+            date_from: Date = datetime.strptime(date_from, "%d.%m.%Y").date()
+            date_to: Date = datetime.strptime(date_to, "%d.%m.%Y").date()
+
+        return date_from, date_to
+
+    # Статический метод для разбиения периода времени на наименьшее количество целых лет, месяцев и дней
+    # по датам его начала и конца, возвращает список из названий частей и дат начала первой и последней из них
+    @staticmethod
+    async def split_period(
+        date_from: Date, date_to: Date
+    ) -> list[tuple[str, Date, Date]]:
+        parts: list[tuple[str, Date, Date]] = []
+        date: Date = date_from
+
+        while date <= date_to:
+            if (
+                date.month == 1
+                and date.day == 1
+                and date + relativedelta(years=1, days=-1) <= date_to
+            ):
+                period = "year"
+                next_date: Date = date + relativedelta(years=1)
+            elif date.day == 1 and date + relativedelta(months=1, days=-1) <= date_to:
+                period = "month"
+                next_date: Date = date + relativedelta(months=1)
+            else:
+                period = "day"
+                next_date: Date = date + relativedelta(days=1)
+
+            if parts != [] and parts[-1][0] == period:
+                parts[-1] = (period, parts[-1][1], date)
+            else:
+                parts.append((period, date, date))
+
+            date = next_date
+
+        return parts
+
+    # Статический метод для получения списка смещений UTC в секундах, в часовых поясах которых сейчас наступило
+    # местное время в формате ЧЧ:ММ
+    @staticmethod
+    async def get_utc_offsets_at(local_time: str) -> list[int]:
+        hours, minutes = map(int, local_time.split(":"))
+        now: datetime = datetime.now(timezone.utc)
+        offset_in_minutes: int = (
+            hours * 60 + minutes - now.hour * 60 - now.minute
+        ) % 1440
+        utc_offsets: list[int] = [offset_in_minutes * 60]
+
+        if offset_in_minutes != 0:
+            utc_offsets.append((offset_in_minutes - 1440) * 60)
+
+        return utc_offsets
+
     # Статический метод для конвертации строкового значения смещения UTC в числовое
     @staticmethod
     async def utc_offset_string_to_int(utc_offset: str) -> int:
@@ -111,588 +203,977 @@ class Datetime_Handler:
         return utc_offset_in_seconds
 
 
-# Класс для записи данных в файл *.xlsx
-class Xlsx_Writer:
-    """Класс для записи данных в файл *.xlsx"""
+# Класс для описания запросов о пользователе базу данных
+class User_Requests:
+    """Класс для описания запросов о пользователях в базу данных"""
 
-    # Статический метод для создания файла отчётов по количеству рядов в нём, данным в рядах и высотам рядов
+    # Статический метод для получения объекта пользователя из базы данных по его Телеграм id
     @staticmethod
-    async def create_reports_file(
-        cnt_rows: int,
-        rows_data: list[list[str]],
-        row_heights: list[int],
-    ) -> None:
-        work_book = Workbook()
-        work_sheet = work_book.active
-        work_sheet.title = "Отчёты"
+    async def get(sess: AsyncSession, tg_id: int) -> User | None:
+        user: User | None = users_cache.get(tg_id)
 
-        for i in range(cnt_rows):
-            work_sheet.append(rows_data[i])
+        if user is MISSING:
+            user = await sess.scalar(select(User).where(User.tg_id == tg_id))
 
-        for i in range(1, cnt_rows + 1):
-            work_sheet.row_dimensions[i].height = row_heights[i - 1]
+            users_cache.set(tg_id, user)
 
-        columns = ["A", "B"]
-        for column in columns:
-            for cell in work_sheet[column]:
-                work_sheet.column_dimensions[column].width = 35
+        return user
 
-                cell.alignment = Alignment(
-                    horizontal="center", vertical="center", wrap_text=True
+    # Статический метод для получения списка групп, которые создал пользователь по его Телеграм id
+    @staticmethod
+    async def get_groups_where_creator(sess: AsyncSession, tg_id: int) -> list[str]:
+        groups: list[str] = groups_lists_cache.get(("creator", tg_id))
+
+        if groups is MISSING:
+            groups = list(
+                await sess.scalars(
+                    select(Group.name)
+                    .join(User, User.id == Group.creator)
+                    .where(User.tg_id == tg_id)
+                    .order_by(Group.name)
                 )
+            )
 
-                black_color = "000000"
-                white_color = "FFFFFF"
+            groups_lists_cache.set(("creator", tg_id), groups)
 
-                cell.font = Font(name="Times New Roman", size=14, color=black_color)
+        return groups
 
-                cell.fill = PatternFill(
-                    start_color=white_color,
-                    end_color=white_color,
-                    fill_type="solid",
+    # Статический метод для получения списка групп, в которых пользователь назначен получателем отчётов по его Телеграм id
+    @staticmethod
+    async def get_groups_where_reports_recipient(
+        sess: AsyncSession, tg_id: int
+    ) -> list[str]:
+        groups: list[str] = groups_lists_cache.get(("reports_recipient", tg_id))
+
+        if groups is MISSING:
+            groups = list(
+                await sess.scalars(
+                    select(Group.name)
+                    .join(User, User.id == Group.reports_recipient)
+                    .where(User.tg_id == tg_id)
+                    .order_by(Group.name)
                 )
+            )
 
-                medium = Side(border_style="medium", color=black_color)
-                cell.border = Border(
-                    left=medium, right=medium, top=medium, bottom=medium
-                )
+            groups_lists_cache.set(("reports_recipient", tg_id), groups)
 
-        work_book.save("./database/Отчёты.xlsx")
+        return groups
 
+    # Метод класса для инициализации пользователя в базе данных по его Телеграм id,
+    # повторная инициализация при одновременных запросах не создаёт второго пользователя
+    @classmethod
+    async def init(cls, sess: AsyncSession, tg_id: int) -> None:
+        user: User | None = await cls.get(sess, tg_id)
 
-# Класс для записи данных в файл *.pdf
-class Pdf_Writer:
-    """Класс для записи данных в файл *.pdf"""
+        if user is None:
+            default_utc_offset = 10800
 
-    # Статический метод для создания файла отчётов по количеству рядов в нём, данным в рядах и высотам рядов
-    @staticmethod
-    async def create_reports_file(
-        cnt_rows: int, rows_data: list[list[str]], rows_heights: dict[int, int]
-    ) -> None:
-        pdf = SimpleDocTemplate("./database/Отчёты.pdf", pagesize=letter)
+            await sess.execute(
+                Report_Requests.get_dialect_insert(sess)(User)
+                .values(tg_id=tg_id, utc_offset=default_utc_offset, feedbacks_cnt=0)
+                .on_conflict_do_nothing(index_elements=["tg_id"])
+            )
 
-        table = Table(rows_data, colWidths=[200, 200, 200], rowHeights=rows_heights)
+            await sess.commit()
 
-        pdfmetrics.registerFont(TTFont("Times New Roman", "./database/times.ttf"))
-        start = (0, 0)
-        end = (-1, -1)
-        style = TableStyle(
-            [
-                ("ALIGN", start, end, "CENTER"),
-                ("VALIGN", start, end, "MIDDLE"),
-                ("FONTNAME", start, end, "Times New Roman"),
-                ("FONTSIZE", start, end, 14),
-                ("TEXTCOLOR", start, end, colors.black),
-                ("BACKGROUND", start, end, colors.white),
-                ("GRID", start, end, 1, colors.black),
-            ]
+            users_cache.invalidate(tg_id)
+
+    # Статический метод для установки смещения UTC пользователя в базе данных по его Телеграм id
+    @staticmethod
+    async def set_utc_offset(sess: AsyncSession, tg_id: int, utc_offset: int) -> None:
+        await sess.execute(
+            update(User).where(User.tg_id == tg_id).values(utc_offset=utc_offset)
         )
 
-        table.setStyle(style)
+        await sess.commit()
 
-        pdf.build([table])
+        users_cache.invalidate(tg_id)
 
+    # Метод класса для получения количества отзывов, отправленных пользователем за текущий день по его местному времени,
+    # по его Телеграм id, счётчик за прошедший день считается нулевым без записи в базу данных
+    @classmethod
+    async def get_feedbacks_cnt(cls, sess: AsyncSession, tg_id: int) -> int:
+        user: User = await cls.get(sess, tg_id)
+        date: Date = await Datetime_Handler.get_local_date(user.utc_offset)
 
-# Класс для описания запросов о пользователе базу данных
-class User_Requests:
-    """Класс для описания запросов о пользователях в базу данных"""
+        if user.feedbacks_date != date:
+            return 0
 
-    # Статический метод для получения объекта пользователя из базы данных по его Телеграм id
-    @staticmethod
-    async def get(tg_id: int) -> User | None:
-        async with session() as sess:
-            user: User | None = await sess.scalar(
-                select(User).where(User.tg_id == tg_id)
+        return user.feedbacks_cnt
+
+    # Метод класса для увеличения количества отправленных отзывов пользователем за текущий день по его местному времени
+    # в базе данных по его Телеграм id, счётчик за прошедший день начинается заново
+    @classmethod
+    async def increase_feedbacks_cnt(cls, sess: AsyncSession, tg_id: int) -> None:
+        user: User = await cls.get(sess, tg_id)
+        date: Date = await Datetime_Handler.get_local_date(user.utc_offset)
+
+        await sess.execute(
+            update(User)
+            .where(User.tg_id == tg_id)
+            .values(
+                feedbacks_cnt=case(
+                    (User.feedbacks_date == date, User.feedbacks_cnt + 1), else_=1
+                ),
+                feedbacks_date=date,
             )
+        )
 
-            return user
+        await sess.commit()
 
-    # Статический метод для получения Телеграм id пользователя по его id в базе данных
-    @staticmethod
-    async def get_tg_id(id: int) -> int:
-        async with session() as sess:
-            user: User | None = await sess.scalar(select(User).where(User.id == id))
+        users_cache.invalidate(tg_id)
 
-            return user.tg_id
+    # Статический метод для включения или выключения сводки уведомлений пользователя в базе данных по его Телеграм id
+    @staticmethod
+    async def set_digest(sess: AsyncSession, tg_id: int, digest: bool) -> None:
+        await sess.execute(
+            update(User).where(User.tg_id == tg_id).values(digest=digest)
+        )
 
-    # Метод класса для получения списка групп, которые создал пользователь по его Телеграм id
-    @classmethod
-    async def get_groups_where_creator(cls, tg_id: int) -> list[str]:
-        async with session() as sess:
-            id: int = (await cls.get(tg_id)).id
-
-            groups: list[str] = [
-                group.name
-                for group in await sess.scalars(
-                    select(Group).where(Group.creator == id)
-                )
-            ]
-            groups.sort()
+        await sess.commit()
 
-            return groups
+        users_cache.invalidate(tg_id)
 
-    # Метод класса для получения списка групп, в которых пользователь назначен получателем отчётов по его Телеграм id
+    # Метод класса для обновления имени пользователя и его полного имени в базе данных по его Телеграм id,
+    # если они изменились или с их последнего обновления прошло больше USER_INFO_TTL секунд
     @classmethod
-    async def get_groups_where_reports_recipient(cls, tg_id: int) -> list[str]:
-        async with session() as sess:
-            id: int = (await cls.get(tg_id)).id
-
-            groups: list[str] = [
-                group.name
-                for group in await sess.scalars(
-                    select(Group).where(Group.reports_recipient == id)
-                )
-            ]
-            groups.sort()
+    async def refresh_info(
+        cls, sess: AsyncSession, tg_id: int, username: str | None, full_name: str
+    ) -> None:
+        user: User | None = await cls.get(sess, tg_id)
 
-            return groups
+        if user is None:
+            return
 
-    # Метод класса для инициализации пользователя в базе данных по его Телеграм id
-    @classmethod
-    async def init(cls, tg_id: int) -> None:
-        async with session() as sess:
-            user: User | None = await cls.get(tg_id)
+        now: datetime = datetime.now(timezone.utc).replace(tzinfo=None)
 
-            if user is None:
-                default_utc_offset = 10800
+        if (
+            user.username == username
+            and user.full_name == full_name
+            and not user.info_updated_at is None
+            and now - user.info_updated_at < timedelta(seconds=USER_INFO_TTL)
+        ):
+            return
 
-                sess.add(
-                    User(tg_id=tg_id, utc_offset=default_utc_offset, feedbacks_cnt=0)
-                )
+        await sess.execute(
+            update(User)
+            .where(User.tg_id == tg_id)
+            .values(username=username, full_name=full_name, info_updated_at=now)
+        )
 
-                await sess.commit()
+        await sess.commit()
 
-    # Статический метод для установки смещения UTC пользователя в базе данных по его Телеграм id
-    @staticmethod
-    async def set_utc_offset(tg_id: int, utc_offset: int) -> None:
-        async with session() as sess:
-            await sess.execute(
-                update(User).where(User.tg_id == tg_id).values(utc_offset=utc_offset)
-            )
+        users_cache.invalidate(tg_id)
 
-            await sess.commit()
 
-    # Статический метод для увеличения количества отправленных отзывов пользователем
-    # в базе данных по его Телеграм id
-    @staticmethod
-    async def increase_feedbacks_cnt(tg_id: int) -> None:
-        async with session() as sess:
-            await sess.execute(
-                update(User)
-                .where(User.tg_id == tg_id)
-                .values(feedbacks_cnt=User.feedbacks_cnt + 1)
-            )
+# Класс для описания запросов о группах в базу данных
+class Group_Requests:
+    """Класс для описания запросов о группах в базу данных"""
 
-            await sess.commit()
+    # Статический метод для удаления из кэша объектов и списков групп, которые могли измениться после изменения группы,
+    # по Телеграм id её создателя и её имени
+    @staticmethod
+    async def invalidate_cache(creator_tg_id: int, name: str) -> None:
+        groups_cache.invalidate_if(lambda key, group: key[2] == name)
+        groups_lists_cache.invalidate_if(
+            lambda key, groups: key == ("creator", creator_tg_id) or name in groups
+        )
 
-    # Статический метод для сброса количества отправленных отзывов пользователями в базе данных
+    # Статический метод для увеличения версии данных группы в базе данных по её id, после которого
+    # закэшированная статистика группы перестаёт использоваться
     @staticmethod
-    async def reset_feedbacks_cnt() -> None:
-        async with session() as sess:
-            await sess.execute(update(User).values(feedbacks_cnt=0))
+    async def increase_data_version(sess: AsyncSession, group: int) -> None:
+        await sess.execute(
+            update(Group)
+            .where(Group.id == group)
+            .values(data_version=Group.data_version + 1)
+        )
 
-            await sess.commit()
+        statistics_cache.invalidate_if(lambda key, statistics: key[0] == group)
+        exports_cache.invalidate_if(lambda key, file_id: key[0] == group)
+        members_pages_cache.invalidate_if(lambda key, members_page: key[0] == group)
 
+    # Статический метод для получения версии данных группы из базы данных без кэша по Телеграм id создателя и её имени
+    @staticmethod
+    async def get_data_version(
+        sess: AsyncSession, creator_tg_id: int, name: str
+    ) -> int:
+        data_version: int = await sess.scalar(
+            select(Group.data_version)
+            .join(User, User.id == Group.creator)
+            .where(User.tg_id == creator_tg_id)
+            .where(Group.name == name)
+        )
 
-# Класс для описания запросов о группах в базу данных
-class Group_Requests:
-    """Класс для описания запросов о группах в базу данных"""
+        return data_version
 
     # Статический метод для получения объекта группы из базы данных по Телеграм id создателя и её имени
     @staticmethod
-    async def get_by_creator(creator_tg_id: int, name: str) -> Group | None:
-        async with session() as sess:
-            creator: int = (await User_Requests.get(creator_tg_id)).id
-            group: Group | None = await sess.scalar(
-                select(Group).where(Group.creator == creator).where(Group.name == name)
+    async def get_by_creator(
+        sess: AsyncSession, creator_tg_id: int, name: str
+    ) -> Group | None:
+        group: Group | None = groups_cache.get(("creator", creator_tg_id, name))
+
+        if group is MISSING:
+            group = await sess.scalar(
+                select(Group)
+                .join(User, User.id == Group.creator)
+                .where(User.tg_id == creator_tg_id)
+                .where(Group.name == name)
             )
 
-            return group
+            groups_cache.set(("creator", creator_tg_id, name), group)
+
+        return group
 
     # Статический метод для получения объекта группы из базы данных по Телеграм id получателя отчётов и её имени
     @staticmethod
     async def get_by_reports_recipient(
-        name: str, reports_recipient_tg_id: int
+        sess: AsyncSession, name: str, reports_recipient_tg_id: int
     ) -> Group | None:
-        async with session() as sess:
-            reports_recipient: int = (
-                await User_Requests.get(reports_recipient_tg_id)
-            ).id
-            group: Group | None = await sess.scalar(
+        group: Group | None = groups_cache.get(
+            ("reports_recipient", reports_recipient_tg_id, name)
+        )
+
+        if group is MISSING:
+            group = await sess.scalar(
                 select(Group)
+                .join(User, User.id == Group.reports_recipient)
+                .where(User.tg_id == reports_recipient_tg_id)
                 .where(Group.name == name)
-                .where(Group.reports_recipient == reports_recipient)
+                .order_by(Group.id)
             )
 
-            return group
+            groups_cache.set(
+                ("reports_recipient", reports_recipient_tg_id, name), group
+            )
 
-    # Статический метод для создания (записи) группы в базе данных по Телеграм id создателя и её имени
+        return group
+
+    # Статический метод для получения Телеграм id получателя отчётов группы по Телеграм id создателя и её имени
     @staticmethod
-    async def create(creator_tg_id: int, name: str) -> None:
-        async with session() as sess:
-            creator: int = (await User_Requests.get(creator_tg_id)).id
+    async def get_reports_recipient_tg_id(
+        sess: AsyncSession, creator_tg_id: int, name: str
+    ) -> int:
+        group_creator = aliased(User)
+        reports_recipient_tg_id: int = await sess.scalar(
+            select(User.tg_id)
+            .join(Group, Group.reports_recipient == User.id)
+            .join(group_creator, group_creator.id == Group.creator)
+            .where(group_creator.tg_id == creator_tg_id)
+            .where(Group.name == name)
+        )
+
+        return reports_recipient_tg_id
 
-            sess.add(
-                Group(creator=creator, name=name, reports_recipient=creator, members="")
+    # Статический метод для получения отсортированного списка имён участников группы по Телеграм id создателя и её имени
+    @staticmethod
+    async def get_members(
+        sess: AsyncSession, creator_tg_id: int, name: str
+    ) -> list[str]:
+        members: list[str] = list(
+            await sess.scalars(
+                select(Member.name)
+                .join(Group, Group.id == Member.group)
+                .join(User, User.id == Group.creator)
+                .where(User.tg_id == creator_tg_id)
+                .where(Group.name == name)
+                .order_by(Member.name)
             )
+        )
 
-            await sess.commit()
+        return members
 
-    # Метод класса для добавления (записи) участника группы в группу в базе данных по Телеграм id создателя группы, её имени и имени участника
+    # Метод класса для получения страницы отсортированного списка имён участников группы по Телеграм id создателя,
+    # её имени, версии данных группы и номеру страницы, возвращает имена участников на странице и общее количество участников,
+    # которое для страницы за концом списка считается отдельным запросом
     @classmethod
-    async def add_member(cls, creator_tg_id: int, name: str, member: str) -> None:
-        async with session() as sess:
-            creator: int = (await User_Requests.get(creator_tg_id)).id
-            members: list[str] = (await cls.get_by_creator(creator_tg_id, name)).members
+    async def get_members_page(
+        cls,
+        sess: AsyncSession,
+        creator_tg_id: int,
+        name: str,
+        data_version: int,
+        page: int,
+    ) -> tuple[list[str], int]:
+        group: int = (await cls.get_by_creator(sess, creator_tg_id, name)).id
+        members_page: tuple[list[str], int] = members_pages_cache.get(
+            (group, data_version, page)
+        )
+
+        if members_page is MISSING:
+            rows = (
+                await sess.execute(
+                    select(Member.name, func.count().over())
+                    .where(Member.group == group)
+                    .order_by(Member.name)
+                    .limit(KEYBOARD_PAGE_SIZE)
+                    .offset(page * KEYBOARD_PAGE_SIZE)
+                )
+            ).all()
 
-            if members == "":
-                members: list[str] = []
+            if rows != []:
+                members_page = ([row[0] for row in rows], rows[0][1])
             else:
-                members: list[str] = members.split(";\n")
+                members_page = (
+                    [],
+                    await sess.scalar(
+                        select(func.count()).where(Member.group == group)
+                    ),
+                )
 
-            members.append(member)
-            members: str = ";\n".join(members)
+            members_pages_cache.set((group, data_version, page), members_page)
 
-            await sess.execute(
-                update(Group)
-                .where(Group.creator == creator)
-                .where(Group.name == name)
-                .values(members=members)
+        return members_page
+
+    # Статический метод для создания (записи) группы в базе данных по Телеграм id создателя и её имени
+    @staticmethod
+    async def create(sess: AsyncSession, creator_tg_id: int, name: str) -> None:
+        await sess.execute(
+            insert(Group).from_select(
+                ["creator", "name", "reports_recipient"],
+                select(User.id, literal(name), User.id).where(
+                    User.tg_id == creator_tg_id
+                ),
             )
+        )
 
-            await sess.commit()
+        await sess.commit()
 
-    # Метод класса для удаления группы из базы данных по Телеграм id создателя и её имени
+        await Group_Requests.invalidate_cache(creator_tg_id, name)
+        groups_lists_cache.invalidate(("reports_recipient", creator_tg_id))
+
+    # Метод класса для добавления (записи) участников группы в группу в базе данных одной транзакцией
+    # по Телеграм id создателя группы, её имени и списку имён участников
     @classmethod
-    async def delete(cls, creator_tg_id: int, name: str) -> None:
-        async with session() as sess:
-            group: Group | None = await cls.get_by_creator(creator_tg_id, name)
+    async def add_members(
+        cls, sess: AsyncSession, creator_tg_id: int, name: str, members: list[str]
+    ) -> None:
+        group: int = (await cls.get_by_creator(sess, creator_tg_id, name)).id
 
-            await sess.delete(group)
+        await sess.execute(
+            insert(Member), [{"group": group, "name": member} for member in members]
+        )
+        await cls.increase_data_version(sess, group)
 
-            await sess.commit()
+        await sess.commit()
 
-    # Метод класса для удаления участника из группы в базе данных по Телеграм id создателя группы, её имени и имени участника
+    # Метод класса для удаления группы из базы данных по Телеграм id создателя и её имени
     @classmethod
-    async def remove_member(cls, creator_tg_id: int, name: str, member: str) -> None:
-        async with session() as sess:
-            group: Group | None = await cls.get_by_creator(creator_tg_id, name)
-            id: int = group.id
-            creator: int = (await User_Requests.get(creator_tg_id)).id
-            members: list[str] = group.members.split(";\n")
-            members.remove(member)
-            members: str = ";\n".join(members)
+    async def delete(cls, sess: AsyncSession, creator_tg_id: int, name: str) -> None:
+        group: int = (await cls.get_by_creator(sess, creator_tg_id, name)).id
+
+        await sess.execute(delete(Absence_Rollup).where(Absence_Rollup.group == group))
+        await sess.execute(delete(Report_Rollup).where(Report_Rollup.group == group))
+        await sess.execute(
+            delete(Absence).where(
+                Absence.report.in_(select(Report.id).where(Report.group == group))
+            )
+        )
+        await sess.execute(delete(Report).where(Report.group == group))
+        await sess.execute(delete(Member).where(Member.group == group))
+        await sess.execute(delete(Group).where(Group.id == group))
 
+        await sess.commit()
+
+        prefix_indexes.invalidate(group)
+        members_pages_cache.invalidate_if(lambda key, members_page: key[0] == group)
+
+        await Group_Requests.invalidate_cache(creator_tg_id, name)
+
+    # Статический метод для удаления участника из группы в базе данных по Телеграм id создателя группы, её имени и имени участника,
+    # количество запросов не зависит от количества отчётов группы, возвращает False, если участника нет в группе
+    @staticmethod
+    async def remove_member(
+        sess: AsyncSession, creator_tg_id: int, name: str, member: str
+    ) -> bool:
+        row = (
             await sess.execute(
-                update(Group)
-                .where(Group.creator == creator)
+                select(Member.group, Member.id)
+                .join(Group, Group.id == Member.group)
+                .join(User, User.id == Group.creator)
+                .where(User.tg_id == creator_tg_id)
                 .where(Group.name == name)
-                .values(members=members)
+                .where(Member.name == member)
             )
+        ).one_or_none()
 
-            reports: list[Report] = await sess.scalars(
-                select(Report)
-                .where(Report.group == id)
-                .where(Report.members.like(f"%{member}%"))
-            )
-            for report in reports:
-                report_members: list[str] = report.members.split(";\n")
-                report_members.remove(member)
-                report_members: str = ";\n".join(report_members)
+        if row is None:
+            return False
 
-                await sess.execute(
-                    update(Report)
-                    .where(Report.id == report.id)
-                    .values(members=report_members)
-                )
+        group, member_id = row
 
-            await sess.commit()
+        await sess.execute(delete(Absence).where(Absence.member == member_id))
+        await sess.execute(
+            delete(Absence_Rollup).where(Absence_Rollup.member == member_id)
+        )
+        await sess.execute(delete(Member).where(Member.id == member_id))
+        await Group_Requests.increase_data_version(sess, group)
+
+        await sess.commit()
+
+        prefix_indexes.remove_member(group, member_id)
+
+        return True
 
     # Статический метод для назначения получателя отчётов группы в базе данных по Телеграм id создателя, её имени и id получателя
     @staticmethod
     async def assign_reports_recipient(
-        creator_tg_id: int, name: str, reports_recipient_tg_id: int
+        sess: AsyncSession, creator_tg_id: int, name: str, reports_recipient_tg_id: int
     ) -> None:
-        async with session() as sess:
-            creator: int = (await User_Requests.get(creator_tg_id)).id
-            reports_recipient: int = (
-                await User_Requests.get(reports_recipient_tg_id)
-            ).id
-
-            await sess.execute(
-                update(Group)
-                .where(Group.creator == creator)
-                .where(Group.name == name)
-                .values(reports_recipient=reports_recipient)
+        reports_recipient: int = (
+            await User_Requests.get(sess, reports_recipient_tg_id)
+        ).id
+
+        await sess.execute(
+            update(Group)
+            .where(
+                Group.creator
+                == select(User.id).where(User.tg_id == creator_tg_id).scalar_subquery()
             )
+            .where(Group.name == name)
+            .values(reports_recipient=reports_recipient)
+        )
 
-            await sess.commit()
+        await sess.commit()
+
+        await Group_Requests.invalidate_cache(creator_tg_id, name)
+        groups_lists_cache.invalidate(("reports_recipient", reports_recipient_tg_id))
 
 
 # Класс для описания запросов об отчётах группы в базу данных
 class Report_Requests:
     """Класс для описания запросов об отчётах группы в базу данных"""
 
-    # Статический метод для получения объекта сегодняшнего отчёта из базы данных по Телеграм id создателя группы и её имени
+    # Статический метод для получения id группы и смещения UTC её создателя по Телеграм id создателя группы и её имени
     @staticmethod
-    async def get(group_creator_tg_id: int, group_name: str) -> Report:
-        async with session() as sess:
-            user: User | None = await User_Requests.get(group_creator_tg_id)
-            group: int = (
-                await Group_Requests.get_by_creator(group_creator_tg_id, group_name)
-            ).id
-            date: Date = await Datetime_Handler.get_local_date(user.utc_offset)
-            report: Report | None = await sess.scalar(
-                select(Report).where(Report.group == group).where(Report.date == date)
+    async def get_group_and_utc_offset(
+        sess: AsyncSession, group_creator_tg_id: int, group_name: str
+    ) -> tuple[int, int]:
+        group, utc_offset = (
+            await sess.execute(
+                select(Group.id, User.utc_offset)
+                .join(User, User.id == Group.creator)
+                .where(User.tg_id == group_creator_tg_id)
+                .where(Group.name == group_name)
             )
+        ).one()
 
-            return report
+        return group, utc_offset
+
+    # Метод класса для получения отсортированного списка Телеграм id создателей групп с их участниками и названий групп,
+    # для которых не создан сегодняшний отчёт, по смещению UTC создателей групп
+    @classmethod
+    async def get_groups_without_report(
+        cls, sess: AsyncSession, utc_offset: int
+    ) -> list[tuple[int, str]]:
+        date: Date = await Datetime_Handler.get_local_date(utc_offset)
+        groups: list[tuple[int, str]] = list(
+            (
+                await sess.execute(
+                    select(User.tg_id, Group.name)
+                    .join(Group, Group.creator == User.id)
+                    .where(User.utc_offset == utc_offset)
+                    .where(select(Member.id).where(Member.group == Group.id).exists())
+                    .where(
+                        ~select(Report.id)
+                        .where(Report.group == Group.id)
+                        .where(Report.date == date)
+                        .exists()
+                    )
+                    .order_by(User.tg_id, Group.name)
+                )
+            ).tuples()
+        )
+
+        return groups
+
+    # Статический метод для получения количества отчётов и отсортированного списка имён участников с количеством их отсутствий
+    # из таблиц "report_rollups" и "absence_rollups" по id группы и датам начала и конца периода времени
+    @staticmethod
+    async def get_statistics_from_rollups(
+        sess: AsyncSession, group_id: int, date_from: Date, date_to: Date
+    ) -> tuple[int, list[tuple[str, int]]]:
+        parts: list[tuple[str, Date, Date]] = await Datetime_Handler.split_period(
+            date_from, date_to
+        )
+        reports_cnt: int = await sess.scalar(
+            select(func.coalesce(func.sum(Report_Rollup.reports), 0))
+            .where(Report_Rollup.group == group_id)
+            .where(
+                or_(
+                    *[
+                        and_(
+                            Report_Rollup.period == period,
+                            Report_Rollup.date >= part_from,
+                            Report_Rollup.date <= part_to,
+                        )
+                        for period, part_from, part_to in parts
+                    ]
+                )
+            )
+        )
+        absences_cnt = func.sum(Absence_Rollup.absences)
+        reports_with_member_sorted: list = list(
+            await sess.execute(
+                select(Member.name, absences_cnt)
+                .join(Absence_Rollup, Absence_Rollup.member == Member.id)
+                .where(Absence_Rollup.group == group_id)
+                .where(
+                    or_(
+                        *[
+                            and_(
+                                Absence_Rollup.period == period,
+                                Absence_Rollup.date >= part_from,
+                                Absence_Rollup.date <= part_to,
+                            )
+                            for period, part_from, part_to in parts
+                        ]
+                    )
+                )
+                .group_by(Member.id, Member.name)
+                .having(absences_cnt > 0)
+                .order_by(absences_cnt.desc(), Member.name)
+            )
+        )
+
+        return reports_cnt, reports_with_member_sorted
+
+    # Статический метод для получения количества отчётов и отсортированного списка имён участников с количеством их отсутствий
+    # из индекса накопленных количеств по id группы и датам начала и конца периода времени
+    @staticmethod
+    async def get_statistics_from_prefix_index(
+        sess: AsyncSession, group_id: int, date_from: Date, date_to: Date
+    ) -> tuple[int, list[tuple[str, int]]]:
+        index: Group_Prefix_Index = await prefix_indexes.get(sess, group_id)
+        reports_cnt, absences_cnts = index.count(date_from, date_to)
+
+        if absences_cnts == {}:
+            return reports_cnt, []
+
+        members_names: dict[int, str] = dict(
+            (
+                await sess.execute(
+                    select(Member.id, Member.name).where(
+                        Member.id.in_(absences_cnts.keys())
+                    )
+                )
+            ).all()
+        )
+        reports_with_member_sorted: list[tuple[str, int]] = sorted(
+            (
+                (members_names[member], absences_cnt)
+                for member, absences_cnt in absences_cnts.items()
+                if member in members_names
+            ),
+            key=lambda member: (-member[1], member[0]),
+        )
+
+        return reports_cnt, reports_with_member_sorted
 
     # Статический метод для получения статистики об отсутствии участников группы по её имени, Телеграм id получателя отчётов и
     # датам начала и конца периода времени, для которого она получается
     @staticmethod
     async def get_statistics(
+        sess: AsyncSession,
         group_name: str,
         reports_recipient_tg_id: int,
         date_from: str,
         date_to: str = None,
     ) -> str:
-        async with session() as sess:
-            group: Group = await Group_Requests.get_by_reports_recipient(
-                group_name, reports_recipient_tg_id
+        group_id, data_version, reports_recipient_utc_offset = (
+            await sess.execute(
+                select(Group.id, Group.data_version, User.utc_offset)
+                .join(User, User.id == Group.reports_recipient)
+                .where(User.tg_id == reports_recipient_tg_id)
+                .where(Group.name == group_name)
+                .order_by(Group.id)
             )
-            group_id: int = group.id
-            reports_recipient_utc_offset: int = (
-                await User_Requests.get(reports_recipient_tg_id)
-            ).utc_offset
-
-            if date_from == "Неделя":
-                date_from: Date = await Datetime_Handler.get_start_of_week(
-                    reports_recipient_utc_offset
-                )
-                date_to: Date = await Datetime_Handler.get_local_date(
-                    reports_recipient_utc_offset
-                )
-            elif date_from == "Месяц":
-                date_from: Date = await Datetime_Handler.get_start_of_month(
-                    reports_recipient_utc_offset
-                )
-                date_to: Date = await Datetime_Handler.get_local_date(
-                    reports_recipient_utc_offset
-                )
-            elif date_from == "Год":
-                date_from: Date = await Datetime_Handler.get_start_of_year(
-                    reports_recipient_utc_offset
-                )
-                date_to: Date = await Datetime_Handler.get_local_date(
-                    reports_recipient_utc_offset
+        ).first()
+        is_preset: bool = date_from in ["Неделя", "Месяц", "Год"]
+        date_from, date_to = await Datetime_Handler.get_period(
+            reports_recipient_utc_offset, date_from, date_to
+        )
+
+        statistics: str = statistics_cache.get(
+            (group_id, date_from, date_to, data_version)
+        )
+
+        if statistics is MISSING:
+            if is_preset:
+                (
+                    reports_cnt,
+                    reports_with_member_sorted,
+                ) = await Report_Requests.get_statistics_from_rollups(
+                    sess, group_id, date_from, date_to
                 )
             else:
-                date_from: Date = datetime.strptime(date_from, "%d.%m.%Y").date()
-                date_to: Date = datetime.strptime(date_to, "%d.%m.%Y").date()
-
-            reports = await sess.scalars(
-                select(Report)
-                .where(Report.group == group_id)
-                .where(Report.date >= date_from)
-                .where(Report.date <= date_to)
-            )
-            reports_cnt: int = 0
-            reports_with_member: dict[str, int] = {}
-
-            for report in reports:
-                reports_cnt += 1
-                report_members: list[str] = report.members.split(";\n")
+                (
+                    reports_cnt,
+                    reports_with_member_sorted,
+                ) = await Report_Requests.get_statistics_from_prefix_index(
+                    sess, group_id, date_from, date_to
+                )
 
-                if report_members == [""]:
-                    continue
+            statistics = await Report_Requests.render_statistics(
+                group_name, date_from, date_to, reports_cnt, reports_with_member_sorted
+            )
 
-                for report_member in report_members:
-                    if not report_member in reports_with_member:
-                        reports_with_member[report_member] = 0
+            statistics_cache.set(
+                (group_id, date_from, date_to, data_version), statistics
+            )
 
-                    reports_with_member[report_member] += 1
+        return statistics
 
-            if reports_cnt == 0:
-                statistics = f'С {date_from.strftime("%d.%m.%Y")} по {date_to.strftime("%d.%m.%Y")} в группе "{group_name}" не создавалось отчётов об отсутствии.'
+    # Статический метод для составления текста статистики об отсутствии участников группы по её имени, датам начала и конца
+    # периода времени, количеству отчётов и отсортированному списку имён участников с количеством их отсутствий
+    @staticmethod
+    async def render_statistics(
+        group_name: str,
+        date_from: Date,
+        date_to: Date,
+        reports_cnt: int,
+        reports_with_member_sorted: list[tuple[str, int]],
+    ) -> str:
+        if reports_cnt == 0:
+            statistics = f'С {date_from.strftime("%d.%m.%Y")} по {date_to.strftime("%d.%m.%Y")} в группе "{group_name}" не создавалось отчётов об отсутствии.'
 
-                return statistics
+            return statistics
 
-            reports_with_member_sorted: list = sorted(
-                reports_with_member.items(),
-                key=lambda item: item[1],
-                reverse=True,
-            )
-            reports_members_cnt: int = len(reports_with_member_sorted)
+        reports_members_cnt: int = len(reports_with_member_sorted)
 
-            if reports_members_cnt == 0:
-                statistics = f'С {date_from.strftime("%d.%m.%Y")} по {date_to.strftime("%d.%m.%Y")} в группе "{group_name}" отсутствующих не было.'
+        if reports_members_cnt == 0:
+            statistics = f'С {date_from.strftime("%d.%m.%Y")} по {date_to.strftime("%d.%m.%Y")} в группе "{group_name}" отсутствующих не было.'
 
-                return statistics
-            else:
-                statistics = f'Статистика отсутствия участников группы "{group_name}" с {date_from.strftime("%d.%m.%Y")} по {date_to.strftime("%d.%m.%Y")}:\n'
+            return statistics
+        else:
+            statistics = f'Статистика отсутствия участников группы "{group_name}" с {date_from.strftime("%d.%m.%Y")} по {date_to.strftime("%d.%m.%Y")}:\n'
 
-                for i in range(reports_members_cnt):
-                    member: str = reports_with_member_sorted[i][0]
-                    reports_with_this_member: int = reports_with_member_sorted[i][1]
-                    reports_with_this_member_percentages = int(
-                        reports_with_this_member / reports_cnt * 100
-                    )
+            for i in range(reports_members_cnt):
+                member: str = reports_with_member_sorted[i][0]
+                reports_with_this_member: int = reports_with_member_sorted[i][1]
+                reports_with_this_member_percentages = int(
+                    reports_with_this_member / reports_cnt * 100
+                )
 
-                    statistics += f"{i + 1}. {member} - Присутствовал в {reports_with_this_member} отчётах из {reports_cnt} "
-                    statistics += f"({reports_with_this_member_percentages}%)"
+                statistics += f"{i + 1}. {member} - Присутствовал в {reports_with_this_member} отчётах из {reports_cnt} "
+                statistics += f"({reports_with_this_member_percentages}%)"
 
-                    if i < reports_members_cnt - 1:
-                        statistics += ";\n"
-                    else:
-                        statistics += "."
+                if i < reports_members_cnt - 1:
+                    statistics += ";\n"
+                else:
+                    statistics += "."
 
-                return statistics
+            return statistics
 
     # Статический метод для получения файла отчётов из базы данных по Telegram id создателя группы, её имени и датам начала и конца промежутка времени,
-    # для которого получается файл
+    # для которого получается файл, возвращает новый файл или Телеграм id уже отправленного, текст сообщения и ключ для сохранения Телеграм id
+    # нового файла
     @staticmethod
     async def get_file(
+        sess: AsyncSession,
         group_name: str,
         group_reports_recipient_tg_id: int,
         date_from: str,
         date_to: str,
         file_format: str,
-    ) -> tuple[FSInputFile | str, str]:
-        async with session() as sess:
-            group: Group = await Group_Requests.get_by_reports_recipient(
-                group_name, group_reports_recipient_tg_id
-            )
-            group_id: int = group.id
-            group_creator_name: str = (
-                await bot.get_chat(await User_Requests.get_tg_id(group.creator))
-            ).username
-            group_reports_recipient_utc_offset: int = (
-                await User_Requests.get(group_reports_recipient_tg_id)
-            ).utc_offset
-
-            if date_from == "Неделя":
-                date_from: Date = await Datetime_Handler.get_start_of_week(
-                    group_reports_recipient_utc_offset
-                )
-                date_to: Date = await Datetime_Handler.get_local_date(
-                    group_reports_recipient_utc_offset
-                )
-            elif date_from == "Месяц":
-                date_from: Date = await Datetime_Handler.get_start_of_month(
-                    group_reports_recipient_utc_offset
-                )
-                date_to: Date = await Datetime_Handler.get_local_date(
-                    group_reports_recipient_utc_offset
-                )
-            elif date_from == "Год":
-                date_from: Date = await Datetime_Handler.get_start_of_year(
-                    group_reports_recipient_utc_offset
-                )
-                date_to: Date = await Datetime_Handler.get_local_date(
-                    group_reports_recipient_utc_offset
+    ) -> tuple[BufferedInputFile | str | None, str, tuple | None]:
+        group_creator = aliased(User)
+        (
+            group_id,
+            data_version,
+            group_creator_username,
+            group_creator_full_name,
+            group_reports_recipient_utc_offset,
+        ) = (
+            await sess.execute(
+                select(
+                    Group.id,
+                    Group.data_version,
+                    group_creator.username,
+                    group_creator.full_name,
+                    User.utc_offset,
                 )
-            else:
-                date_from: Date = datetime.strptime(date_from, "%d.%m.%Y").date()
-                date_to: Date = datetime.strptime(date_to, "%d.%m.%Y").date()
-
-            rows_data: list[list[str]] = [
-                [
-                    "Имя создателя группы",
-                    "Название группы",
-                ],
-                [
-                    group_creator_name,
-                    group_name,
-                ],
-                [
-                    "Дата создания отчёта",
-                    "Участники отчёта",
-                ],
-            ]
-            rows_heights: list[int] = [25, 25, 25]
-
-            reports = await sess.scalars(
-                select(Report)
-                .where(Report.group == group_id)
-                .where(Report.date >= date_from)
-                .where(Report.date <= date_to)
-                .order_by(Report.date)
+                .join(User, User.id == Group.reports_recipient)
+                .join(group_creator, group_creator.id == Group.creator)
+                .where(User.tg_id == group_reports_recipient_tg_id)
+                .where(Group.name == group_name)
+                .order_by(Group.id)
             )
+        ).first()
+        date_from, date_to = await Datetime_Handler.get_period(
+            group_reports_recipient_utc_offset, date_from, date_to
+        )
+        mssg_txt = f'Файл отчётов об отсутствии участников группы "{group_name}" с {date_from.strftime("%d.%m.%Y")} по {date_to.strftime("%d.%m.%Y")}.'
+        file_key: tuple = (group_id, date_from, date_to, file_format, data_version)
+        file_id: str = exports_cache.get(file_key)
 
-            reports_cnt = 0
+        if not file_id is MISSING:
+            return file_id, mssg_txt, None
 
-            i = 4
+        group_creator_name: str = (
+            group_creator_username or group_creator_full_name or ""
+        )
 
-            for report in reports:
-                reports_cnt += 1
-                report_date: Date = report.date.strftime("%d.%m.%Y")
-                report_members: str = report.members.replace(";\n", "\n")
-                lines_cnt = report_members.count("\n") + 1
+        rows_data: list[list[str]] = [
+            [
+                "Имя создателя группы",
+                "Название группы",
+            ],
+            [
+                group_creator_name,
+                group_name,
+            ],
+            [
+                "Дата создания отчёта",
+                "Участники отчёта",
+            ],
+        ]
+        rows_heights: list[int] = [25, 25, 25]
+
+        reports = await sess.execute(
+            select(Report.date, Member.name)
+            .outerjoin(Absence, Absence.report == Report.id)
+            .outerjoin(Member, Member.id == Absence.member)
+            .where(Report.group == group_id)
+            .where(Report.date >= date_from)
+            .where(Report.date <= date_to)
+            .order_by(Report.date, Member.name)
+        )
 
-                rows_data.append([report_date, report_members])
-                rows_heights.append(lines_cnt * 25)
+        reports_cnt = 0
 
-                i += 1
+        for date, rows in groupby(reports, key=lambda row: row.date):
+            reports_cnt += 1
+            report_date: str = date.strftime("%d.%m.%Y")
+            report_members: list[str] = [
+                row.name for row in rows if not row.name is None
+            ]
+            lines_cnt: int = max(len(report_members), 1)
+
+            rows_data.append([report_date, "\n".join(report_members)])
+            rows_heights.append(lines_cnt * 25)
 
-            if reports_cnt == 0:
-                mssg_txt = f'С {date_from.strftime("%d.%m.%Y")} по {date_to.strftime("%d.%m.%Y")} в группе "{group_name}" не создавалось отчётов об отсутствии.'
+        if reports_cnt == 0:
+            mssg_txt = f'С {date_from.strftime("%d.%m.%Y")} по {date_to.strftime("%d.%m.%Y")} в группе "{group_name}" не создавалось отчётов об отсутствии.'
 
-                return mssg_txt, ""
+            return None, mssg_txt, None
 
+        try:
             if file_format == "Xlsx":
-                await Xlsx_Writer.create_reports_file(
-                    reports_cnt + 3, rows_data, rows_heights
+                reports_file: bytes = await export_pool.run(
+                    Xlsx_Writer.create_reports_file,
+                    reports_cnt + 3,
+                    rows_data,
+                    rows_heights,
                 )
             else:
-                await Pdf_Writer.create_reports_file(
-                    reports_cnt + 3, rows_data, rows_heights
+                reports_file: bytes = await export_pool.run(
+                    Pdf_Writer.create_reports_file,
+                    reports_cnt + 3,
+                    rows_data,
+                    rows_heights,
                 )
+        except TimeoutError:
+            mssg_txt = "Создание файла отчётов заняло слишком много времени, выберите более короткий период времени."
+
+            return None, mssg_txt, None
+        except LayoutError:
+            mssg_txt = (
+                "Не удалось разместить отчёты в файле *.pdf, выберите формат *.xlsx."
+            )
+
+            return None, mssg_txt, None
+        except BrokenProcessPool:
+            mssg_txt = "Не удалось создать файл отчётов, попробуйте ещё раз позже."
 
-            file = FSInputFile(f"./database/Отчёты.{file_format.lower()}")
-            mssg_txt = f'Файл отчётов об отсутствии участников группы "{group_name}" с {date_from.strftime("%d.%m.%Y")} по {date_to.strftime("%d.%m.%Y")}.'
+            return None, mssg_txt, None
 
-            return file, mssg_txt
+        file = BufferedInputFile(reports_file, f"Отчёты.{file_format.lower()}")
 
-    # Статический метод для создания сегодняшнего отчёта в базе данных по Телеграм id создателя группы, её имени и списку участников отчёта
-    async def create(
-        group_creator_tg_id: int, group_name: str, members: list[str]
+        return file, mssg_txt, file_key
+
+    # Статический метод для сохранения Телеграм id отправленного файла отчётов по ключу, полученному при его создании,
+    # для повторной отправки без создания и загрузки файла
+    @staticmethod
+    async def set_file_id(file_key: tuple, file_id: str) -> None:
+        exports_cache.set(file_key, file_id)
+
+    # Статический метод для сохранения Телеграм id чата и id сообщения с уведомлением об отчёте по id отчёта,
+    # чтобы при повторной отправке отчёта изменить это сообщение вместо отправки нового
+    @staticmethod
+    async def set_message(
+        sess: AsyncSession, report: int, message_chat: int, message_id: int
     ) -> None:
-        async with session() as sess:
-            user: User | None = await User_Requests.get(group_creator_tg_id)
-            group: int = (
-                await Group_Requests.get_by_creator(group_creator_tg_id, group_name)
-            ).id
-            date: Date = await Datetime_Handler.get_local_date(user.utc_offset)
-            members: str = ";\n".join(members)
-
-            sess.add(
-                Report(
-                    group=group,
-                    date=date,
-                    members=members,
+        await sess.execute(
+            update(Report)
+            .where(Report.id == report)
+            .values(message_chat=message_chat, message_id=message_id)
+        )
+
+        await sess.commit()
+
+    # Статический метод для записи участников отчёта в базе данных по его id, id группы и списку имён участников,
+    # возвращает изменения количества отсутствий участников по их id
+    @staticmethod
+    async def set_absences(
+        sess: AsyncSession, report: int, group: int, members: list[str]
+    ) -> dict[int, int]:
+        old_members: set[int] = set(
+            await sess.scalars(select(Absence.member).where(Absence.report == report))
+        )
+        new_members: set[int] = set()
+
+        if members != []:
+            new_members = set(
+                await sess.scalars(
+                    select(Member.id)
+                    .where(Member.group == group)
+                    .where(Member.name.in_(members))
                 )
             )
 
-            await sess.commit()
+        if old_members - new_members != set():
+            await sess.execute(
+                delete(Absence)
+                .where(Absence.report == report)
+                .where(Absence.member.in_(old_members - new_members))
+            )
+
+        if new_members - old_members != set():
+            await sess.execute(
+                insert(Absence),
+                [
+                    {"report": report, "member": member}
+                    for member in new_members - old_members
+                ],
+            )
+
+        absences_deltas: dict[int, int] = {
+            member: -1 for member in old_members - new_members
+        }
+        absences_deltas.update({member: 1 for member in new_members - old_members})
 
-    # Статический метод для редактирования отчёта в базе данных по Телеграм id создателя группы, её имени, дате создания отчёта и списку участников отчёта
-    async def edit(
-        group_creator_tg_id: int, group_name: str, members: list[str]
+        return absences_deltas
+
+    # Статический метод для получения функции создания запроса INSERT с поддержкой ON CONFLICT для диалекта базы данных сессии
+    @staticmethod
+    def get_dialect_insert(sess: AsyncSession) -> Callable:
+        if sess.bind.dialect.name == "postgresql":
+            return postgresql.insert
+
+        return sqlite.insert
+
+    # Метод класса для изменения количества отчётов и отсутствий участников за день, месяц и год создания отчёта
+    # в базе данных по id группы, дате создания отчёта, изменению количества отчётов и изменениям количества отсутствий участников
+    @classmethod
+    async def update_rollups(
+        cls,
+        sess: AsyncSession,
+        group: int,
+        date: Date,
+        reports_delta: int,
+        absences_deltas: dict[int, int],
     ) -> None:
-        async with session() as sess:
-            user: User | None = await User_Requests.get(group_creator_tg_id)
-            group: int = (
-                await Group_Requests.get_by_creator(group_creator_tg_id, group_name)
-            ).id
-            date: Date = await Datetime_Handler.get_local_date(user.utc_offset)
-            members: str = ";\n".join(members)
+        dialect_insert = cls.get_dialect_insert(sess)
+        periods_starts: dict[str, Date] = get_periods_starts(date)
+
+        if reports_delta != 0:
+            stmt = dialect_insert(Report_Rollup).values(
+                [
+                    {
+                        "group": group,
+                        "period": period,
+                        "date": period_start,
+                        "reports": reports_delta,
+                    }
+                    for period, period_start in periods_starts.items()
+                ]
+            )
 
             await sess.execute(
-                update(Report)
-                .where(Report.group == group)
-                .where(Report.date == date)
-                .values(members=members)
+                stmt.on_conflict_do_update(
+                    index_elements=["group", "period", "date"],
+                    set_={"reports": Report_Rollup.reports + stmt.excluded.reports},
+                )
             )
 
-            await sess.commit()
+        if absences_deltas != {}:
+            stmt = dialect_insert(Absence_Rollup).values(
+                [
+                    {
+                        "group": group,
+                        "member": member,
+                        "period": period,
+                        "date": period_start,
+                        "absences": delta,
+                    }
+                    for member, delta in absences_deltas.items()
+                    for period, period_start in periods_starts.items()
+                ]
+            )
+
+            await sess.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["group", "period", "date", "member"],
+                    set_={"absences": Absence_Rollup.absences + stmt.excluded.absences},
+                )
+            )
+
+    # Метод класса для создания или изменения сегодняшнего отчёта в базе данных одним запросом по Телеграм id создателя группы,
+    # её имени и списку участников отчёта, возвращает объект отчёта, количество изменений которого равно нулю, если отчёт создан,
+    # и отсортированные списки имён добавленных и убранных участников
+    @classmethod
+    async def save(
+        cls,
+        sess: AsyncSession,
+        group_creator_tg_id: int,
+        group_name: str,
+        members: list[str],
+    ) -> tuple[Report, list[str], list[str]]:
+        group, utc_offset = await cls.get_group_and_utc_offset(
+            sess, group_creator_tg_id, group_name
+        )
+        date: Date = await Datetime_Handler.get_local_date(utc_offset)
+        stmt = cls.get_dialect_insert(sess)(Report).values(group=group, date=date)
+        report: Report = await sess.scalar(
+            stmt.on_conflict_do_update(
+                index_elements=["group", "date"], set_={"edits": Report.edits + 1}
+            ).returning(Report),
+            execution_options={"populate_existing": True},
+        )
+        reports_delta: int = 1 if report.edits == 0 else 0
+
+        absences_deltas: dict[int, int] = await cls.set_absences(
+            sess, report.id, group, members
+        )
+        members_names: dict[int, str] = {}
+
+        if absences_deltas != {}:
+            members_names = {
+                member: name
+                for member, name in await sess.execute(
+                    select(Member.id, Member.name).where(Member.id.in_(absences_deltas))
+                )
+            }
+
+        if reports_delta != 0 or absences_deltas != {}:
+            await cls.update_rollups(sess, group, date, reports_delta, absences_deltas)
+            await Group_Requests.increase_data_version(sess, group)
+
+        await sess.commit()
+
+        prefix_indexes.update(group, date, reports_delta, absences_deltas)
+
+        added_members: list[str] = sorted(
+            members_names[member]
+            for member, delta in absences_deltas.items()
+            if delta > 0
+        )
+        removed_members: list[str] = sorted(
+            members_names[member]
+            for member, delta in absences_deltas.items()
+            if delta < 0
+        )
+
+        return report, added_members, removed_members
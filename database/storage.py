@@ -0,0 +1,286 @@
+# Файл, содержащий хранилище состояний пользователей в файле базы данных SQLite
+
+
+# Подключение модулей Python
+from asyncio import Task, create_task, sleep
+from collections import OrderedDict
+from json import dumps, loads
+from time import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+import aiosqlite
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import (
+    BaseStorage,
+    DefaultKeyBuilder,
+    StateType,
+    StorageKey,
+)
+
+
+# Подключение пользовательских модулей
+from config import (
+    FSM_DB_PATH,
+    FSM_FLUSH_INTERVAL,
+    FSM_FLUSH_BATCH,
+    FSM_TTL,
+    FSM_SWEEP_INTERVAL,
+    FSM_MAX_BYTES,
+)
+
+
+# Класс для описания хранилища состояний пользователей в файле базы данных SQLite с отложенной пакетной записью
+class Sqlite_Storage(BaseStorage):
+    """Класс для описания хранилища состояний пользователей в файле базы данных SQLite с отложенной пакетной записью.
+    Все записи хранятся в памяти, а изменённые записываются в файл пакетами раз в FSM_FLUSH_INTERVAL секунд
+    или при накоплении FSM_FLUSH_BATCH изменений. Записи, не использовавшиеся FSM_TTL секунд, удаляются,
+    а при превышении FSM_MAX_BYTES байт удаляются давно использованные записи"""
+
+    # Магический метод __init__, срабатывающий при создании объекта класса
+    def __init__(
+        self,
+        path: str = FSM_DB_PATH,
+        flush_interval: float = FSM_FLUSH_INTERVAL,
+        flush_batch: int = FSM_FLUSH_BATCH,
+        ttl: float = FSM_TTL,
+        sweep_interval: float = FSM_SWEEP_INTERVAL,
+        max_bytes: int = FSM_MAX_BYTES,
+    ) -> None:
+        self.path: str = path
+        self.flush_interval: float = flush_interval
+        self.flush_batch: int = flush_batch
+        self.ttl: float = ttl
+        self.sweep_interval: float = sweep_interval
+        self.max_bytes: int = max_bytes
+        self.key_builder = DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+        self.expired: int = 0
+        self.evicted: int = 0
+        self._states: dict[str, str] = {}
+        self._data: dict[str, dict[str, Any]] = {}
+        self._sizes: dict[str, int] = {}
+        self._bytes: int = 0
+        self._used_at: OrderedDict[str, float] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._conn: aiosqlite.Connection | None = None
+        self._tasks: list[Task] = []
+
+    # Метод для открытия файла базы данных и загрузки из него сохранённых записей
+    async def open(self) -> None:
+        self._conn = await aiosqlite.connect(self.path)
+
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fsm (key TEXT PRIMARY KEY, state TEXT, data TEXT NOT NULL, used_at REAL NOT NULL DEFAULT 0)"
+        )
+
+        async with self._conn.execute("PRAGMA table_info(fsm)") as cursor:
+            columns: list[str] = [row[1] async for row in cursor]
+
+        if not "used_at" in columns:
+            await self._conn.execute(
+                "ALTER TABLE fsm ADD COLUMN used_at REAL NOT NULL DEFAULT 0"
+            )
+
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_fsm_used_at ON fsm (used_at)"
+        )
+        await self._conn.commit()
+
+        async with self._conn.execute(
+            "SELECT key, state, data, used_at FROM fsm ORDER BY used_at"
+        ) as cursor:
+            async for key, state, data, used_at in cursor:
+                if not state is None:
+                    self._states[key] = state
+
+                if data != "{}":
+                    self._data[key] = loads(data)
+
+                self._used_at[key] = used_at
+                self._resize(key, len((state or "").encode()) + len(data.encode()))
+
+        await self.sweep()
+        await self._evict()
+
+        self._tasks = [
+            create_task(self._run_periodically(self.flush, self.flush_interval)),
+            create_task(self._run_periodically(self.sweep, self.sweep_interval)),
+        ]
+
+    # Метод для записи изменённых записей в файл базы данных одним пакетом
+    async def flush(self) -> None:
+        if self._dirty == set() or self._conn is None:
+            return
+
+        keys: set[str] = self._dirty
+        self._dirty = set()
+        changed: list[tuple[str, str | None, str, float]] = []
+        removed: list[tuple[str]] = []
+
+        for key in keys:
+            if key in self._used_at:
+                changed.append(
+                    (
+                        key,
+                        self._states.get(key),
+                        dumps(self._data.get(key, {}), ensure_ascii=False),
+                        self._used_at[key],
+                    )
+                )
+            else:
+                removed.append((key,))
+
+        await self._conn.executemany(
+            "INSERT OR REPLACE INTO fsm (key, state, data, used_at) VALUES (?, ?, ?, ?)",
+            changed,
+        )
+        await self._conn.executemany("DELETE FROM fsm WHERE key = ?", removed)
+        await self._conn.commit()
+
+    # Метод для удаления всех записей, не использовавшихся дольше времени жизни
+    async def sweep(self) -> None:
+        expiration_time: float = time() - self.ttl
+
+        while (
+            self._used_at != {} and next(iter(self._used_at.values())) < expiration_time
+        ):
+            self._remove(next(iter(self._used_at)))
+
+            self.expired += 1
+
+    # Метод для удаления давно использованных записей при превышении ограничения по размеру
+    async def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._used_at != {}:
+            self._remove(next(iter(self._used_at)))
+
+            self.evicted += 1
+
+    # Метод для периодического вызова метода хранилища по самому методу и интервалу в секундах
+    async def _run_periodically(
+        self, method: Callable[[], Awaitable[None]], interval: float
+    ) -> None:
+        while True:
+            await sleep(interval)
+            await method()
+
+    # Метод для изменения размера записи по ключу и новому размеру в байтах
+    def _resize(self, key: str, size: int) -> None:
+        self._bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+
+    # Метод для удаления записи из памяти по ключу с удалением её из файла при следующей записи
+    def _remove(self, key: str) -> None:
+        self._states.pop(key, None)
+        self._data.pop(key, None)
+        self._used_at.pop(key, None)
+        self._bytes -= self._sizes.pop(key, 0)
+        self._dirty.add(key)
+
+    # Метод для проверки того, что запись по ключу существует и не истекла, с отметкой о её использовании,
+    # которая записывается в файл при следующей записи, чтобы после перезапуска время использования не откатывалось
+    def _use(self, key: str) -> bool:
+        used_at: float | None = self._used_at.get(key)
+
+        if used_at is None:
+            return False
+
+        now: float = time()
+
+        if used_at < now - self.ttl:
+            self._remove(key)
+
+            self.expired += 1
+
+            return False
+
+        self._used_at[key] = now
+        self._used_at.move_to_end(key)
+        self._dirty.add(key)
+
+        return True
+
+    # Метод для сохранения изменённой записи по ключу с записью пакета при накоплении достаточного количества изменений
+    async def _save(self, key: str) -> None:
+        if not key in self._states and not key in self._data:
+            self._remove(key)
+        else:
+            self._used_at[key] = time()
+            self._used_at.move_to_end(key)
+            self._resize(
+                key,
+                len(self._states.get(key, "").encode())
+                + len(dumps(self._data.get(key, {}), ensure_ascii=False).encode()),
+            )
+            self._dirty.add(key)
+
+            await self._evict()
+
+        if len(self._dirty) >= self.flush_batch:
+            await self.flush()
+
+    # Метод для установки состояния пользователя по ключу
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        storage_key: str = self.key_builder.build(key)
+        state = state.state if isinstance(state, State) else state
+
+        if state is None:
+            self._states.pop(storage_key, None)
+        else:
+            self._states[storage_key] = state
+
+        await self._save(storage_key)
+
+    # Метод для получения состояния пользователя по ключу
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        storage_key: str = self.key_builder.build(key)
+
+        if not self._use(storage_key):
+            return None
+
+        return self._states.get(storage_key)
+
+    # Метод для установки данных пользователя по ключу
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        storage_key: str = self.key_builder.build(key)
+
+        if data == {}:
+            self._data.pop(storage_key, None)
+        else:
+            self._data[storage_key] = data.copy()
+
+        await self._save(storage_key)
+
+    # Метод для получения данных пользователя по ключу
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        storage_key: str = self.key_builder.build(key)
+
+        if not self._use(storage_key):
+            return {}
+
+        return self._data.get(storage_key, {}).copy()
+
+    # Метод для получения статистики использования хранилища
+    def get_stats(self) -> dict[str, int]:
+        stats: dict[str, int] = {
+            "conversations": len(self._used_at),
+            "bytes": self._bytes,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+        return stats
+
+    # Метод для записи оставшихся изменений и закрытия файла базы данных
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        self._tasks = []
+
+        if not self._conn is None:
+            await self.flush()
+            await self._conn.close()
+
+            self._conn = None
+
+
+# Хранилище состояний пользователей
+storage = Sqlite_Storage()
@@ -0,0 +1,195 @@
+# Файл, содержащий классы для записи отчётов в файлы
+
+
+# Подключение модулей Python
+from io import BytesIO
+from itertools import groupby
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle, Alignment, Font, Side, Border, PatternFill
+from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase import pdfmetrics
+from reportlab.lib import colors
+
+
+# Класс для записи данных в файл *.xlsx
+class Xlsx_Writer:
+    """Класс для записи данных в файл *.xlsx"""
+
+    black_color = "000000"
+    white_color = "FFFFFF"
+    medium = Side(border_style="medium", color=black_color)
+
+    font = Font(name="Times New Roman", size=14, color=black_color)
+    fill = PatternFill(
+        start_color=white_color, end_color=white_color, fill_type="solid"
+    )
+    border = Border(left=medium, right=medium, top=medium, bottom=medium)
+    alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+    # Метод класса для создания файла отчётов в памяти по количеству рядов в нём, данным в рядах и высотам рядов
+    @classmethod
+    def create_reports_file(
+        cls,
+        cnt_rows: int,
+        rows_data: list[list[str]],
+        row_heights: list[int],
+    ) -> bytes:
+        work_book = Workbook(write_only=True)
+        style = NamedStyle(
+            name="Отчёты",
+            font=cls.font,
+            fill=cls.fill,
+            border=cls.border,
+            alignment=cls.alignment,
+        )
+        work_book.add_named_style(style)
+
+        work_sheet = work_book.create_sheet("Отчёты")
+
+        columns = ["A", "B"]
+        for column in columns:
+            work_sheet.column_dimensions[column].width = 35
+
+        for i in range(cnt_rows):
+            work_sheet.row_dimensions[i + 1].height = row_heights[i]
+
+            cells: list[WriteOnlyCell] = []
+
+            for value in rows_data[i]:
+                cell = WriteOnlyCell(work_sheet, value=value)
+                cell.style = style.name
+
+                cells.append(cell)
+
+            work_sheet.append(cells)
+
+        file = BytesIO()
+        work_book.save(file)
+
+        return file.getvalue()
+
+
+# Класс для записи данных в файл *.pdf
+class Pdf_Writer:
+    """Класс для записи данных в файл *.pdf"""
+
+    font_name = "Times New Roman"
+    font_path = "./database/times.ttf"
+    months = [
+        "Январь",
+        "Февраль",
+        "Март",
+        "Апрель",
+        "Май",
+        "Июнь",
+        "Июль",
+        "Август",
+        "Сентябрь",
+        "Октябрь",
+        "Ноябрь",
+        "Декабрь",
+    ]
+
+    # Максимальное количество строк в одном ряду таблицы, ряд с большим количеством строк не помещается на страницу
+    max_row_lines = 20
+    line_height = 25
+
+    start = (0, 0)
+    end = (-1, -1)
+    table_style = TableStyle(
+        [
+            ("ALIGN", start, end, "CENTER"),
+            ("VALIGN", start, end, "MIDDLE"),
+            ("FONTNAME", start, end, font_name),
+            ("FONTSIZE", start, end, 14),
+            ("TEXTCOLOR", start, end, colors.black),
+            ("BACKGROUND", start, end, colors.white),
+            ("GRID", start, end, 1, colors.black),
+        ]
+    )
+    section_style = ParagraphStyle(
+        "Раздел", fontName=font_name, fontSize=16, leading=20, spaceBefore=20
+    )
+
+    # Метод класса для регистрации шрифтов, вызываемый один раз при запуске процесса
+    @classmethod
+    def register_fonts(cls) -> None:
+        if not cls.font_name in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(cls.font_name, cls.font_path))
+
+    # Метод класса для разделения ряда отчёта по его данным и высоте на несколько рядов с той же датой,
+    # каждый из которых помещается на одну страницу
+    @classmethod
+    def split_row(
+        cls, row_data: list[str], row_height: int
+    ) -> list[tuple[list[str], int]]:
+        members: list[str] = row_data[1].split("\n")
+
+        if len(members) <= cls.max_row_lines:
+            return [(row_data, row_height)]
+
+        rows: list[tuple[list[str], int]] = []
+
+        for i in range(0, len(members), cls.max_row_lines):
+            row_members: list[str] = members[i : i + cls.max_row_lines]
+
+            rows.append(
+                (
+                    [row_data[0], "\n".join(row_members)],
+                    len(row_members) * cls.line_height,
+                )
+            )
+
+        return rows
+
+    # Метод класса для создания файла отчётов в памяти по количеству рядов в нём, данным в рядах и высотам рядов,
+    # в котором отчёты разделены по месяцам
+    @classmethod
+    def create_reports_file(
+        cls, cnt_rows: int, rows_data: list[list[str]], rows_heights: list[int]
+    ) -> bytes:
+        cls.register_fonts()
+
+        file = BytesIO()
+        pdf = SimpleDocTemplate(file, pagesize=letter)
+        col_widths = [200, 200]
+
+        story: list = [
+            LongTable(rows_data[:2], colWidths=col_widths, rowHeights=rows_heights[:2])
+        ]
+        story[0].setStyle(cls.table_style)
+
+        header: list[str] = rows_data[2]
+        header_height: int = rows_heights[2]
+        rows = zip(rows_data[3:cnt_rows], rows_heights[3:cnt_rows])
+
+        for month, month_rows in groupby(rows, key=lambda row: row[0][0][3:]):
+            month_rows: list[tuple[list[str], int]] = [
+                row
+                for row_data, row_height in month_rows
+                for row in cls.split_row(row_data, row_height)
+            ]
+            month_number, year = month.split(".")
+
+            table = LongTable(
+                [header] + [row_data for row_data, _ in month_rows],
+                colWidths=col_widths,
+                rowHeights=[header_height] + [height for _, height in month_rows],
+                repeatRows=1,
+            )
+            table.setStyle(cls.table_style)
+
+            story.append(
+                Paragraph(
+                    f"{cls.months[int(month_number) - 1]} {year}", cls.section_style
+                )
+            )
+            story.append(table)
+
+        pdf.build(story)
+
+        return file.getvalue()
@@ -2,14 +2,18 @@
 
 
 # Подключение модулей Python
+from asyncio import to_thread
+from io import BytesIO
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
+from sqlalchemy.ext.asyncio import AsyncSession
 from aiogram.types import ReplyKeyboardMarkup, ReplyKeyboardRemove
 
 
 # Подключение пользовательских модулей
+from config import IMPORT_MAX_SIZE, KEYBOARD_PAGE_SIZE
 from handlers.middleware import Middleware
 from handlers.states import (
     Create_Group,
@@ -18,8 +22,17 @@ from handlers.states import (
     Remove_Members,
     Assign_Reports_Recipient,
 )
-from handlers.markups import create_reply_markup, create_request_user_markup
+from handlers.markups import (
+    PREVIOUS_PAGE,
+    NEXT_PAGE,
+    create_reply_markup,
+    create_request_user_markup,
+    turn_page,
+    answer_reply_page,
+)
+from database.models import Group
 from database.requests import User_Requests, Group_Requests
+from database.readers import Members_Reader
 
 
 # Настройка работы файла
@@ -29,14 +42,9 @@ config_router.message.middleware(Middleware())
 
 # Обработка команды "/creategroup"
 @config_router.message(Command("creategroup"))
-async def cmd_creategroup(message: Message, state: FSMContext) -> None:
-    if len(await User_Requests.get_groups_where_creator(message.from_user.id)) == 25:
-        mssg_txt = "Вы создали максимальное количество групп."
-
-        await message.answer(mssg_txt)
-
-        return
-
+async def cmd_creategroup(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     await state.set_state(Create_Group.group_name)
 
     mssg_txt = "Введите название группы."
@@ -46,7 +54,9 @@ async def cmd_creategroup(message: Message, state: FSMContext) -> None:
 
 # Получение названия группы от пользователя
 @config_router.message(Create_Group.group_name)
-async def get_group_name(message: Message, state: FSMContext) -> None:
+async def get_group_name(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     group_creator: int = message.from_user.id
     group_name: str = message.text.title()
 
@@ -56,14 +66,33 @@ async def get_group_name(message: Message, state: FSMContext) -> None:
         await message.answer(mssg_txt)
 
         return
-    elif not await Group_Requests.get_by_creator(group_creator, group_name) is None:
+    elif group_name in [PREVIOUS_PAGE, NEXT_PAGE]:
+        mssg_txt = "Это название нельзя использовать для группы, введите другое."
+
+        await message.answer(mssg_txt)
+
+        return
+    elif (
+        not await Group_Requests.get_by_creator(sess, group_creator, group_name) is None
+    ):
         mssg_txt = "Вы уже создавали группу с таким названием, введите другое."
 
         await message.answer(mssg_txt)
 
+        return
+    elif (
+        not await Group_Requests.get_by_reports_recipient(
+            sess, group_name, group_creator
+        )
+        is None
+    ):
+        mssg_txt = "Вы уже являетесь получателем отчётов группы с таким названием, введите другое."
+
+        await message.answer(mssg_txt)
+
         return
 
-    await Group_Requests.create(group_creator, group_name)
+    await Group_Requests.create(sess, group_creator, group_name)
 
     await state.clear()
 
@@ -74,8 +103,10 @@ async def get_group_name(message: Message, state: FSMContext) -> None:
 
 # Обработка команды "/addmembers"
 @config_router.message(Command("addmembers"))
-async def cmd_addmembers(message: Message, state: FSMContext) -> None:
-    if await User_Requests.get_groups_where_creator(message.from_user.id) == []:
+async def cmd_addmembers(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
+    if await User_Requests.get_groups_where_creator(sess, message.from_user.id) == []:
         mssg_txt = "Вы не создавали группу, в которую можно добавить участников."
 
         await message.answer(mssg_txt)
@@ -86,7 +117,8 @@ async def cmd_addmembers(message: Message, state: FSMContext) -> None:
 
     mssg_txt = "Выберите группу из списка."
     markup: ReplyKeyboardMarkup = await create_reply_markup(
-        await User_Requests.get_groups_where_creator(message.from_user.id)
+        await User_Requests.get_groups_where_creator(sess, message.from_user.id),
+        page=0,
     )
 
     await message.answer(mssg_txt, reply_markup=markup)
@@ -94,103 +126,162 @@ async def cmd_addmembers(message: Message, state: FSMContext) -> None:
 
 # Получение названия группы от пользователя
 @config_router.message(Add_Members.group_name)
-async def get_group_name(message: Message, state: FSMContext) -> None:
+async def get_group_name(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     group_creator: int = message.from_user.id
-    group_name: str = message.text.title()
-
-    if await Group_Requests.get_by_creator(group_creator, group_name) is None:
-        mssg_txt = "Вы не создавали группу с таким названием, введите другое."
 
-        await message.answer(mssg_txt)
+    if message.text in [PREVIOUS_PAGE, NEXT_PAGE]:
+        await answer_reply_page(
+            message,
+            state,
+            await User_Requests.get_groups_where_creator(sess, group_creator),
+        )
 
         return
 
-    group_members: list[str] = (
-        await Group_Requests.get_by_creator(group_creator, group_name)
-    ).members.split(";\n")
-
-    if len(group_members) == 25:
-        await state.clear()
+    group_name: str = message.text.title()
 
-        mssg_txt = "Добавление участников в группу прервано, так как в выбранной группе содержится максимальное количество участников."
-        markup = ReplyKeyboardRemove()
+    if await Group_Requests.get_by_creator(sess, group_creator, group_name) is None:
+        mssg_txt = "Вы не создавали группу с таким названием, введите другое."
 
-        await message.answer(mssg_txt, reply_markup=markup)
+        await message.answer(mssg_txt)
 
         return
 
     await state.update_data(group=group_name)
     await state.set_state(Add_Members.group_members)
 
-    mssg_txt = "Введите имена участников."
+    mssg_txt = (
+        "Введите имена участников по одному или списком, каждое имя с новой строки.\n"
+    )
+    mssg_txt += "Также можно отправить файл *.csv или *.xlsx с именами участников в первом столбце."
     markup: ReplyKeyboardMarkup = await create_reply_markup([], True)
 
     await message.answer(mssg_txt, reply_markup=markup)
 
 
-# Получение участника группы от пользователя
+# Функция для получения причины, по которой участник не может быть добавлен в группу,
+# по его имени и множеству имён участников группы, возвращает None, если участника можно добавить
+async def get_group_member_error(
+    group_member: str, group_members: set[str]
+) -> str | None:
+    if len(group_member) > 25:
+        return "превышения размера имени"
+    elif group_member in group_members:
+        return "существования в группе"
+    elif ";" in group_member:
+        return "наличия запрещённого символа в имени"
+    elif group_member in ["Отправить", "Стоп", PREVIOUS_PAGE, NEXT_PAGE]:
+        return "запрещённого имени"
+
+    return None
+
+
+# Получение участников группы от пользователя одним сообщением или файлом
 @config_router.message(Add_Members.group_members)
-async def get_group_member(message: Message, state: FSMContext) -> None:
+async def get_group_member(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     group_creator: int = message.from_user.id
     group_name: str = (await state.get_data())["group"]
-    group_members: list[str] = (
-        await Group_Requests.get_by_creator(group_creator, group_name)
-    ).members.split(";\n")
-    group_member: str = message.text.title()
 
-    if len(group_member) > 25:
-        mssg_txt = "Участник не был добавлен, по причине превышения размера имени."
+    if message.content_type == "document":
+        file_name: str = message.document.file_name or ""
 
-        await message.answer(mssg_txt)
+        if not file_name.lower().endswith((".csv", ".xlsx")):
+            mssg_txt = "Файл должен быть в формате *.csv или *.xlsx, отправьте другой."
 
-        return
-    elif group_member in group_members:
-        mssg_txt = "Участник не был добавлен, по причине существования в группе."
+            await message.answer(mssg_txt)
 
-        await message.answer(mssg_txt)
+            return
+        elif (message.document.file_size or 0) > IMPORT_MAX_SIZE:
+            mssg_txt = "Файл слишком большой, отправьте другой."
 
-        return
-    elif ";" in group_member:
-        mssg_txt = (
-            "Участник не был добавлен, по причине наличия запрещённого символа в имени."
-        )
+            await message.answer(mssg_txt)
 
-        await message.answer(mssg_txt)
+            return
 
-        return
-    elif group_member == "Отправить":
-        mssg_txt = "Участник не был добавлен, по причине запрещённого имени."
+        file: BytesIO = await message.bot.download(message.document)
 
-        await message.answer(mssg_txt)
+        try:
+            new_members: list[str] = await to_thread(
+                Members_Reader.read, file_name, file.getvalue()
+            )
+        except ValueError:
+            mssg_txt = "Не удалось прочитать файл, отправьте другой."
 
-        return
+            await message.answer(mssg_txt)
 
-    if group_member == "Стоп":
-        await state.clear()
+            return
 
-        mssg_txt = "Добавление участников в группу закончено."
-        markup = ReplyKeyboardRemove()
+        if new_members == []:
+            mssg_txt = "В первом столбце файла нет имён участников, отправьте другой."
 
-        await message.answer(mssg_txt, reply_markup=markup)
+            await message.answer(mssg_txt)
+
+            return
     else:
-        await Group_Requests.add_member(group_creator, group_name, group_member)
+        new_members: list[str] = [
+            line.strip() for line in message.text.split("\n") if line.strip() != ""
+        ]
 
-        mssg_txt = "Участник успешно добавлен в группу."
+        if [member.title() for member in new_members] == ["Стоп"]:
+            await state.clear()
 
-        await message.answer(mssg_txt)
+            mssg_txt = "Добавление участников в группу закончено."
+            markup = ReplyKeyboardRemove()
 
-        if len(group_members) == 24:
-            await state.clear()
+            await message.answer(mssg_txt, reply_markup=markup)
 
-            mssg_txt = "Добавление участников в группу прервано, так как в выбранной группе содержится максимальное количество участников."
+            return
 
-            await message.answer(mssg_txt)
+    group_members: set[str] = set(
+        await Group_Requests.get_members(sess, group_creator, group_name)
+    )
+    added_members: list[str] = []
+    rejected_members: list[tuple[str, str]] = []
+
+    for group_member in new_members:
+        group_member = group_member.title()
+        error: str | None = await get_group_member_error(group_member, group_members)
+
+        if error is None:
+            added_members.append(group_member)
+            group_members.add(group_member)
+        else:
+            rejected_members.append((group_member, error))
+
+    if added_members != []:
+        await Group_Requests.add_members(sess, group_creator, group_name, added_members)
+
+    if message.content_type == "text" and len(new_members) == 1:
+        if added_members != []:
+            mssg_txt = "Участник успешно добавлен в группу."
+        else:
+            mssg_txt = f"Участник не был добавлен, по причине {rejected_members[0][1]}."
+    else:
+        mssg_txt = f"Добавлено участников - {len(added_members)} из {len(new_members)}."
+
+        if rejected_members != []:
+            mssg_txt += "\nНе добавлены:\n"
+            mssg_txt += ";\n".join(
+                f"{group_member[:25]}{'...' if len(group_member) > 25 else ''} - по причине {error}"
+                for group_member, error in rejected_members[:20]
+            )
+
+            if len(rejected_members) > 20:
+                mssg_txt += f";\nи ещё {len(rejected_members) - 20}"
+
+            mssg_txt += "."
+
+    await message.answer(mssg_txt)
 
 
 # Обработка команды "/deletegroup"
 @config_router.message(Command("deletegroup"))
-async def cmd_deletegroup(message: Message, state: FSMContext):
-    if await User_Requests.get_groups_where_creator(message.from_user.id) == []:
+async def cmd_deletegroup(message: Message, state: FSMContext, sess: AsyncSession):
+    if await User_Requests.get_groups_where_creator(sess, message.from_user.id) == []:
         mssg_txt = "Вы не создавали группу, которую можно удалить."
 
         await message.answer(mssg_txt)
@@ -201,7 +292,8 @@ async def cmd_deletegroup(message: Message, state: FSMContext):
 
     mssg_txt = "Выберите группу из списка."
     markup: ReplyKeyboardMarkup = await create_reply_markup(
-        await User_Requests.get_groups_where_creator(message.from_user.id)
+        await User_Requests.get_groups_where_creator(sess, message.from_user.id),
+        page=0,
     )
 
     await message.answer(mssg_txt, reply_markup=markup)
@@ -209,11 +301,21 @@ async def cmd_deletegroup(message: Message, state: FSMContext):
 
 # Получение названия группы от пользователя
 @config_router.message(Delete_Group.group_name)
-async def get_group_name(message: Message, state: FSMContext):
+async def get_group_name(message: Message, state: FSMContext, sess: AsyncSession):
     group_creator: int = message.from_user.id
+
+    if message.text in [PREVIOUS_PAGE, NEXT_PAGE]:
+        await answer_reply_page(
+            message,
+            state,
+            await User_Requests.get_groups_where_creator(sess, group_creator),
+        )
+
+        return
+
     group_name: str = message.text.title()
 
-    if await Group_Requests.get_by_creator(group_creator, group_name) is None:
+    if await Group_Requests.get_by_creator(sess, group_creator, group_name) is None:
         mssg_txt = "Вы не создавали группу с таким названием, введите другое."
 
         await message.answer(mssg_txt)
@@ -234,7 +336,7 @@ async def get_group_name(message: Message, state: FSMContext):
 
 # Получение подтверждения от пользователя
 @config_router.message(Delete_Group.confirmation)
-async def get_confirmation(message: Message, state: FSMContext):
+async def get_confirmation(message: Message, state: FSMContext, sess: AsyncSession):
     confirmation: str = message.text.title()
 
     if confirmation != "Удалить" and confirmation != "Отмена":
@@ -248,7 +350,7 @@ async def get_confirmation(message: Message, state: FSMContext):
         group_creator: int = message.from_user.id
         group_name: str = (await state.get_data())["group_name"]
 
-        await Group_Requests.delete(group_creator, group_name)
+        await Group_Requests.delete(sess, group_creator, group_name)
 
         await state.clear()
 
@@ -267,8 +369,10 @@ async def get_confirmation(message: Message, state: FSMContext):
 
 # Обработка команды "/removemembers"
 @config_router.message(Command("removemembers"))
-async def cmd_removemembers(message: Message, state: FSMContext) -> None:
-    if await User_Requests.get_groups_where_creator(message.from_user.id) == []:
+async def cmd_removemembers(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
+    if await User_Requests.get_groups_where_creator(sess, message.from_user.id) == []:
         mssg_txt = "Вы не создавали группу, из которой можно удалить участников."
 
         await message.answer(mssg_txt)
@@ -279,7 +383,8 @@ async def cmd_removemembers(message: Message, state: FSMContext) -> None:
 
     mssg_txt = "Выберите группу из списка."
     markup: ReplyKeyboardMarkup = await create_reply_markup(
-        await User_Requests.get_groups_where_creator(message.from_user.id)
+        await User_Requests.get_groups_where_creator(sess, message.from_user.id),
+        page=0,
     )
 
     await message.answer(mssg_txt, reply_markup=markup)
@@ -287,22 +392,37 @@ async def cmd_removemembers(message: Message, state: FSMContext) -> None:
 
 # Получение названия группы от пользователя
 @config_router.message(Remove_Members.group_name)
-async def get_group_name(message: Message, state: FSMContext) -> None:
+async def get_group_name(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     group_creator: int = message.from_user.id
+
+    if message.text in [PREVIOUS_PAGE, NEXT_PAGE]:
+        await answer_reply_page(
+            message,
+            state,
+            await User_Requests.get_groups_where_creator(sess, group_creator),
+        )
+
+        return
+
     group_name: str = message.text.title()
 
-    if await Group_Requests.get_by_creator(group_creator, group_name) is None:
+    if await Group_Requests.get_by_creator(sess, group_creator, group_name) is None:
         mssg_txt = "Вы не создавали группу с таким названием, введите другое."
 
         await message.answer(mssg_txt)
 
         return
 
-    group_members: list[str] = (
-        await Group_Requests.get_by_creator(group_creator, group_name)
-    ).members.split(";\n")
+    group_version: int = await Group_Requests.get_data_version(
+        sess, group_creator, group_name
+    )
+    group_members, group_members_cnt = await Group_Requests.get_members_page(
+        sess, group_creator, group_name, group_version, 0
+    )
 
-    if group_members == [""]:
+    if group_members_cnt == 0:
         await state.clear()
 
         mssg_txt = (
@@ -314,65 +434,115 @@ async def get_group_name(message: Message, state: FSMContext) -> None:
 
         return
 
-    await state.update_data(group_name=group_name)
+    await state.update_data(group_name=group_name, group_version=group_version, page=0)
     await state.set_state(Remove_Members.group_members)
 
     mssg_txt = "Выберите участников из списка."
-    group_members.sort()
-    markup: ReplyKeyboardMarkup = await create_reply_markup(group_members, True)
+    markup: ReplyKeyboardMarkup = await create_reply_markup(
+        group_members, True, 0, group_members_cnt
+    )
 
     await message.answer(mssg_txt, reply_markup=markup)
 
 
-# Получение участника группы от пользователя
+# Получение участника группы от пользователя, страницы списка участников берутся из кэша по версии данных группы
 @config_router.message(Remove_Members.group_members)
-async def get_group_member(message: Message, state: FSMContext):
+async def get_group_member(message: Message, state: FSMContext, sess: AsyncSession):
+    data = await state.get_data()
     group_creator: int = message.from_user.id
-    group_name: str = (await state.get_data())["group_name"]
-    group_members: list[str] = (
-        await Group_Requests.get_by_creator(group_creator, group_name)
-    ).members.split(";\n")
+    group_name: str = data["group_name"]
+    group_version: int | None = data.get("group_version")
     group_member: str = message.text.title()
+    page: int = data.get("page", 0)
+
+    if group_member == "Стоп":
+        await state.clear()
+
+        mssg_txt = "Удаление участников из группы закончено."
+        markup = ReplyKeyboardRemove()
+
+        await message.answer(mssg_txt, reply_markup=markup)
+
+        return
+
+    if group_version is None:
+        group_version = await Group_Requests.get_data_version(
+            sess, group_creator, group_name
+        )
+
+    group_members, group_members_cnt = await Group_Requests.get_members_page(
+        sess, group_creator, group_name, group_version, page
+    )
+
+    if group_member in [PREVIOUS_PAGE, NEXT_PAGE]:
+        page, pages_cnt = turn_page(group_member, page, group_members_cnt)
+        group_members, group_members_cnt = await Group_Requests.get_members_page(
+            sess, group_creator, group_name, group_version, page
+        )
+
+        await state.update_data(group_version=group_version, page=page)
 
-    if group_member != "Стоп" and not group_member in group_members:
+        mssg_txt = f"Страница {page + 1} из {pages_cnt}."
+        markup: ReplyKeyboardMarkup = await create_reply_markup(
+            group_members, True, page, group_members_cnt
+        )
+
+        await message.answer(mssg_txt, reply_markup=markup)
+
+        return
+    elif not await Group_Requests.remove_member(
+        sess, group_creator, group_name, group_member
+    ):
         mssg_txt = "Участник не был удален, по причине отсутствия в группе."
-        markup: ReplyKeyboardMarkup = await create_reply_markup(group_members, True)
+        markup: ReplyKeyboardMarkup = await create_reply_markup(
+            group_members, True, page, group_members_cnt
+        )
 
         await message.answer(mssg_txt, reply_markup=markup)
 
         return
 
-    if group_member == "Стоп":
+    group_version = await Group_Requests.get_data_version(
+        sess, group_creator, group_name
+    )
+    group_members, group_members_cnt = await Group_Requests.get_members_page(
+        sess, group_creator, group_name, group_version, page
+    )
+
+    if group_members_cnt == 0:
         await state.clear()
 
-        mssg_txt = "Удаление участников из группы закончено."
+        mssg_txt = (
+            "Удаление участников из группы закончено, так как в группе нет участников."
+        )
         markup = ReplyKeyboardRemove()
 
         await message.answer(mssg_txt, reply_markup=markup)
-    else:
-        await Group_Requests.remove_member(group_creator, group_name, group_member)
-        group_members.remove(group_member)
 
-        if group_members == []:
-            await state.clear()
+        return
 
-            mssg_txt = "Удаление участников из группы закончено, так как в группе нет участников."
-            markup = ReplyKeyboardRemove()
+    if group_members == []:
+        page = (group_members_cnt - 1) // KEYBOARD_PAGE_SIZE
+        group_members, group_members_cnt = await Group_Requests.get_members_page(
+            sess, group_creator, group_name, group_version, page
+        )
 
-            await message.answer(mssg_txt, reply_markup=markup)
+    await state.update_data(group_version=group_version, page=page)
 
-        else:
-            mssg_txt = "Участник успешно удалён из группы."
-            group_members.sort()
-            markup: ReplyKeyboardMarkup = await create_reply_markup(group_members, True)
+    mssg_txt = "Участник успешно удалён из группы."
+    markup: ReplyKeyboardMarkup = await create_reply_markup(
+        group_members, True, page, group_members_cnt
+    )
 
-            await message.answer(mssg_txt, reply_markup=markup)
+    await message.answer(mssg_txt, reply_markup=markup)
 
 
 # Обработка команды "/assignreportsrecipient"
 @config_router.message(Command("assignreportsrecipient"))
-async def cmd_assignreportsrecipient(message: Message, state: FSMContext):
-    if await User_Requests.get_groups_where_creator(message.from_user.id) == []:
+async def cmd_assignreportsrecipient(
+    message: Message, state: FSMContext, sess: AsyncSession
+):
+    if await User_Requests.get_groups_where_creator(sess, message.from_user.id) == []:
         mssg_txt = (
             "Вы не создавали группу, для которой можно назначить получателя отчётов."
         )
@@ -385,7 +555,8 @@ async def cmd_assignreportsrecipient(message: Message, state: FSMContext):
 
     mssg_txt = "Выберите группу из списка."
     markup: ReplyKeyboardMarkup = await create_reply_markup(
-        await User_Requests.get_groups_where_creator(message.from_user.id)
+        await User_Requests.get_groups_where_creator(sess, message.from_user.id),
+        page=0,
     )
 
     await message.answer(mssg_txt, reply_markup=markup)
@@ -393,11 +564,21 @@ async def cmd_assignreportsrecipient(message: Message, state: FSMContext):
 
 # Получение названия группы от пользователя
 @config_router.message(Assign_Reports_Recipient.group_name)
-async def get_group_name(message: Message, state: FSMContext):
+async def get_group_name(message: Message, state: FSMContext, sess: AsyncSession):
     group_creator: int = message.from_user.id
+
+    if message.text in [PREVIOUS_PAGE, NEXT_PAGE]:
+        await answer_reply_page(
+            message,
+            state,
+            await User_Requests.get_groups_where_creator(sess, group_creator),
+        )
+
+        return
+
     group_name: str = message.text
 
-    if await Group_Requests.get_by_creator(group_creator, group_name) is None:
+    if await Group_Requests.get_by_creator(sess, group_creator, group_name) is None:
         mssg_txt = "Вы не создавали группу с таким названием, введите другое."
 
         await message.answer(mssg_txt)
@@ -415,14 +596,30 @@ async def get_group_name(message: Message, state: FSMContext):
 
 # Получение получателя отчётов
 @config_router.message(Assign_Reports_Recipient.group_reports_recipient, F.users_shared)
-async def get_group_reports_recipient(message: Message, state: FSMContext):
+async def get_group_reports_recipient(
+    message: Message, state: FSMContext, sess: AsyncSession
+):
     group_creator: int = message.from_user.id
     group_name: str = (await state.get_data())["group_name"]
     group_reports_recipient: int = message.users_shared.user_ids[0]
+    reports_recipient_group: Group | None = (
+        await Group_Requests.get_by_reports_recipient(
+            sess, group_name, group_reports_recipient
+        )
+    )
+
+    if not reports_recipient_group is None and reports_recipient_group.id != (
+        (await Group_Requests.get_by_creator(sess, group_creator, group_name)).id
+    ):
+        mssg_txt = "Этот пользователь уже является получателем отчётов группы с таким названием, выберите другого."
+
+        await message.answer(mssg_txt)
+
+        return
 
     try:
         await Group_Requests.assign_reports_recipient(
-            group_creator, group_name, group_reports_recipient
+            sess, group_creator, group_name, group_reports_recipient
         )
     except AttributeError:
         mssg_txt = "Вы не можете выбирать пользователя, который не запускал бота."
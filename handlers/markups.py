@@ -2,7 +2,9 @@
 
 
 # Подключение модулей Python
+from aiogram.fsm.context import FSMContext
 from aiogram.types import (
+    Message,
     ReplyKeyboardMarkup,
     KeyboardButton,
     InlineKeyboardMarkup,
@@ -15,16 +17,47 @@ from aiogram.utils.keyboard import (
 )
 
 
-# Функция, создающая reply разметку, используя список текста на кнопках и добавляя кнопку с текстом "Стоп" при необходимости
+# Подключение пользовательских модулей
+from config import KEYBOARD_PAGE_SIZE
+
+
+# Тексты кнопок для перехода на предыдущую и следующую страницы reply разметки
+PREVIOUS_PAGE = "◀️ Назад"
+NEXT_PAGE = "Далее ▶️"
+
+
+# Функция, создающая reply разметку, используя список текста на кнопках и добавляя кнопку с текстом "Стоп" при необходимости,
+# если задан номер страницы, то на кнопках выводится только текст этой страницы и добавляются кнопки для перехода между страницами,
+# если задано общее количество элементов, то список уже содержит только текст этой страницы
 async def create_reply_markup(
-    data: list[str], add_stop_button: bool = False
+    data: list[str],
+    add_stop_button: bool = False,
+    page: int | None = None,
+    data_cnt: int | None = None,
 ) -> ReplyKeyboardMarkup:
     keyboard = ReplyKeyboardBuilder()
+    pages_cnt: int = max(
+        1, -(-(len(data) if data_cnt is None else data_cnt) // KEYBOARD_PAGE_SIZE)
+    )
+
+    if not page is None and data_cnt is None:
+        data = data[page * KEYBOARD_PAGE_SIZE : (page + 1) * KEYBOARD_PAGE_SIZE]
 
     for element in data:
         keyboard.add(KeyboardButton(text=element))
     keyboard.adjust(2)
 
+    if not page is None and pages_cnt > 1:
+        buttons: list[KeyboardButton] = []
+
+        if page > 0:
+            buttons.append(KeyboardButton(text=PREVIOUS_PAGE))
+
+        if page < pages_cnt - 1:
+            buttons.append(KeyboardButton(text=NEXT_PAGE))
+
+        keyboard.row(*buttons)
+
     if add_stop_button:
         keyboard.row(KeyboardButton(text="Стоп"))
 
@@ -33,6 +66,36 @@ async def create_reply_markup(
     return markup
 
 
+# Функция, возвращающая номер страницы reply разметки после нажатия кнопки перехода, используя текст кнопки,
+# текущий номер страницы и общее количество элементов, а также количество страниц
+def turn_page(text: str, page: int, data_cnt: int) -> tuple[int, int]:
+    pages_cnt: int = max(1, -(-data_cnt // KEYBOARD_PAGE_SIZE))
+
+    if text == PREVIOUS_PAGE:
+        page -= 1
+    else:
+        page += 1
+
+    return min(max(page, 0), pages_cnt - 1), pages_cnt
+
+
+# Функция, отправляющая следующую или предыдущую страницу reply разметки для выбора из списка по сообщению пользователя
+# с кнопкой перехода, его состоянию и полному списку текста на кнопках, номер страницы хранится в состоянии
+async def answer_reply_page(
+    message: Message, state: FSMContext, data: list[str]
+) -> None:
+    page, pages_cnt = turn_page(
+        message.text, (await state.get_data()).get("page", 0), len(data)
+    )
+
+    await state.update_data(page=page)
+
+    mssg_txt = f"Страница {page + 1} из {pages_cnt}."
+    markup: ReplyKeyboardMarkup = await create_reply_markup(data, page=page)
+
+    await message.answer(mssg_txt, reply_markup=markup)
+
+
 # Функция, создающая reply разметку, которая содержит кнопку для запроса пользователя
 async def create_request_user_markup() -> ReplyKeyboardMarkup:
     markup = ReplyKeyboardMarkup(
@@ -51,14 +114,71 @@ async def create_request_user_markup() -> ReplyKeyboardMarkup:
     return markup
 
 
-# Функция, создающая inline разметку для создания отчёта, используя список участников группы
-async def create_report_markup(members: list[str]) -> InlineKeyboardMarkup:
+# Отметка на кнопке участника, выбранного для отчёта
+SELECTED_MARK = "✅ "
+
+
+# Функция, создающая inline разметку для создания отчёта, используя страницу списка участников группы, случайный ключ
+# создания отчёта, битовую маску выбранных участников, номер страницы и общее количество участников, в данных кнопок
+# передаются только ключ и номер участника в списке или номер страницы
+async def create_report_markup(
+    members: list[str],
+    nonce: str,
+    selected: int = 0,
+    page: int = 0,
+    members_cnt: int | None = None,
+) -> InlineKeyboardMarkup:
     keyboard = InlineKeyboardBuilder()
+    pages_cnt: int = -(-(members_cnt or len(members)) // KEYBOARD_PAGE_SIZE)
 
-    for member in members:
-        keyboard.add(InlineKeyboardButton(text=member, callback_data=f"r_{member}"))
+    for index, member in enumerate(members, start=page * KEYBOARD_PAGE_SIZE):
+        if selected >> index & 1:
+            member = SELECTED_MARK + member
+
+        keyboard.add(
+            InlineKeyboardButton(text=member, callback_data=f"r:{nonce}:{index}")
+        )
     keyboard.adjust(2)
-    keyboard.row(InlineKeyboardButton(text="Отправить", callback_data="r_Отправить"))
+
+    if pages_cnt > 1:
+        keyboard.row(
+            InlineKeyboardButton(
+                text="◀️", callback_data=f"r:{nonce}:p{max(page - 1, 0)}"
+            ),
+            InlineKeyboardButton(
+                text=f"{page + 1}/{pages_cnt}", callback_data=f"r:{nonce}:p{page}"
+            ),
+            InlineKeyboardButton(
+                text="▶️",
+                callback_data=f"r:{nonce}:p{min(page + 1, pages_cnt - 1)}",
+            ),
+        )
+
+    keyboard.row(InlineKeyboardButton(text="Отправить", callback_data=f"r:{nonce}:s"))
     markup: InlineKeyboardMarkup = keyboard.as_markup()
 
     return markup
+
+
+# Функция, изменяющая inline разметку для создания отчёта, используя данные нажатой кнопки участника и то, выбран ли он,
+# возвращает новую разметку и имя участника
+async def toggle_report_markup(
+    markup: InlineKeyboardMarkup, callback_data: str, is_selected: bool
+) -> tuple[InlineKeyboardMarkup, str]:
+    keyboard: list[list[InlineKeyboardButton]] = []
+    member = ""
+
+    for row in markup.inline_keyboard:
+        buttons: list[InlineKeyboardButton] = []
+
+        for button in row:
+            if button.callback_data == callback_data:
+                member = button.text.removeprefix(SELECTED_MARK)
+                text: str = SELECTED_MARK + member if is_selected else member
+                button = button.model_copy(update={"text": text})
+
+            buttons.append(button)
+
+        keyboard.append(buttons)
+
+    return InlineKeyboardMarkup(inline_keyboard=keyboard), member
@@ -4,7 +4,13 @@
 # Подключение модулей Python
 from typing import Callable, Dict, Any, Awaitable
 from aiogram import BaseMiddleware
-from aiogram.types import Message
+from aiogram.types import Message, TelegramObject, User
+
+
+# Подключение пользовательских модулей
+from handlers.states import Add_Members
+from database.models import session
+from database.requests import User_Requests
 
 
 # Класс для описания внутреннего middleware
@@ -26,6 +32,7 @@ class Middleware(BaseMiddleware):
                     "/start",
                     "/help",
                     "/setutcoffset",
+                    "/digest",
                     "/feedback",
                     "/creategroup",
                     "/addmembers",
@@ -45,7 +52,50 @@ class Middleware(BaseMiddleware):
                     await event.answer(mssg_txt)
         elif event.content_type == "users_shared":
             await handler(event, data)
+        elif (
+            event.content_type == "document"
+            and await data["state"].get_state() == Add_Members.group_members.state
+        ):
+            await handler(event, data)
         else:
             mssg_txt = "Ваше сообщение не является текстом, отправьте другое."
 
             await event.answer(mssg_txt)
+
+
+# Класс для описания внешнего middleware, открывающего одну сессию базы данных на каждое обновление
+class Session_Middleware(BaseMiddleware):
+    """Класс для описания внешнего middleware, открывающего одну сессию базы данных на каждое обновление"""
+
+    # Магический метод __call__, срабатывающий при вызове объекта класса
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        async with session() as sess:
+            data["sess"] = sess
+
+            return await handler(event, data)
+
+
+# Класс для описания внешнего middleware, обновляющего имя отправителя обновления в базе данных
+class User_Info_Middleware(BaseMiddleware):
+    """Класс для описания внешнего middleware, обновляющего имя отправителя обновления в базе данных"""
+
+    # Магический метод __call__, срабатывающий при вызове объекта класса
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user_info: User | None = data.get("event_from_user")
+
+        if not user_info is None:
+            await User_Requests.refresh_info(
+                data["sess"], user_info.id, user_info.username, user_info.full_name
+            )
+
+        return await handler(event, data)
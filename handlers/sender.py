@@ -0,0 +1,410 @@
+# Файл, содержащий очередь исходящих сообщений с ограничением частоты запросов к Телеграм
+
+
+# Подключение модулей Python
+from asyncio import (
+    PriorityQueue,
+    Task,
+    TimerHandle,
+    create_task,
+    get_running_loop,
+    sleep,
+)
+from contextvars import ContextVar
+from itertools import count
+from time import monotonic
+from typing import Any, Awaitable, Callable, Hashable
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+from aiogram.methods import EditMessageText, GetUpdates, SendMessage, TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+
+
+# Подключение пользовательских модулей
+from config import (
+    SENDER_GLOBAL_RATE,
+    SENDER_CHAT_RATE,
+    SENDER_CHAT_BURST,
+    SENDER_WORKERS,
+    SENDER_MAX_RETRIES,
+    SENDER_SHUTDOWN_TIMEOUT,
+    DIGEST_WINDOW,
+)
+from bot import bot
+
+
+# Приоритеты очередей сообщений: ответы пользователю отправляются раньше уведомлений
+INTERACTIVE = 0
+NOTIFICATION = 1
+
+# Максимальная длина текста сообщения в Телеграм
+MAX_MESSAGE_LENGTH = 4096
+
+# Количество корзин токенов чатов, при достижении которого удаляются корзины неактивных чатов
+MAX_CHATS_BUCKETS = 10000
+
+# Приоритет запроса к Телеграм, выполняемого в текущей задаче
+request_priority: ContextVar[int] = ContextVar("request_priority", default=INTERACTIVE)
+
+
+# Функция для разделения текста сообщения на части, помещающиеся в одно сообщение Телеграм, по границам строк
+def split_text(text: str) -> list[str]:
+    parts: list[str] = []
+    part = ""
+
+    for line in text.split("\n"):
+        while len(line) > MAX_MESSAGE_LENGTH:
+            if part != "":
+                parts.append(part)
+
+                part = ""
+
+            parts.append(line[:MAX_MESSAGE_LENGTH])
+            line = line[MAX_MESSAGE_LENGTH:]
+
+        if part != "" and len(part) + len(line) + 1 > MAX_MESSAGE_LENGTH:
+            parts.append(part)
+
+            part = line
+        else:
+            part = line if part == "" else part + "\n" + line
+
+    if part != "" or parts == []:
+        parts.append(part)
+
+    return parts
+
+
+# Класс для описания ограничителя частоты запросов по алгоритму "корзина токенов"
+class Token_Bucket:
+    """Класс для описания ограничителя частоты запросов по алгоритму "корзина токенов".
+    Запросы с приоритетом уведомлений получают токен, только если его не ждут ответы пользователям
+    """
+
+    # Магический метод __init__, срабатывающий при создании объекта класса
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self._tokens: float = capacity
+        self._updated_at: float = monotonic()
+        self._paused_until: float = 0
+        self._interactive_waiting: int = 0
+
+    # Метод для пополнения корзины токенами за прошедшее время
+    def _refill(self) -> None:
+        now: float = monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    # Метод для получения времени в секундах до появления токена без ожидания, при его наличии токен забирается
+    def try_acquire(self) -> float:
+        self._refill()
+
+        if self._paused_until > self._updated_at:
+            return self._paused_until - self._updated_at
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+
+            return 0
+
+        return (1 - self._tokens) / self.rate
+
+    # Метод для ожидания и получения токена по приоритету запроса
+    async def acquire(self, priority: int) -> None:
+        if priority == INTERACTIVE:
+            self._interactive_waiting += 1
+
+        try:
+            while True:
+                if priority == INTERACTIVE or self._interactive_waiting == 0:
+                    delay: float = self.try_acquire()
+
+                    if delay == 0:
+                        return
+                else:
+                    delay: float = 1 / self.rate
+
+                await sleep(delay)
+        finally:
+            if priority == INTERACTIVE:
+                self._interactive_waiting -= 1
+
+    # Метод для приостановки выдачи токенов на время в секундах
+    def pause(self, delay: float) -> None:
+        self._paused_until = max(self._paused_until, monotonic() + delay)
+
+    # Метод для проверки того, что корзина полна и её можно удалить
+    def is_full(self) -> bool:
+        self._refill()
+
+        return self._tokens >= self.capacity
+
+
+# Класс для описания middleware запросов к Телеграм, ограничивающего их общую частоту и повторяющего их после ошибки 429
+class Rate_Limit_Middleware(BaseRequestMiddleware):
+    """Класс для описания middleware запросов к Телеграм, ограничивающего их общую частоту и повторяющего их после ошибки 429"""
+
+    # Магический метод __init__, срабатывающий при создании объекта класса
+    def __init__(
+        self,
+        rate: float = SENDER_GLOBAL_RATE,
+        max_retries: int = SENDER_MAX_RETRIES,
+    ) -> None:
+        self.bucket = Token_Bucket(rate, rate)
+        self.max_retries: int = max_retries
+        self.retries: int = 0
+
+    # Магический метод __call__, срабатывающий при вызове объекта класса
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if isinstance(method, GetUpdates):
+            return await make_request(bot, method)
+
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire(request_priority.get())
+
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as error:
+                self.bucket.pause(error.retry_after)
+
+                if attempt == self.max_retries:
+                    raise
+
+                self.retries += 1
+
+
+# Класс для описания очереди исходящих сообщений, отправляемых в фоне с ограничением частоты для каждого чата
+class Sender:
+    """Класс для описания очереди исходящих сообщений, отправляемых в фоне с ограничением частоты для каждого чата"""
+
+    # Магический метод __init__, срабатывающий при создании объекта класса
+    def __init__(
+        self,
+        workers: int = SENDER_WORKERS,
+        chat_rate: float = SENDER_CHAT_RATE,
+        chat_burst: int = SENDER_CHAT_BURST,
+        shutdown_timeout: float = SENDER_SHUTDOWN_TIMEOUT,
+        digest_window: float = DIGEST_WINDOW,
+    ) -> None:
+        self.workers: int = workers
+        self.chat_rate: float = chat_rate
+        self.chat_burst: int = chat_burst
+        self.shutdown_timeout: float = shutdown_timeout
+        self.digest_window: float = digest_window
+        self.request_middleware = Rate_Limit_Middleware()
+        self.sent: int = 0
+        self.delayed: int = 0
+        self.failed: int = 0
+        self.coalesced: int = 0
+        self._queued: dict[int, int] = {INTERACTIVE: 0, NOTIFICATION: 0}
+        self._queue: PriorityQueue | None = None
+        self._order = count()
+        self._chats_buckets: dict[int, Token_Bucket] = {}
+        self._tasks: list[Task] = []
+        self._digests: dict[int, dict[Hashable, str]] = {}
+        self._digests_handles: dict[int, TimerHandle] = {}
+
+    # Метод для подключения ограничения частоты запросов к боту и запуска отправляющих задач
+    def start(self, bot: Bot = bot) -> None:
+        bot.session.middleware(self.request_middleware)
+
+        self._queue = PriorityQueue()
+        self._tasks = [create_task(self._work(bot)) for _ in range(self.workers)]
+
+    # Метод для добавления сообщения в очередь по id чата, тексту сообщения, приоритету, функции, вызываемой с отправленным сообщением
+    # или None при ошибке отправки, и параметрам метода sendMessage, длинный текст отправляется несколькими сообщениями,
+    # а функция вызывается только с первым из них
+    async def send(
+        self,
+        chat_id: int,
+        text: str,
+        priority: int = NOTIFICATION,
+        on_sent: Callable[[Any], Awaitable[None]] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        for part in split_text(text):
+            self._put(
+                chat_id,
+                SendMessage(chat_id=chat_id, text=part, **kwargs),
+                priority,
+                on_sent,
+            )
+
+            on_sent = None
+
+    # Метод для добавления изменения текста отправленного сообщения в очередь по id чата, id сообщения, новому тексту,
+    # приоритету и функции, вызываемой с изменённым сообщением или None при ошибке изменения
+    async def edit(
+        self,
+        chat_id: int,
+        message_id: int,
+        text: str,
+        priority: int = NOTIFICATION,
+        on_sent: Callable[[Any], Awaitable[None]] | None = None,
+    ) -> None:
+        self._put(
+            chat_id,
+            EditMessageText(chat_id=chat_id, message_id=message_id, text=text),
+            priority,
+            on_sent,
+        )
+
+    # Метод для добавления запроса к Телеграм в очередь без ожидания по id чата, самому запросу, приоритету
+    # и функции, вызываемой с результатом запроса
+    def _put(
+        self,
+        chat_id: int,
+        method: TelegramMethod,
+        priority: int,
+        on_sent: Callable[[Any], Awaitable[None]] | None = None,
+    ) -> None:
+        self._queued[priority] += 1
+
+        self._queue.put_nowait((priority, next(self._order), chat_id, method, on_sent))
+
+    # Метод для добавления уведомления в сводку чата по id чата, ключу уведомления и его тексту,
+    # уведомление заменяет предыдущее с тем же ключом, а сводка отправляется одним сообщением через digest_window секунд
+    async def send_to_digest(self, chat_id: int, key: Hashable, text: str) -> None:
+        digest: dict[Hashable, str] = self._digests.setdefault(chat_id, {})
+
+        if digest.pop(key, None) is None:
+            if not chat_id in self._digests_handles:
+                self._digests_handles[chat_id] = get_running_loop().call_later(
+                    self.digest_window, self._flush_digest, chat_id
+                )
+        else:
+            self.coalesced += 1
+
+        digest[key] = text
+
+    # Метод для отправки сводки чата по его id, сводка делится на несколько сообщений, если не помещается в одно
+    def _flush_digest(self, chat_id: int) -> None:
+        handle: TimerHandle | None = self._digests_handles.pop(chat_id, None)
+
+        if not handle is None:
+            handle.cancel()
+
+        mssg_txt = ""
+
+        for digest_text in self._digests.pop(chat_id, {}).values():
+            for text in split_text(digest_text):
+                if (
+                    mssg_txt != ""
+                    and len(mssg_txt) + len(text) + 2 > MAX_MESSAGE_LENGTH
+                ):
+                    self._put(
+                        chat_id,
+                        SendMessage(chat_id=chat_id, text=mssg_txt),
+                        NOTIFICATION,
+                    )
+
+                    mssg_txt = ""
+
+                mssg_txt += text if mssg_txt == "" else "\n\n" + text
+
+        if mssg_txt != "":
+            self._put(
+                chat_id, SendMessage(chat_id=chat_id, text=mssg_txt), NOTIFICATION
+            )
+
+    # Метод для получения времени в секундах до возможности отправить сообщение в чат, при нулевом времени токен забирается
+    def _get_chat_delay(self, chat_id: int) -> float:
+        bucket: Token_Bucket | None = self._chats_buckets.get(chat_id)
+
+        if bucket is None:
+            if len(self._chats_buckets) >= MAX_CHATS_BUCKETS:
+                self._chats_buckets = {
+                    chat: bucket
+                    for chat, bucket in self._chats_buckets.items()
+                    if not bucket.is_full()
+                }
+
+            bucket = Token_Bucket(self.chat_rate, self.chat_burst)
+            self._chats_buckets[chat_id] = bucket
+
+        return bucket.try_acquire()
+
+    # Метод отправляющей задачи, забирающей сообщения из очереди по приоритету
+    async def _work(self, bot: Bot) -> None:
+        while True:
+            item: tuple = await self._queue.get()
+            priority, _, chat_id, method, on_sent = item
+
+            try:
+                delay: float = self._get_chat_delay(chat_id)
+
+                if delay > 0:
+                    self.delayed += 1
+
+                    get_running_loop().call_later(delay, self._queue.put_nowait, item)
+
+                    continue
+
+                self._queued[priority] -= 1
+                request_priority.set(priority)
+
+                try:
+                    result: Any = await bot(method)
+
+                    self.sent += 1
+                except TelegramAPIError:
+                    result = None
+
+                    self.failed += 1
+
+                if not on_sent is None:
+                    try:
+                        await on_sent(result)
+                    except Exception:
+                        self.failed += 1
+            finally:
+                self._queue.task_done()
+
+    # Метод для получения статистики работы очереди
+    def get_stats(self) -> dict[str, int]:
+        stats: dict[str, int] = {
+            "interactive": self._queued[INTERACTIVE],
+            "notifications": self._queued[NOTIFICATION],
+            "sent": self.sent,
+            "delayed": self.delayed,
+            "failed": self.failed,
+            "retries": self.request_middleware.retries,
+            "digests": len(self._digests),
+            "coalesced": self.coalesced,
+        }
+
+        return stats
+
+    # Метод для ожидания отправки оставшихся сообщений и остановки отправляющих задач
+    async def stop(self) -> None:
+        if self._queue is None:
+            return
+
+        for chat_id in list(self._digests):
+            self._flush_digest(chat_id)
+
+        deadline: float = monotonic() + self.shutdown_timeout
+
+        while sum(self._queued.values()) > 0 and monotonic() < deadline:
+            await sleep(0.1)
+
+        for task in self._tasks:
+            task.cancel()
+
+        self._tasks = []
+
+
+# Очередь исходящих сообщений
+sender = Sender()
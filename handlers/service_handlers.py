@@ -2,18 +2,31 @@
 
 
 # Подключение модулей Python
-from aiogram import Router
+from aiogram import Router, F
 from aiogram.filters import CommandStart, Command
 from aiogram.types import Message, ReplyKeyboardRemove
 from aiogram.fsm.context import FSMContext
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 # Подключение пользовательских модулей
-from config import OWNER_TG_ID
-from bot import bot
+from config import OWNER_TG_ID, DIGEST_WINDOW
 from handlers.middleware import Middleware
+from handlers.sender import sender
 from handlers.states import Set_Utc_Offset, Send_Feedback
+from database.models import User
 from database.requests import Datetime_Handler, User_Requests
+from database.cache import (
+    users_cache,
+    groups_cache,
+    groups_lists_cache,
+    statistics_cache,
+    exports_cache,
+    members_pages_cache,
+)
+from database.export_pool import export_pool
+from database.prefix_index import prefix_indexes
+from database.storage import storage
 
 
 # Настройка работы файла
@@ -23,8 +36,8 @@ service_router.message.middleware(Middleware())
 
 # Обработка команды "/start"
 @service_router.message(CommandStart())
-async def cmd_start(message: Message) -> None:
-    await User_Requests.init(message.from_user.id)
+async def cmd_start(message: Message, sess: AsyncSession) -> None:
+    await User_Requests.init(sess, message.from_user.id)
 
     mssg_txt = f"Здравствуйте, {message.from_user.full_name}!\n"
     mssg_txt += "Этот бот предназначен для контроля отсутствия участников групп.\n"
@@ -38,10 +51,11 @@ async def cmd_start(message: Message) -> None:
 async def cmd_help(message: Message) -> None:
     mssg_txt1 = "При помощи данного бота вы можете создать группу.\n"
     mssg_txt1 += "Также у вас есть возможность добавить в группу участников.\n"
-    mssg_txt1 += "Количество групп и участников не может превышать 25.\n"
+    mssg_txt1 += "Количество групп и участников в группе не ограничено.\n"
     mssg_txt1 += "Имена групп, как и имена участников, не должны превышать длину в 25 символов.\n"
-    mssg_txt1 += "При добавлении и удалении участников каждое имя отправляется в новом сообщении. \n"
+    mssg_txt1 += "При добавлении участников имена можно отправить по одному, списком или файлом, а при удалении каждое имя отправляется в новом сообщении.\n"
     mssg_txt1 += 'Имена участников не должны содержать символа ";" или являться словом "Отправить".\n'
+    mssg_txt1 += "Если участников в группе много, их список разбивается на страницы, которые можно листать кнопками под списком.\n"
     mssg_txt1 += 'Для окончания отправки имён нажмите на кнопку с текстом "Стоп".\n'
     mssg_txt1 += "После создания группы вы являетесь её получателем отчётов, "
     mssg_txt1 += "однако вы можете назначить на эту роль другого пользователя, который хотя бы раз запускал бота, используя специальную команду.\n"
@@ -50,6 +64,7 @@ async def cmd_help(message: Message) -> None:
         "После настройки группы вы сможете создать отчёт и отправить его получателю.\n"
     )
     mssg_txt1 += "Если вы будете отправлять отчёт для одной и той же группы больше одного раза в день, то получателю будет сообщаться, что отчёт изменился.\n"
+    mssg_txt1 += "Получатель отчётов может включить сводку уведомлений, тогда уведомления об отчётах будут приходить не сразу, а одним сообщением за определённый промежуток времени.\n"
     mssg_txt1 += "Также данный бот при создании отчётов будет сохранять дату их создания для подведения статистики или создания файла отчётов за определённый промежуток времени.\n"
     mssg_txt1 += "В данном боте присутствует возможность отправить отзыв владельцу, который может связаться с вами в случае необходимости.\n"
 
@@ -64,6 +79,7 @@ async def cmd_help(message: Message) -> None:
     mssg_txt2 += "/help - Получить справочную информацию;\n"
     mssg_txt2 += "/cancel - Прервать выполнение текущей команды;\n"
     mssg_txt2 += "/setutcoffset - Указать смещение UTC в вашем часовом поясе;\n"
+    mssg_txt2 += "/digest - Включить или выключить сводку уведомлений об отчётах;\n"
     mssg_txt2 += "/feedback - Отправить отзыв о боте его владельцу;\n"
     mssg_txt2 += "/creategroup - Создать группу;\n"
     mssg_txt2 += "/addmembers - Добавить участников в группу;\n"
@@ -113,7 +129,9 @@ async def cmd_setutcoffset(message: Message, state: FSMContext) -> None:
 
 # Получение смещения UTC от пользователя
 @service_router.message(Set_Utc_Offset.utc_offset)
-async def get_utc_offset(message: Message, state: FSMContext) -> None:
+async def get_utc_offset(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     utc_offset: str = message.text
 
     if not await Datetime_Handler.validate_utc_offset(utc_offset):
@@ -125,7 +143,7 @@ async def get_utc_offset(message: Message, state: FSMContext) -> None:
 
     utc_offset: int = await Datetime_Handler.utc_offset_string_to_int(utc_offset)
 
-    await User_Requests.set_utc_offset(message.from_user.id, utc_offset)
+    await User_Requests.set_utc_offset(sess, message.from_user.id, utc_offset)
 
     await state.clear()
 
@@ -134,10 +152,36 @@ async def get_utc_offset(message: Message, state: FSMContext) -> None:
     await message.answer(mssg_txt)
 
 
+# Обработка команды "/digest"
+@service_router.message(Command("digest"))
+async def cmd_digest(message: Message, sess: AsyncSession) -> None:
+    user: User | None = await User_Requests.get(sess, message.from_user.id)
+
+    if user is None:
+        mssg_txt = 'Для начала работы с ботом воспользуйтесь командой "/start".'
+
+        await message.answer(mssg_txt)
+
+        return
+
+    digest: bool = not user.digest
+
+    await User_Requests.set_digest(sess, message.from_user.id, digest)
+
+    if not digest:
+        mssg_txt = "Сводка уведомлений выключена, уведомления об отчётах будут приходить сразу."
+    else:
+        mssg_txt = f"Сводка уведомлений включена, уведомления об отчётах будут приходить одним сообщением раз в {DIGEST_WINDOW // 60} мин."
+
+    await message.answer(mssg_txt)
+
+
 # Обработка команды "/feedback"
 @service_router.message(Command("feedback"))
-async def cmd_feedback(message: Message, state: FSMContext) -> None:
-    feedbacks_cnt: int = (await User_Requests.get(message.from_user.id)).feedbacks_cnt
+async def cmd_feedback(message: Message, state: FSMContext, sess: AsyncSession) -> None:
+    feedbacks_cnt: int = await User_Requests.get_feedbacks_cnt(
+        sess, message.from_user.id
+    )
 
     if feedbacks_cnt == 5:
         mssg_txt = "Вы уже отправили максимальное количество отзывов за день."
@@ -155,17 +199,63 @@ async def cmd_feedback(message: Message, state: FSMContext) -> None:
 
 # Получение отзыва от пользователя
 @service_router.message(Send_Feedback.feedback)
-async def get_feedback(message: Message, state: FSMContext) -> None:
+async def get_feedback(message: Message, state: FSMContext, sess: AsyncSession) -> None:
     await state.clear()
 
-    await User_Requests.increase_feedbacks_cnt(message.from_user.id)
+    await User_Requests.increase_feedbacks_cnt(sess, message.from_user.id)
 
     chat_id: int = OWNER_TG_ID
     user_name: str = message.from_user.username
     mssg_txt: str = f"Отзыв от пользователя @{user_name}.\n\n"
     mssg_txt += message.text
 
-    await bot.send_message(chat_id, mssg_txt)
+    await sender.send(chat_id, mssg_txt)
 
     mssg_txt = "Отзыв успешно отправлен."
     await message.answer(mssg_txt)
+
+
+# Обработка команды "/metrics", доступной только владельцу бота
+@service_router.message(Command("metrics"), F.from_user.id == OWNER_TG_ID)
+async def cmd_metrics(message: Message) -> None:
+    mssg_txt = "Метрики бота:\n"
+
+    for cache in [
+        users_cache,
+        groups_cache,
+        groups_lists_cache,
+        statistics_cache,
+        exports_cache,
+        members_pages_cache,
+    ]:
+        stats: dict[str, int | float] = cache.get_stats()
+
+        mssg_txt += f'Кэш "{cache.name}": записей - {stats["size"]}, попаданий - {stats["hits"]}, '
+        mssg_txt += f'промахов - {stats["misses"]} ({int(stats["hit_rate"] * 100)}%).\n'
+
+    stats: dict[str, int | float] = prefix_indexes.get_stats()
+
+    mssg_txt += f'Индексы отчётов групп: загружено - {stats["size"]}, попаданий - {stats["hits"]}, '
+    mssg_txt += f'промахов - {stats["misses"]} ({int(stats["hit_rate"] * 100)}%).\n'
+
+    stats: dict[str, int] = storage.get_stats()
+
+    mssg_txt += f'Состояния пользователей: активных - {stats["conversations"]}, размер - {stats["bytes"] // 1024} КБ, '
+    mssg_txt += f'истекло - {stats["expired"]}, вытеснено - {stats["evicted"]}.\n'
+
+    stats: dict[str, int] = sender.get_stats()
+
+    mssg_txt += f'Исходящие сообщения: в очереди - {stats["interactive"]} ответов и {stats["notifications"]} уведомлений, '
+    mssg_txt += f'отправлено - {stats["sent"]}, отложено - {stats["delayed"]}, ошибок - {stats["failed"]}, '
+    mssg_txt += f'повторов после ошибки 429 - {stats["retries"]}.\n'
+
+    mssg_txt += f'Сводки уведомлений: ожидают отправки - {stats["digests"]}, заменено уведомлений - {stats["coalesced"]}.\n'
+
+    stats: dict[str, int] = export_pool.get_stats()
+
+    mssg_txt += f'Создание файлов отчётов: в очереди - {stats["queued"]}, выполняется - {stats["running"]}, '
+    mssg_txt += (
+        f'выполнено - {stats["completed"]}, превышено время - {stats["timed_out"]}.\n'
+    )
+
+    await message.answer(mssg_txt)
@@ -0,0 +1,54 @@
+# Файл, содержащий обработчик запросов от Телеграм для работы бота через вебхук
+
+
+# Подключение модулей Python
+from asyncio import Semaphore, wait
+from typing import Any, Dict
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler
+
+
+# Подключение пользовательских модулей
+from config import WEBHOOK_SECRET, WEBHOOK_WORKERS, WEBHOOK_SHUTDOWN_TIMEOUT
+
+
+# Класс для описания обработчика запросов от Телеграм, ограничивающего количество одновременно обрабатываемых обновлений
+class Webhook_Handler(SimpleRequestHandler):
+    """Класс для описания обработчика запросов от Телеграм, ограничивающего количество одновременно обрабатываемых обновлений.
+    Телеграм получает ответ сразу, а обновление обрабатывается в фоне, и при остановке сервера
+    обработчик дожидается обработки уже принятых обновлений"""
+
+    # Магический метод __init__, срабатывающий при создании объекта класса
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        secret_token: str = WEBHOOK_SECRET,
+        workers: int = WEBHOOK_WORKERS,
+        shutdown_timeout: float = WEBHOOK_SHUTDOWN_TIMEOUT,
+        **data: Any,
+    ) -> None:
+        super().__init__(
+            dispatcher,
+            bot,
+            handle_in_background=True,
+            secret_token=secret_token,
+            **data,
+        )
+
+        self.shutdown_timeout: float = shutdown_timeout
+        self._semaphore = Semaphore(workers)
+
+    # Метод для обработки обновления в фоне после получения разрешения от семафора
+    async def _background_feed_update(self, bot: Bot, update: Dict[str, Any]) -> None:
+        async with self._semaphore:
+            await super()._background_feed_update(bot, update)
+
+    # Метод для ожидания обработки принятых обновлений и закрытия сессии бота
+    async def close(self) -> None:
+        if self._background_feed_update_tasks != set():
+            await wait(
+                self._background_feed_update_tasks, timeout=self.shutdown_timeout
+            )
+
+        await super().close()
@@ -1,6 +1,7 @@
 # Подключение модулей Python
-from os import remove
 from datetime import datetime
+from functools import partial
+from secrets import token_hex
 from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import (
@@ -9,16 +10,24 @@ from aiogram.types import (
     InlineKeyboardMarkup,
     ReplyKeyboardRemove,
     CallbackQuery,
-    FSInputFile,
 )
 from aiogram.fsm.context import FSMContext
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 # Подключение пользовательских модулей
-from bot import bot
 from handlers.middleware import Middleware
+from handlers.sender import MAX_MESSAGE_LENGTH, sender, split_text
 from handlers.states import Create_Report, Get_Statistics, Get_Reports_File
-from handlers.markups import create_reply_markup, create_report_markup
+from handlers.markups import (
+    PREVIOUS_PAGE,
+    NEXT_PAGE,
+    create_reply_markup,
+    answer_reply_page,
+    create_report_markup,
+    toggle_report_markup,
+)
+from database.models import session
 from database.requests import (
     Datetime_Handler,
     User_Requests,
@@ -34,8 +43,12 @@ work_router.message.middleware(Middleware())
 
 # Обработка команды "/createreport"
 @work_router.message(Command("createreport"))
-async def cmd_createreport(message: Message, state: FSMContext) -> None:
-    groups: list = await User_Requests.get_groups_where_creator(message.from_user.id)
+async def cmd_createreport(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
+    groups: list = await User_Requests.get_groups_where_creator(
+        sess, message.from_user.id
+    )
 
     if groups == []:
         mssg_txt = "Вы не создавали группу, для которой можно создать отчёт."
@@ -47,29 +60,44 @@ async def cmd_createreport(message: Message, state: FSMContext) -> None:
     await state.set_state(Create_Report.group_name)
 
     mssg_txt = "Выберите группу из списка."
-    markup: ReplyKeyboardMarkup = await create_reply_markup(groups)
+    markup: ReplyKeyboardMarkup = await create_reply_markup(groups, page=0)
 
     await message.answer(mssg_txt, reply_markup=markup)
 
 
 # Получение названия группы от пользователя
 @work_router.message(Create_Report.group_name)
-async def get_group_name(message: Message, state: FSMContext) -> None:
+async def get_group_name(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     group_creator: int = message.from_user.id
+
+    if message.text in [PREVIOUS_PAGE, NEXT_PAGE]:
+        await answer_reply_page(
+            message,
+            state,
+            await User_Requests.get_groups_where_creator(sess, group_creator),
+        )
+
+        return
+
     group_name: str = message.text
 
-    if await Group_Requests.get_by_creator(group_creator, group_name) is None:
+    if await Group_Requests.get_by_creator(sess, group_creator, group_name) is None:
         mssg_txt = "Вы не создавали группу с таким названием, введите другое."
 
         await message.answer(mssg_txt)
 
         return
 
-    group_members: list[str] = (
-        await Group_Requests.get_by_creator(group_creator, group_name)
-    ).members.split(";\n")
+    group_version: int = await Group_Requests.get_data_version(
+        sess, group_creator, group_name
+    )
+    group_members, group_members_cnt = await Group_Requests.get_members_page(
+        sess, group_creator, group_name, group_version, 0
+    )
 
-    if group_members == [""]:
+    if group_members_cnt == 0:
         await state.clear()
 
         mssg_txt = "Создание отчёта отменено, так как в группе отсутствуют участники."
@@ -79,7 +107,15 @@ async def get_group_name(message: Message, state: FSMContext) -> None:
 
         return
 
-    await state.update_data(group_name=group_name, group_members=[])
+    nonce: str = token_hex(4)
+
+    await state.update_data(
+        group_name=group_name,
+        group_version=group_version,
+        nonce=nonce,
+        selected=0,
+        page=0,
+    )
     await state.set_state(Create_Report.group_members)
 
     mssg_txt = f'Создание отчёта для группы "{group_name}".'
@@ -87,75 +123,213 @@ async def get_group_name(message: Message, state: FSMContext) -> None:
 
     await message.answer(mssg_txt, reply_markup=markup)
 
-    mssg_txt = "Для добавления участника в отчёт, нажмите кнопку с его именем.\n"
+    mssg_txt = "Для добавления участника в отчёт или его удаления из отчёта, нажмите кнопку с его именем.\n"
     mssg_txt += 'Для отправки отчёта нажмите кнопку "Отправить".'
-    group_members.sort()
-    markup: InlineKeyboardMarkup = await create_report_markup(group_members)
+
+    if group_members_cnt > len(group_members):
+        mssg_txt += (
+            "\nДля перехода между страницами списка нажимайте кнопки со стрелками."
+        )
+
+    markup: InlineKeyboardMarkup = await create_report_markup(
+        group_members, nonce, members_cnt=group_members_cnt
+    )
 
     await message.answer(mssg_txt, reply_markup=markup)
 
 
+# Функция для сохранения сообщения с уведомлением об отчёте по id отчёта, id чата получателя, тексту уведомления
+# для отправки новым сообщением при ошибке изменения старого и результату запроса к Телеграм
+async def save_report_message(
+    report: int, chat_id: int, text: str | None, result: Message | bool | None
+) -> None:
+    if isinstance(result, Message):
+        async with session() as sess:
+            await Report_Requests.set_message(sess, report, chat_id, result.message_id)
+    elif result is None and not text is None:
+        await sender.send(
+            chat_id, text, on_sent=partial(save_report_message, report, chat_id, None)
+        )
+
+
 # Выбор участников для отчёта пользователем
 @work_router.callback_query(Create_Report.group_members)
-async def get_group_members(callback: CallbackQuery, state: FSMContext) -> None:
-    if callback.data == "r_Отправить":
-        data = await state.get_data()
-        group_creator: int = callback.from_user.id
-        group_name: str = data["group_name"]
-        group_reports_recipient: int = await User_Requests.get_tg_id(
-            (
-                await Group_Requests.get_by_creator(group_creator, group_name)
-            ).reports_recipient
-        )
-        group_members: list[str] = data["group_members"]
+async def get_group_members(
+    callback: CallbackQuery, state: FSMContext, sess: AsyncSession
+) -> None:
+    data = await state.get_data()
+    callback_data: list[str] = callback.data.split(":")
 
-        if await Report_Requests.get(group_creator, group_name) is None:
-            await Report_Requests.create(group_creator, group_name, group_members)
-        else:
-            await Report_Requests.edit(group_creator, group_name, group_members)
+    if data.get("nonce") is None:
+        await state.clear()
+
+        mssg_txt = "Этот список участников устарел, создайте отчёт заново."
 
-            mssg_txt = f'Изменения в сегодняшнем отчёте для группы "{group_name}."'
+        await callback.answer(mssg_txt)
 
-            await bot.send_message(group_reports_recipient, mssg_txt)
+        return
+    elif callback_data[:2] != ["r", data["nonce"]] or len(callback_data) != 3:
+        mssg_txt = "Этот список участников устарел, воспользуйтесь последним."
 
-        if len(group_members) == 0:
-            mssg_txt = f'Сегодня в группе "{group_name}" отсутствующих нет.'
+        await callback.answer(mssg_txt)
 
-            await bot.send_message(group_reports_recipient, mssg_txt)
-        else:
-            mssg_txt = f'Сегодня в группе "{group_name}" отсутствуют:\n'
-            group_members.sort()
-            mssg_txt += ";\n".join(group_members)
-            mssg_txt += "."
+        return
+
+    group_creator: int = callback.from_user.id
+    group_name: str = data["group_name"]
+
+    if callback_data[2] == "s":
+        if (
+            await Group_Requests.get_data_version(sess, group_creator, group_name)
+            != data["group_version"]
+        ):
+            await state.clear()
 
-            await bot.send_message(group_reports_recipient, mssg_txt)
+            mssg_txt = "Участники группы изменились, создайте отчёт заново."
+
+            await callback.answer(mssg_txt)
+
+            return
+
+        group_reports_recipient: int = await Group_Requests.get_reports_recipient_tg_id(
+            sess, group_creator, group_name
+        )
+        group_members: list[str] = [
+            group_member
+            for index, group_member in enumerate(
+                await Group_Requests.get_members(sess, group_creator, group_name)
+            )
+            if data["selected"] >> index & 1
+        ]
+        report, added_members, removed_members = await Report_Requests.save(
+            sess, group_creator, group_name, group_members
+        )
+        report_is_edited: bool = report.edits > 0
+
+        if len(group_members) == 0:
+            report_txt = f'Сегодня в группе "{group_name}" отсутствующих нет.'
+        else:
+            report_txt = f'Сегодня в группе "{group_name}" отсутствуют:\n'
+            report_txt += ";\n".join(group_members)
+            report_txt += "."
+
+        if report_is_edited and added_members == [] and removed_members == []:
+            pass
+        elif (await User_Requests.get(sess, group_reports_recipient)).digest:
+            if report_is_edited:
+                report_txt = f'Сегодняшний отчёт для группы "{group_name}" изменён.\n{report_txt}'
+
+            await sender.send_to_digest(
+                group_reports_recipient, report.group, report_txt
+            )
+        else:
+            if report_is_edited:
+                changes: list[str] = []
+
+                if added_members != []:
+                    changes.append("добавлены - " + ", ".join(added_members))
+
+                if removed_members != []:
+                    changes.append("убраны - " + ", ".join(removed_members))
+
+                report_txt += f'\n\nОтчёт изменён: {"; ".join(changes)}.'
+
+            if (
+                report_is_edited
+                and len(report_txt) <= MAX_MESSAGE_LENGTH
+                and report.message_chat == group_reports_recipient
+                and not report.message_id is None
+            ):
+                await sender.edit(
+                    group_reports_recipient,
+                    report.message_id,
+                    report_txt,
+                    on_sent=partial(
+                        save_report_message,
+                        report.id,
+                        group_reports_recipient,
+                        report_txt,
+                    ),
+                )
+            else:
+                await sender.send(
+                    group_reports_recipient,
+                    report_txt,
+                    on_sent=partial(
+                        save_report_message, report.id, group_reports_recipient, None
+                    ),
+                )
 
         mssg_txt = "Отчёт успешно отправлен."
 
         await callback.answer(mssg_txt)
 
         await state.clear()
-    else:
-        group_member: str = callback.data.split("_")[1].title()
-        group_members: list[str] = (await state.get_data())["group_members"]
+    elif callback_data[2].startswith("p"):
+        page = int(callback_data[2][1:])
 
-        if not group_member in group_members:
-            group_members.append(group_member)
+        if page == data.get("page", 0):
+            await callback.answer()
 
-            mssg_txt = f'Участник "{group_member}" добавлен в отчёт.'
+            return
+
+        if (
+            await Group_Requests.get_data_version(sess, group_creator, group_name)
+            != data["group_version"]
+        ):
+            await state.clear()
+
+            mssg_txt = "Участники группы изменились, создайте отчёт заново."
 
             await callback.answer(mssg_txt)
+
+            return
+
+        group_members, group_members_cnt = await Group_Requests.get_members_page(
+            sess, group_creator, group_name, data["group_version"], page
+        )
+
+        await state.update_data(page=page)
+
+        markup: InlineKeyboardMarkup = await create_report_markup(
+            group_members,
+            data["nonce"],
+            data["selected"],
+            page,
+            group_members_cnt,
+        )
+
+        await callback.message.edit_reply_markup(reply_markup=markup)
+
+        await callback.answer()
+    else:
+        index = int(callback_data[2])
+        selected: int = data["selected"] ^ 1 << index
+        is_selected: bool = selected >> index & 1 == 1
+
+        await state.update_data(selected=selected)
+
+        markup, group_member = await toggle_report_markup(
+            callback.message.reply_markup, callback.data, is_selected
+        )
+
+        await callback.message.edit_reply_markup(reply_markup=markup)
+
+        if is_selected:
+            mssg_txt = f'Участник "{group_member}" добавлен в отчёт.'
         else:
-            mssg_txt = f'Участник "{group_member}" уже добавлен в отчёт.'
+            mssg_txt = f'Участник "{group_member}" удалён из отчёта.'
 
-            await callback.answer(mssg_txt)
+        await callback.answer(mssg_txt)
 
 
 # Обработка команды "/getstatistics"
 @work_router.message(Command("getstatistics"))
-async def cmd_getstatistics(message: Message, state: FSMContext) -> None:
+async def cmd_getstatistics(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     groups: list[str] = await User_Requests.get_groups_where_reports_recipient(
-        message.from_user.id
+        sess, message.from_user.id
     )
     if groups == []:
         mssg_txt = "Вы не назначены получателем отчётов ни в одной группе."
@@ -167,19 +341,33 @@ async def cmd_getstatistics(message: Message, state: FSMContext) -> None:
     await state.set_state(Get_Statistics.group_name)
 
     mssg_txt = "Выберите группу из списка."
-    markup: ReplyKeyboardMarkup = await create_reply_markup(groups)
+    markup: ReplyKeyboardMarkup = await create_reply_markup(groups, page=0)
 
     await message.answer(mssg_txt, reply_markup=markup)
 
 
 # Получение названия группы от пользователя
 @work_router.message(Get_Statistics.group_name)
-async def get_group_name(message: Message, state: FSMContext) -> None:
-    group_name: str = message.text.title()
+async def get_group_name(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     reports_recipient: int = message.from_user.id
 
+    if message.text in [PREVIOUS_PAGE, NEXT_PAGE]:
+        await answer_reply_page(
+            message,
+            state,
+            await User_Requests.get_groups_where_reports_recipient(
+                sess, reports_recipient
+            ),
+        )
+
+        return
+
+    group_name: str = message.text.title()
+
     if not group_name in await User_Requests.get_groups_where_reports_recipient(
-        reports_recipient
+        sess, reports_recipient
     ):
         mssg_txt = "Вы не назначены получателем отчётов в группе с таким названием, выберите другую."
 
@@ -198,21 +386,24 @@ async def get_group_name(message: Message, state: FSMContext) -> None:
 
 # Получение начала периода времени от пользователя
 @work_router.message(Get_Statistics.date_from)
-async def get_date_from(message: Message, state: FSMContext) -> None:
+async def get_date_from(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     group_name: str = (await state.get_data())["group_name"]
     reports_recipient: int = message.from_user.id
-    utc_offset: int = (await User_Requests.get(reports_recipient)).utc_offset
+    utc_offset: int = (await User_Requests.get(sess, reports_recipient)).utc_offset
     date_from: str = message.text.title()
 
     if date_from in ["Неделя", "Месяц", "Год"]:
         await state.clear()
 
         mssg_txt: str = await Report_Requests.get_statistics(
-            group_name, reports_recipient, date_from
+            sess, group_name, reports_recipient, date_from
         )
         markup = ReplyKeyboardRemove()
 
-        await message.answer(mssg_txt, reply_markup=markup)
+        for mssg_txt in split_text(mssg_txt):
+            await message.answer(mssg_txt, reply_markup=markup)
     else:
         if await Datetime_Handler.validate_date(utc_offset, date_from):
             await state.update_data(date_from=date_from)
@@ -230,11 +421,11 @@ async def get_date_from(message: Message, state: FSMContext) -> None:
 
 # Получение конца периода времени от пользователя
 @work_router.message(Get_Statistics.date_to)
-async def get_date_to(message: Message, state: FSMContext) -> None:
+async def get_date_to(message: Message, state: FSMContext, sess: AsyncSession) -> None:
     data = await state.get_data()
     group_name: str = data["group_name"]
     reports_recipient: int = message.from_user.id
-    utc_offset: int = (await User_Requests.get(reports_recipient)).utc_offset
+    utc_offset: int = (await User_Requests.get(sess, reports_recipient)).utc_offset
     date_from = data["date_from"]
     date_to: str = message.text.title()
 
@@ -246,11 +437,12 @@ async def get_date_to(message: Message, state: FSMContext) -> None:
             await state.clear()
 
             mssg_txt: str = await Report_Requests.get_statistics(
-                group_name, reports_recipient, date_from, date_to
+                sess, group_name, reports_recipient, date_from, date_to
             )
             markup = ReplyKeyboardRemove()
 
-            await message.answer(mssg_txt, reply_markup=markup)
+            for mssg_txt in split_text(mssg_txt):
+                await message.answer(mssg_txt, reply_markup=markup)
         else:
             mssg_txt = "Дата конца периода времени не может быть раньше даты его начала, отправьте другую."
 
@@ -263,9 +455,11 @@ async def get_date_to(message: Message, state: FSMContext) -> None:
 
 # Обработка команды "/getreportsfile"
 @work_router.message(Command("getreportsfile"))
-async def cmd_getreportsfile(message: Message, state: FSMContext) -> None:
+async def cmd_getreportsfile(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     groups: list[str] = await User_Requests.get_groups_where_reports_recipient(
-        message.from_user.id
+        sess, message.from_user.id
     )
 
     if groups == []:
@@ -278,19 +472,33 @@ async def cmd_getreportsfile(message: Message, state: FSMContext) -> None:
     await state.set_state(Get_Reports_File.group_name)
 
     mssg_txt = "Выберите группу из списка."
-    markup: ReplyKeyboardMarkup = await create_reply_markup(groups)
+    markup: ReplyKeyboardMarkup = await create_reply_markup(groups, page=0)
 
     await message.answer(mssg_txt, reply_markup=markup)
 
 
 # Получение названия группы от пользователя
 @work_router.message(Get_Reports_File.group_name)
-async def get_group_name(message: Message, state: FSMContext) -> None:
-    group_name: str = message.text.title()
+async def get_group_name(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     reports_recipient: int = message.from_user.id
 
+    if message.text in [PREVIOUS_PAGE, NEXT_PAGE]:
+        await answer_reply_page(
+            message,
+            state,
+            await User_Requests.get_groups_where_reports_recipient(
+                sess, reports_recipient
+            ),
+        )
+
+        return
+
+    group_name: str = message.text.title()
+
     if not group_name in await User_Requests.get_groups_where_reports_recipient(
-        reports_recipient
+        sess, reports_recipient
     ):
         mssg_txt = "Вы не назначены получателем отчётов в группе с таким названием, выберите другую."
 
@@ -309,9 +517,11 @@ async def get_group_name(message: Message, state: FSMContext) -> None:
 
 # Получение начала периода времени от пользователя
 @work_router.message(Get_Reports_File.date_from)
-async def get_date_from(message: Message, state: FSMContext) -> None:
+async def get_date_from(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     reports_recipient: int = message.from_user.id
-    utc_offset: int = (await User_Requests.get(reports_recipient)).utc_offset
+    utc_offset: int = (await User_Requests.get(sess, reports_recipient)).utc_offset
     date_from: str = message.text.title()
 
     if date_from in ["Неделя", "Месяц", "Год"]:
@@ -339,10 +549,10 @@ async def get_date_from(message: Message, state: FSMContext) -> None:
 
 # Получение конца периода времени от пользователя
 @work_router.message(Get_Reports_File.date_to)
-async def get_date_to(message: Message, state: FSMContext) -> None:
+async def get_date_to(message: Message, state: FSMContext, sess: AsyncSession) -> None:
     data = await state.get_data()
     reports_recipient: int = message.from_user.id
-    utc_offset: int = (await User_Requests.get(reports_recipient)).utc_offset
+    utc_offset: int = (await User_Requests.get(sess, reports_recipient)).utc_offset
     date_from = data["date_from"]
     date_to: str = message.text.title()
 
@@ -370,11 +580,13 @@ async def get_date_to(message: Message, state: FSMContext) -> None:
 
 # Получение формата файла от пользователя
 @work_router.message(Get_Reports_File.file_format)
-async def get_file_format(message: Message, state: FSMContext) -> None:
+async def get_file_format(
+    message: Message, state: FSMContext, sess: AsyncSession
+) -> None:
     data = await state.get_data()
     group_name: str = data["group_name"]
     reports_recipient: int = message.from_user.id
-    utc_offset: int = (await User_Requests.get(reports_recipient)).utc_offset
+    utc_offset: int = (await User_Requests.get(sess, reports_recipient)).utc_offset
     date_from = data["date_from"]
 
     try:
@@ -387,19 +599,22 @@ async def get_file_format(message: Message, state: FSMContext) -> None:
     if file_format in ["Xlsx", "Pdf"]:
         await state.clear()
 
-        reports_file, mssg_txt = await Report_Requests.get_file(
-            group_name, reports_recipient, date_from, date_to, file_format
+        reports_file, mssg_txt, file_key = await Report_Requests.get_file(
+            sess, group_name, reports_recipient, date_from, date_to, file_format
         )
         markup = ReplyKeyboardRemove()
 
-        if type(reports_file) == FSInputFile:
-            await message.answer_document(
+        if reports_file is None:
+            await message.answer(mssg_txt, reply_markup=markup)
+        else:
+            sent_message: Message = await message.answer_document(
                 reports_file, caption=mssg_txt, reply_markup=markup
             )
 
-            remove(reports_file.path)
-        else:
-            await message.answer(reports_file, reply_markup=markup)
+            if not file_key is None:
+                await Report_Requests.set_file_id(
+                    file_key, sent_message.document.file_id
+                )
     else:
         mssg_txt = "Неверный формат файла, введите другой."
 
@@ -2,34 +2,131 @@
 
 
 # Подключение модулей Python
-from asyncio import run
+from asyncio import Event, get_running_loop, run
+from contextlib import suppress
+from itertools import groupby
+from signal import SIGINT, SIGTERM
+from aiohttp import web
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from aiogram import Dispatcher
+from aiogram.webhook.aiohttp_server import setup_application
 
 
 # Подключение пользовательских модулей
+from config import (
+    WEBHOOK_URL,
+    WEBHOOK_PATH,
+    WEBHOOK_SECRET,
+    WEBHOOK_HOST,
+    WEBHOOK_PORT,
+    REMINDER_TIME,
+)
 from bot import bot
 from handlers.service_handlers import service_router
 from handlers.config_handlers import config_router
 from handlers.work_handlers import work_router
 from handlers.incorrect_messages_handler import incorrect_router
-from database.models import create_models
-from database.requests import User_Requests
+from handlers.middleware import Session_Middleware, User_Info_Middleware
+from handlers.webhook import Webhook_Handler
+from handlers.sender import sender
+from database.models import session, create_models
+from database.export_pool import export_pool
+from database.storage import storage
+from database.requests import Datetime_Handler, Report_Requests
+
+
+# Функция для отправки напоминаний создателям групп, для которых не создан сегодняшний отчёт,
+# в часовых поясах которых наступило время напоминания
+async def send_reminders() -> None:
+    async with session() as sess:
+        for utc_offset in await Datetime_Handler.get_utc_offsets_at(REMINDER_TIME):
+            groups: list[
+                tuple[int, str]
+            ] = await Report_Requests.get_groups_without_report(sess, utc_offset)
+
+            for group_creator, creator_groups in groupby(
+                groups, lambda group: group[0]
+            ):
+                groups_names: list[str] = [
+                    f'"{group_name}"' for _, group_name in creator_groups
+                ]
+
+                if len(groups_names) == 1:
+                    mssg_txt = (
+                        f"Сегодня не создан отчёт для группы {groups_names[0]}.\n"
+                    )
+                else:
+                    mssg_txt = f"Сегодня не созданы отчёты для групп {', '.join(groups_names)}.\n"
+
+                mssg_txt += (
+                    'Для создания отчёта воспользуйтесь командой "/createreport".'
+                )
+
+                await sender.send(group_creator, mssg_txt)
+
+
+# Функция для запуска сервера, принимающего обновления от Телеграм через вебхук, до получения сигнала остановки
+async def start_webhook(dp: Dispatcher) -> None:
+    app = web.Application()
+
+    Webhook_Handler(dp, bot).register(app, path=WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+
+    await runner.setup()
+    await web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT).start()
+    await bot.set_webhook(
+        WEBHOOK_URL + WEBHOOK_PATH,
+        secret_token=WEBHOOK_SECRET,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+
+    stop_event = Event()
+
+    for signal in [SIGINT, SIGTERM]:
+        with suppress(NotImplementedError):
+            get_running_loop().add_signal_handler(signal, stop_event.set)
+
+    try:
+        await stop_event.wait()
+    finally:
+        await runner.cleanup()
 
 
 # Основная функция для начала работы бота
 async def main() -> None:
     await create_models()
 
-    dp = Dispatcher()
+    await storage.open()
+
+    sender.start()
+
+    dp = Dispatcher(storage=storage)
+    dp.update.outer_middleware(Session_Middleware())
+    dp.update.outer_middleware(User_Info_Middleware())
     dp.include_routers(service_router, config_router, work_router, incorrect_router)
 
     scheduler = AsyncIOScheduler()
-    scheduler.add_job(User_Requests.reset_feedbacks_cnt, CronTrigger(hour=4, minute=0))
+
+    if REMINDER_TIME != "":
+        scheduler.add_job(send_reminders, CronTrigger(minute="*"))
+
     scheduler.start()
 
-    await dp.start_polling(bot)
+    try:
+        if WEBHOOK_URL is None:
+            await bot.delete_webhook()
+            await dp.start_polling(bot)
+        else:
+            await start_webhook(dp)
+    finally:
+        await sender.stop()
+        await bot.session.close()
+        await storage.close()
+
+        export_pool.shutdown()
 
 
 # Запуск основной функции